@@ -0,0 +1,437 @@
+"""
+Benchmarks `flashback.caching.Cache` with each of its adapters.
+
+Runs offline: Redis and memcached are replaced by local stand-in servers (see `benchmarks.fake_servers`),
+which makes their numbers relevant to track the client-side cost of a change (flashback, redis-py,
+pymemcache), not the servers'.
+
+Measures:
+
+- single: throughput and p50/p99 latency of `get`/`set`, over value sizes and key counts
+- batch: throughput and p50/p99 latency of `batch_get`/`batch_set`, over batch sizes
+- threads: throughput of a 90% get / 10% set workload shared by N threads on a single cache
+- processes: throughput of the same workload run by N processes, each with its own cache
+- eviction: cost of the expiry scan of the memory and disk adapters, with live and expired keys
+
+Examples:
+    ```bash
+    # Runs everything, and writes the results to a JSON file
+    python -m benchmarks.caching --output results.json
+
+    # Runs a smaller set of parameters on the memory adapter, and compares to previous results
+    python -m benchmarks.caching --quick --adapters memory --baseline results.json
+    ```
+"""
+
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import platform
+import random
+import string
+import sys
+import time
+import typing as t
+
+from flashback.caching import Cache
+
+from .fake_servers import FakeMemcachedServer, FakeRedisServer
+
+
+ADAPTERS = ("memory", "disk", "redis", "memcached")
+EVICTING_ADAPTERS = ("memory", "disk")
+# pymemcache's Client can't be shared by several threads
+THREAD_SAFE_ADAPTERS = ("memory", "disk", "redis")
+
+PARAMETERS = {
+    "operations": 2000,
+    "value_sizes": [16, 1024, 65536],
+    "key_counts": [100, 10000],
+    "batch_sizes": [10, 100],
+    "threads": [1, 2, 4, 8, 16, 32],
+    "processes": [1, 2, 4],
+    "eviction_key_counts": [100, 1000, 10000],
+}
+QUICK_PARAMETERS = {
+    "operations": 200,
+    "value_sizes": [16, 1024],
+    "key_counts": [100],
+    "batch_sizes": [10],
+    "threads": [1, 4],
+    "processes": [1, 2],
+    "eviction_key_counts": [100, 1000],
+}
+# The ratio of reads in the workloads of the threads and processes scenarios
+READ_RATIO = 0.9
+# The disk adapter scans the whole shelf on every operation, so it can't handle as many keys
+DISK_KEY_COUNT_MAX = 1000
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.caching", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--adapters", default=",".join(ADAPTERS), help="comma-separated adapters to benchmark")
+    parser.add_argument(
+        "--scenarios",
+        default="single,batch,threads,processes,eviction",
+        help="comma-separated scenarios",
+    )
+    parser.add_argument("--quick", action="store_true", help="runs a smaller set of parameters")
+    parser.add_argument("--seed", type=int, default=0, help="the seed used to generate keys and values")
+    parser.add_argument("--output", help="the file to write the JSON results to (default: stdout)")
+    parser.add_argument("--baseline", help="a JSON results file to compare the throughputs to")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="the throughput loss tolerated against the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    parameters = dict(QUICK_PARAMETERS if args.quick else PARAMETERS)
+    adapters = args.adapters.split(",")
+    scenarios = args.scenarios.split(",")
+
+    results = []
+    with _servers(adapters) as adapters_kwargs:
+        for adapter in adapters:
+            for scenario in scenarios:
+                if scenario == "eviction" and adapter not in EVICTING_ADAPTERS:
+                    continue
+                if scenario == "threads" and adapter not in THREAD_SAFE_ADAPTERS:
+                    continue
+
+                runner = SCENARIOS[scenario]
+                for metrics in runner(adapter, adapters_kwargs[adapter], parameters, random.Random(args.seed)):
+                    result = {"scenario": scenario, "adapter": adapter, **metrics}
+                    results.append(result)
+
+                    sys.stderr.write(f"{_format_result(result)}\n")
+
+    report = {"environment": _environment(), "parameters": parameters, "seed": args.seed, "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outfile:
+            json.dump(report, outfile, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as infile:
+            baseline = json.load(infile)
+
+        regressions = compare(baseline["results"], results, tolerance=args.tolerance)
+        for regression in regressions:
+            sys.stderr.write(f"Regression: {regression}\n")
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+def compare(baseline: Sequence[dict[str, t.Any]], results: Sequence[dict[str, t.Any]], tolerance: float) -> list[str]:
+    """
+    Compares the throughputs of `results` to the ones of `baseline` having the same parameters.
+
+    Params:
+        baseline: the results to compare to
+        results: the results to compare
+        tolerance: the ratio of throughput that can be lost before reporting a regression
+
+    Returns:
+        the description of each regression found
+    """
+    baseline_by_id = {_result_id(result): result for result in baseline}
+
+    regressions = []
+    for result in results:
+        previous = baseline_by_id.get(_result_id(result))
+        if previous is None:
+            continue
+
+        ratio = result["ops_per_second"] / previous["ops_per_second"]
+        if ratio < 1 - tolerance:
+            regressions.append(f"{_format_result(result)} ({ratio:.0%} of baseline)")
+
+    return regressions
+
+
+def run_single(
+    adapter: str,
+    kwargs: dict[str, t.Any],
+    parameters: dict[str, t.Any],
+    rng: random.Random,
+) -> Iterator[dict[str, t.Any]]:
+    for key_count in _key_counts(adapter, parameters["key_counts"]):
+        for value_size in parameters["value_sizes"]:
+            cache = _prefilled_cache(adapter, kwargs, key_count, value_size, rng)
+            keys = [f"key:{rng.randrange(key_count)}" for _ in range(parameters["operations"])]
+            value = _random_value(value_size, rng)
+
+            for operation, call in (("set", functools.partial(_set, cache, value)), ("get", cache.get)):
+                latencies = _measure(call, keys)
+
+                yield {"operation": operation, "key_count": key_count, "value_size": value_size, **_stats(latencies)}
+
+
+def run_batch(
+    adapter: str,
+    kwargs: dict[str, t.Any],
+    parameters: dict[str, t.Any],
+    rng: random.Random,
+) -> Iterator[dict[str, t.Any]]:
+    key_count = min(parameters["key_counts"])
+    value_size = min(parameters["value_sizes"])
+
+    cache = _prefilled_cache(adapter, kwargs, key_count, value_size, rng)
+    for batch_size in parameters["batch_sizes"]:
+        batches = [
+            [f"key:{rng.randrange(key_count)}" for _ in range(batch_size)]
+            for _ in range(max(1, parameters["operations"] // batch_size))
+        ]
+        values = [_random_value(value_size, rng) for _ in range(batch_size)]
+
+        calls = (("batch_set", functools.partial(_batch_set, cache, values)), ("batch_get", cache.batch_get))
+        for operation, call in calls:
+            latencies = _measure(call, batches)
+            stats = _stats(latencies)
+            # Reports the throughput in keys rather than in batches
+            stats["ops_per_second"] *= batch_size
+
+            yield {"operation": operation, "key_count": key_count, "batch_size": batch_size, **stats}
+
+
+def run_threads(
+    adapter: str,
+    kwargs: dict[str, t.Any],
+    parameters: dict[str, t.Any],
+    rng: random.Random,
+) -> Iterator[dict[str, t.Any]]:
+    key_count = min(parameters["key_counts"])
+    value_size = min(parameters["value_sizes"])
+
+    cache = _prefilled_cache(adapter, kwargs, key_count, value_size, rng)
+    for workers in parameters["threads"]:
+        seeds = [rng.random() for _ in range(workers)]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            before = time.perf_counter()
+            workload = functools.partial(_mixed_workload, cache, key_count, value_size, parameters["operations"])
+            operations = sum(executor.map(workload, seeds))
+            elapsed = time.perf_counter() - before
+
+        yield {"operation": "mixed", "key_count": key_count, "workers": workers, "ops_per_second": operations / elapsed}
+
+
+def run_processes(
+    adapter: str,
+    kwargs: dict[str, t.Any],
+    parameters: dict[str, t.Any],
+    rng: random.Random,
+) -> Iterator[dict[str, t.Any]]:
+    key_count = min(parameters["key_counts"])
+    value_size = min(parameters["value_sizes"])
+
+    # Spawns rather than forks, since the stand-in servers run in threads of the current process
+    context = multiprocessing.get_context("spawn")
+    for workers in parameters["processes"]:
+        seeds = [rng.random() for _ in range(workers)]
+        tasks = [(adapter, kwargs, key_count, value_size, parameters["operations"], seed) for seed in seeds]
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            # Each process measures its own workload, to exclude spawning and prefilling
+            operations, elapsed = zip(*executor.map(_process_workload, tasks))
+
+        yield {
+            "operation": "mixed",
+            "key_count": key_count,
+            "workers": workers,
+            "ops_per_second": sum(operations) / max(elapsed),
+        }
+
+
+def run_eviction(
+    adapter: str,
+    kwargs: dict[str, t.Any],
+    parameters: dict[str, t.Any],
+    rng: random.Random,
+) -> Iterator[dict[str, t.Any]]:
+    for key_count in _key_counts(adapter, parameters["eviction_key_counts"]):
+        keys = [f"key:{i}" for i in range(key_count)]
+        values = [_random_value(16, rng)] * key_count
+
+        # Scan cost: every key is still alive, the scan is paid by every read
+        cache = Cache(adapter, **kwargs)
+        cache.batch_set(keys, values, [3600] * key_count)
+        latencies = _measure(cache.get, ["missing"] * min(parameters["operations"], 100))
+
+        yield {"operation": "scan", "key_count": key_count, **_stats(latencies)}
+
+        # Purge cost: every key is expired, a sweep evicts them all
+        latencies = []
+        for _ in range(5):
+            cache.flush()
+            # Bypasses the cache since it replaces a ttl of 0 with its default ttl
+            cache.adapter.batch_set(keys, values, [0] * key_count)
+
+            latencies.extend(_measure(_evict, [cache.adapter]))
+
+        yield {"operation": "purge", "key_count": key_count, **_stats(latencies)}
+
+
+SCENARIOS: dict[str, Callable[..., Iterator[dict[str, t.Any]]]] = {
+    "single": run_single,
+    "batch": run_batch,
+    "threads": run_threads,
+    "processes": run_processes,
+    "eviction": run_eviction,
+}
+
+
+@contextmanager
+def _servers(adapters: Sequence[str]) -> Iterator[dict[str, dict[str, t.Any]]]:
+    adapters_kwargs: dict[str, dict[str, t.Any]] = {"memory": {}, "disk": {}}
+
+    with ExitStack() as stack:
+        if "redis" in adapters:
+            server = stack.enter_context(FakeRedisServer())
+            # The stand-in server only speaks RESP2
+            adapters_kwargs["redis"] = {"host": server.host, "port": server.port, "protocol": 2}
+        if "memcached" in adapters:
+            server = stack.enter_context(FakeMemcachedServer())
+            # Without TCP_NODELAY, a noreply set followed by a get stalls on delayed ACKs
+            adapters_kwargs["memcached"] = {"host": server.host, "port": server.port, "no_delay": True}
+
+        yield adapters_kwargs
+
+
+def _prefilled_cache(
+    adapter: str,
+    kwargs: dict[str, t.Any],
+    key_count: int,
+    value_size: int,
+    rng: random.Random,
+) -> Cache:
+    cache = Cache(adapter, flush=True, **kwargs)
+
+    keys = [f"key:{i}" for i in range(key_count)]
+    values = [_random_value(value_size, rng) for _ in range(key_count)]
+    for start in range(0, key_count, 1000):
+        cache.batch_set(keys[start : start + 1000], values[start : start + 1000])
+
+    return cache
+
+
+def _set(cache: Cache, value: str, key: str) -> bool:
+    return cache.set(key, value)
+
+
+def _batch_set(cache: Cache, values: Sequence[str], keys: Sequence[str]) -> bool:
+    return cache.batch_set(keys, values)
+
+
+def _evict(adapter: t.Any) -> None:
+    adapter._evict()  # noqa: SLF001
+
+
+def _mixed_workload(cache: Cache, key_count: int, value_size: int, operations: int, seed: float) -> int:
+    rng = random.Random(seed)
+    value = _random_value(value_size, rng)
+
+    for _ in range(operations):
+        key = f"key:{rng.randrange(key_count)}"
+        if rng.random() < READ_RATIO:
+            cache.get(key)
+        else:
+            cache.set(key, value)
+
+    return operations
+
+
+def _process_workload(task: tuple[str, dict[str, t.Any], int, int, int, float]) -> tuple[int, float]:
+    adapter, kwargs, key_count, value_size, operations, seed = task
+
+    cache = _prefilled_cache(adapter, kwargs, key_count, value_size, random.Random(seed))
+
+    before = time.perf_counter()
+    operations = _mixed_workload(cache, key_count, value_size, operations, seed)
+
+    return operations, time.perf_counter() - before
+
+
+def _measure[T](call: Callable[[T], t.Any], arguments: Sequence[T]) -> list[int]:
+    latencies = []
+
+    for argument in arguments:
+        before = time.perf_counter_ns()
+        call(argument)
+        latencies.append(time.perf_counter_ns() - before)
+
+    return latencies
+
+
+def _stats(latencies: Sequence[int]) -> dict[str, float]:
+    ordered = sorted(latencies)
+
+    def _percentile(percent: float) -> float:
+        # Nearest-rank percentile
+        index = max(0, int(len(ordered) * percent / 100 + 0.5) - 1)
+
+        return ordered[min(index, len(ordered) - 1)] / 1000
+
+    return {
+        "ops_per_second": len(ordered) / (sum(ordered) / 1e9),
+        "p50_us": _percentile(50),
+        "p99_us": _percentile(99),
+        "max_us": ordered[-1] / 1000,
+    }
+
+
+def _key_counts(adapter: str, key_counts: Sequence[int]) -> list[int]:
+    if adapter == "disk":
+        return [key_count for key_count in key_counts if key_count <= DISK_KEY_COUNT_MAX]
+
+    return list(key_counts)
+
+
+def _random_value(size: int, rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_letters, k=size))
+
+
+def _result_id(result: dict[str, t.Any]) -> tuple[t.Any, ...]:
+    parameters = ("scenario", "adapter", "operation", "key_count", "value_size", "batch_size", "workers")
+
+    return tuple(result.get(parameter) for parameter in parameters)
+
+
+def _format_result(result: dict[str, t.Any]) -> str:
+    parameters = ", ".join(
+        f"{name}={result[name]}" for name in ("key_count", "value_size", "batch_size", "workers") if name in result
+    )
+    description = f"{result['scenario']}/{result['adapter']}/{result['operation']} ({parameters})"
+
+    metrics = f"{result['ops_per_second']:,.0f} ops/s"
+    if "p50_us" in result:
+        metrics += f", p50={result['p50_us']:.1f}us, p99={result['p99_us']:.1f}us"
+
+    return f"{description}: {metrics}"
+
+
+def _environment() -> dict[str, t.Any]:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "gil_enabled": is_gil_enabled(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
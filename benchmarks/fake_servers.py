@@ -0,0 +1,314 @@
+from fnmatch import fnmatchcase
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from threading import RLock, Thread
+import time
+import typing as t
+
+
+class _FakeServer(ThreadingTCPServer):
+    """
+    Defines a threaded TCP server listening on a random local port, storing its data in a dict.
+
+    Used as a context manager, serves in a daemon thread until exiting the context.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler_class: type[StreamRequestHandler]) -> None:
+        super().__init__(("127.0.0.1", 0), handler_class)
+
+        self.lock = RLock()
+        self.store: dict[bytes, tuple[bytes, float | None]] = {}
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def host(self) -> str:
+        return self.server_address[0]  # type: ignore because server_address is a (host, port) tuple
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]  # type: ignore because server_address is a (host, port) tuple
+
+    def __enter__(self) -> t.Self:
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def lookup(self, key: bytes) -> bytes | None:
+        with self.lock:
+            value, expiry = self.store.get(key, (None, None))
+            if expiry is not None and expiry < time.monotonic():
+                del self.store[key]
+
+                return None
+
+            return value
+
+    def live_keys(self) -> list[bytes]:
+        return [key for key in list(self.store) if self.lookup(key) is not None]
+
+
+class FakeRedisServer(_FakeServer):
+    """
+    Implements the subset of the Redis protocol (RESP2) used by `flashback.caching.adapters.RedisAdapter`.
+
+    Supports transactions (MULTI/EXEC) as used by `redis.Redis.pipeline()`, and expiries.
+
+    Examples:
+        ```python
+        from flashback.caching import Cache
+
+        with FakeRedisServer() as server:
+            cache = Cache(adapter="redis", host=server.host, port=server.port)
+        ```
+    """
+
+    def __init__(self) -> None:
+        super().__init__(_RedisHandler)
+
+
+class FakeMemcachedServer(_FakeServer):
+    """
+    Implements the subset of the memcached text protocol used by
+    `flashback.caching.adapters.MemcachedAdapter`.
+
+    Examples:
+        ```python
+        from flashback.caching import Cache
+
+        with FakeMemcachedServer() as server:
+            cache = Cache(adapter="memcached", host=server.host, port=server.port)
+        ```
+    """
+
+    def __init__(self) -> None:
+        super().__init__(_MemcachedHandler)
+
+
+class _RedisError(Exception):
+    pass
+
+
+class _RedisStatus(bytes):
+    pass
+
+
+_OK = _RedisStatus(b"OK")
+
+
+class _RedisHandler(StreamRequestHandler):
+    server: FakeRedisServer
+
+    disable_nagle_algorithm = True
+
+    def handle(self) -> None:
+        queued: list[list[bytes]] | None = None
+
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+
+            name = command[0].upper()
+            if name == b"MULTI":
+                queued = []
+                reply: t.Any = _OK
+            elif name == b"EXEC" and queued is not None:
+                reply = [self._execute(queued_command) for queued_command in queued]
+                queued = None
+            elif name == b"DISCARD":
+                queued = None
+                reply = _OK
+            elif queued is not None:
+                queued.append(command)
+                reply = _RedisStatus(b"QUEUED")
+            else:
+                reply = self._execute(command)
+
+            self.wfile.write(self._encode(reply))
+
+    def _read_command(self) -> list[bytes] | None:
+        header = self.rfile.readline()
+        if not header:
+            return None
+
+        if not header.startswith(b"*"):  # inline command
+            return header.split()
+
+        command = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            command.append(self.rfile.read(length + 2)[:-2])
+
+        return command
+
+    def _execute(self, command: list[bytes]) -> t.Any:
+        name, *args = command
+        handler = getattr(self, f"_command_{name.decode().lower()}", None)
+        if handler is None:
+            return _RedisError(f"ERR unknown command '{name.decode()}'")
+
+        with self.server.lock:
+            return handler(*args)
+
+    def _encode(self, reply: t.Any) -> bytes:  # noqa: PLR0911
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, _RedisError):
+            return b"-" + str(reply).encode() + b"\r\n"
+        if isinstance(reply, bool):
+            return b":" + str(int(reply)).encode() + b"\r\n"
+        if isinstance(reply, int):
+            return b":" + str(reply).encode() + b"\r\n"
+        if isinstance(reply, list):
+            return b"*" + str(len(reply)).encode() + b"\r\n" + b"".join(self._encode(item) for item in reply)
+        if isinstance(reply, _RedisStatus):
+            return b"+" + reply + b"\r\n"
+
+        return b"$" + str(len(reply)).encode() + b"\r\n" + reply + b"\r\n"
+
+    def _command_ping(self, *_args: bytes) -> bytes:
+        return _RedisStatus(b"PONG")
+
+    def _command_client(self, *_args: bytes) -> bytes:
+        return _OK
+
+    def _command_select(self, *_args: bytes) -> bytes:
+        return _OK
+
+    def _command_get(self, key: bytes) -> bytes | None:
+        return self.server.lookup(key)
+
+    def _command_mget(self, *keys: bytes) -> list[bytes | None]:
+        return [self.server.lookup(key) for key in keys]
+
+    def _command_set(self, key: bytes, value: bytes, *options: bytes) -> bytes:
+        expiry = None
+        if options and options[0].upper() == b"EX":
+            expiry = time.monotonic() + int(options[1])
+        elif options and options[0].upper() == b"PX":
+            expiry = time.monotonic() + int(options[1]) / 1000
+
+        self.server.store[key] = (value, expiry)
+
+        return _OK
+
+    def _command_mset(self, *keys_and_values: bytes) -> bytes:
+        for key, value in zip(keys_and_values[::2], keys_and_values[1::2]):
+            self.server.store[key] = (value, None)
+
+        return _OK
+
+    def _command_expire(self, key: bytes, seconds: bytes) -> int:
+        value = self.server.lookup(key)
+        if value is None:
+            return 0
+
+        self.server.store[key] = (value, time.monotonic() + int(seconds))
+
+        return 1
+
+    def _command_del(self, *keys: bytes) -> int:
+        return sum(self.server.store.pop(key, None) is not None for key in keys)
+
+    def _command_exists(self, *keys: bytes) -> int:
+        return sum(self.server.lookup(key) is not None for key in keys)
+
+    def _command_dbsize(self) -> int:
+        return len(self.server.live_keys())
+
+    def _command_scan(self, _cursor: bytes, *options: bytes) -> list[t.Any]:
+        pattern = "*"
+        for option, value in zip(options[::2], options[1::2]):
+            if option.upper() == b"MATCH":
+                pattern = value.decode()
+
+        # Returns all the keys at once, with the cursor terminating the iteration
+        return [b"0", [key for key in self.server.live_keys() if fnmatchcase(key.decode(), pattern)]]
+
+    def _command_memory(self, _subcommand: bytes, key: bytes) -> int | None:
+        value = self.server.lookup(key)
+
+        return None if value is None else len(key) + len(value)
+
+    def _command_flushdb(self, *_args: bytes) -> bytes:
+        self.server.store.clear()
+
+        return _OK
+
+    def _command_flushall(self, *_args: bytes) -> bytes:
+        return self._command_flushdb()
+
+
+class _MemcachedHandler(StreamRequestHandler):
+    server: FakeMemcachedServer
+
+    disable_nagle_algorithm = True
+
+    # Expiries larger than 30 days are absolute unix timestamps in the memcached protocol
+    RELATIVE_EXPIRY_MAX = 60 * 60 * 24 * 30
+
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+
+            name, *args = line.split()
+            noreply = bool(args) and args[-1] == b"noreply"
+
+            with self.server.lock:
+                reply = self._execute(name, args)
+
+            if not noreply:
+                self.wfile.write(reply)
+
+    def _execute(self, name: bytes, args: list[bytes]) -> bytes:  # noqa: PLR0911
+        if name == b"set":
+            key, flags, expire, length = args[:4]
+            value = self.rfile.read(int(length) + 2)[:-2]
+
+            self.server.store[key] = (flags + b" " + value, self._convert_expire(int(expire)))
+
+            return b"STORED\r\n"
+        if name in {b"get", b"gets"}:
+            reply = b""
+            for key in args:
+                entry = self.server.lookup(key)
+                if entry is not None:
+                    flags, value = entry.split(b" ", 1)
+                    cas = b" 1" if name == b"gets" else b""
+                    reply += b"VALUE " + key + b" " + flags + b" " + str(len(value)).encode() + cas + b"\r\n"
+                    reply += value + b"\r\n"
+
+            return reply + b"END\r\n"
+        if name == b"delete":
+            if self.server.lookup(args[0]) is None:
+                return b"NOT_FOUND\r\n"
+
+            del self.server.store[args[0]]
+
+            return b"DELETED\r\n"
+        if name == b"flush_all":
+            self.server.store.clear()
+
+            return b"OK\r\n"
+        if name == b"stats":
+            return b"STAT curr_items " + str(len(self.server.live_keys())).encode() + b"\r\nEND\r\n"
+        if name == b"version":
+            return b"VERSION fake\r\n"
+
+        return b"ERROR\r\n"
+
+    def _convert_expire(self, expire: int) -> float | None:
+        if expire == 0:
+            return None
+        if expire > self.RELATIVE_EXPIRY_MAX:
+            return time.monotonic() + expire - time.time()
+
+        return time.monotonic() + expire
@@ -0,0 +1,168 @@
+"""
+Benchmarks the rate-limiting strategies of `flashback.sampled`.
+
+Measures:
+
+- single: throughput and p50/p99 latency of a sampling decision, over rates
+- threads: throughput of sampling decisions made by N threads on a single decorator
+- accuracy: the most requests accepted over any second while calling as fast as possible, against
+the rate, which exposes bursts at window boundaries
+
+Examples:
+    ```bash
+    # Runs everything, and writes the results to a JSON file
+    python -m benchmarks.sampled --output results.json
+
+    # Runs a smaller set of parameters on two strategies
+    python -m benchmarks.sampled --quick --strategies ratelimiting,tokenbucket
+    ```
+"""
+
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import bisect
+import json
+import sys
+import time
+import typing as t
+
+from flashback import sampled
+
+from .caching import _environment, _stats
+
+
+STRATEGIES = ("ratelimiting", "tokenbucket", "leakybucket", "slidingwindow")
+
+PARAMETERS = {
+    "operations": 20000,
+    "rates": [10, 1000, 100000],
+    "threads": [1, 4, 16],
+    "accuracy_rate": 100,
+    "accuracy_duration": 3.0,
+}
+QUICK_PARAMETERS = {
+    "operations": 2000,
+    "rates": [10, 1000],
+    "threads": [1, 4],
+    "accuracy_rate": 100,
+    "accuracy_duration": 1.5,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.sampled", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="comma-separated strategies to benchmark")
+    parser.add_argument("--scenarios", default="single,threads,accuracy", help="comma-separated scenarios")
+    parser.add_argument("--quick", action="store_true", help="runs a smaller set of parameters")
+    parser.add_argument("--output", help="the file to write the JSON results to (default: stdout)")
+    args = parser.parse_args(argv)
+
+    parameters = dict(QUICK_PARAMETERS if args.quick else PARAMETERS)
+
+    results = []
+    for strategy in args.strategies.split(","):
+        for scenario in args.scenarios.split(","):
+            for metrics in SCENARIOS[scenario](strategy, parameters):
+                result = {"scenario": scenario, "strategy": strategy, **metrics}
+                results.append(result)
+
+                sys.stderr.write(f"{_format_result(result)}\n")
+
+    report = {"environment": _environment(), "parameters": parameters, "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outfile:
+            json.dump(report, outfile, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    return 0
+
+
+def run_single(strategy: str, parameters: dict[str, t.Any]) -> Iterator[dict[str, t.Any]]:
+    for rate in parameters["rates"]:
+        should_sample = sampled(strategy=strategy, rate=rate).should_sample
+
+        latencies = []
+        for _ in range(parameters["operations"]):
+            before = time.perf_counter_ns()
+            should_sample()
+            latencies.append(time.perf_counter_ns() - before)
+
+        yield {"rate": rate, **_stats(latencies)}
+
+
+def run_threads(strategy: str, parameters: dict[str, t.Any]) -> Iterator[dict[str, t.Any]]:
+    rate = max(parameters["rates"])
+
+    for workers in parameters["threads"]:
+        should_sample = sampled(strategy=strategy, rate=rate).should_sample
+        operations = parameters["operations"] // workers
+
+        def _workload(
+            _: int,
+            should_sample: t.Callable[[], bool] = should_sample,
+            operations: int = operations,
+        ) -> None:
+            for _ in range(operations):
+                should_sample()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            before = time.perf_counter()
+            list(executor.map(_workload, range(workers)))
+            elapsed = time.perf_counter() - before
+
+        yield {"rate": rate, "workers": workers, "ops_per_second": operations * workers / elapsed}
+
+
+def run_accuracy(strategy: str, parameters: dict[str, t.Any]) -> Iterator[dict[str, t.Any]]:
+    rate = parameters["accuracy_rate"]
+    should_sample = sampled(strategy=strategy, rate=rate).should_sample
+
+    accepted_at = []
+    calls = 0
+    started_at = time.monotonic()
+    while (now := time.monotonic()) - started_at < parameters["accuracy_duration"]:
+        calls += 1
+        if should_sample():
+            accepted_at.append(now)
+
+    # The most requests accepted within one second, starting from any accepted request
+    max_per_second = max(
+        (bisect.bisect_left(accepted_at, timestamp + 1.0) - index for index, timestamp in enumerate(accepted_at)),
+        default=0,
+    )
+
+    yield {
+        "rate": rate,
+        "calls": calls,
+        "accepted": len(accepted_at),
+        "max_per_second": max_per_second,
+        "overshoot": max_per_second / rate,
+    }
+
+
+SCENARIOS = {
+    "single": run_single,
+    "threads": run_threads,
+    "accuracy": run_accuracy,
+}
+
+
+def _format_result(result: dict[str, t.Any]) -> str:
+    parameters = ", ".join(f"{name}={result[name]}" for name in ("rate", "workers") if name in result)
+    description = f"{result['scenario']}/{result['strategy']} ({parameters})"
+
+    if "overshoot" in result:
+        return f"{description}: {result['max_per_second']} accepted over a second ({result['overshoot']:.0%} of rate)"
+
+    metrics = f"{result['ops_per_second']:,.0f} ops/s"
+    if "p50_us" in result:
+        metrics += f", p50={result['p50_us']:.1f}us, p99={result['p99_us']:.1f}us"
+
+    return f"{description}: {metrics}"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
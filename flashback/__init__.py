@@ -4,7 +4,9 @@ from .sentinel import Sentinel
 from .singleton import Singleton
 
 from .classproperty import classproperty
+from .deadline import deadline, remaining_time
 from .deprecated import deprecated
+from .hedged import hedged
 from .retryable import retryable
 from .sampled import sampled
 from .timed import timed
@@ -17,7 +19,10 @@ __all__ = (
     "Sentinel",
     "Singleton",
     "classproperty",
+    "deadline",
     "deprecated",
+    "hedged",
+    "remaining_time",
     "retryable",
     "sampled",
     "timed",
@@ -1,8 +1,10 @@
 from .cache import Cache
 from .cached import cached
+from .cached_method import cached_method
 
 
 __all__ = (
     "Cache",
     "cached",
+    "cached_method",
 )
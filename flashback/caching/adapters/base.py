@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+import math
 import typing as t
 
 
@@ -126,6 +127,71 @@ class BaseAdapter(ABC):
             Base.connection_exceptions: if no connection to the underlying storage is active
         """
 
+    @abstractmethod
+    def scan(self, pattern: str) -> Iterator[str]:
+        """
+        Iterates over the keys matching a glob-style `pattern` without loading their values.
+
+        Params:
+            pattern: the glob-style pattern to match the keys against (e.g. "user:*")
+
+        Returns:
+            the matching keys, yielded one at a time
+
+        Raises:
+            Base.connection_exceptions: if no connection to the underlying storage is active
+            NotImplementedError: if the underlying storage can't enumerate its keys
+        """
+
+    @abstractmethod
+    def size(self) -> int:
+        """
+        Counts the keys in the storage.
+
+        Returns:
+            the number of keys
+
+        Raises:
+            Base.connection_exceptions: if no connection to the underlying storage is active
+        """
+
+    @abstractmethod
+    def memory_usage(self, key: str) -> int | None:
+        """
+        Measures the number of bytes used to store the given `key` and its value.
+
+        Params:
+            key: the key to measure
+
+        Returns:
+            the number of bytes used, or None if the key does not exist
+
+        Raises:
+            Base.connection_exceptions: if no connection to the underlying storage is active
+        """
+
+    @abstractmethod
+    def acquire(self, key: str, count: int, limit: int, period: float) -> int:
+        """
+        Atomically takes up to `count` tokens from the bucket stored under `key`, which holds at
+        most `limit` tokens and is refilled with `limit` tokens every `period` seconds.
+
+        The state of the bucket shares the keyspace of the values cached, and shows up in `scan()`
+        and `size()`.
+
+        Params:
+            key: the key under which to store the state of the bucket
+            count: the number of tokens to take
+            limit: the max number of tokens in the bucket
+            period: the number of seconds to refill the bucket
+
+        Returns:
+            the number of tokens taken, between 0 and `count`
+
+        Raises:
+            Base.connection_exceptions: if no connection to the underlying storage is active
+        """
+
     @abstractmethod
     def flush(self) -> bool:
         """
@@ -159,3 +225,30 @@ class BaseAdapter(ABC):
         Returns:
             tuple<Exception>: the list of exceptions
         """
+
+    @staticmethod
+    def _take_tokens(tat: float | None, now: float, count: int, limit: int, period: float) -> tuple[int, float]:
+        """
+        Implements the bucket of `acquire` with the generic cell rate algorithm (GCRA), which only
+        stores the theoretical arrival time (TAT) of the next token.
+
+        See: https://en.wikipedia.org/wiki/Generic_cell_rate_algorithm.
+
+        Params:
+            tat: the theoretical arrival time stored, None if the bucket is full
+            now: the current time
+            count: the number of tokens to take
+            limit: the max number of tokens in the bucket
+            period: the number of seconds to refill the bucket
+
+        Returns:
+            the number of tokens taken, and the theoretical arrival time to store
+        """
+        interval = period / limit
+        tat = now if tat is None else max(tat, now)
+
+        # Rounds to absorb floating point errors, e.g. a full bucket of 10 tokens being 9.999...
+        available = math.floor(round((now + period - tat) / interval, 9))
+        taken = max(0, min(count, available))
+
+        return taken, tat + taken * interval
@@ -1,8 +1,10 @@
-from collections.abc import Sequence, Generator
+from collections.abc import Iterator, Sequence, Generator
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from fcntl import flock, LOCK_SH, LOCK_EX, LOCK_UN
+from fnmatch import fnmatchcase
 from shelve import Shelf
+import pickle
 import shelve
 import tempfile
 import typing as t
@@ -76,6 +78,47 @@ class DiskAdapter(BaseAdapter):
         with self._open_locked_store(LOCK_SH) as store:
             return key in store
 
+    def scan(self, pattern: str) -> Iterator[str]:
+        self._evict()
+
+        # Only the keys are read from the shelf's index, the lock is released before yielding
+        with self._open_locked_store(LOCK_SH) as store:
+            keys = list(store.keys())
+
+        for key in keys:
+            if fnmatchcase(key, pattern):
+                yield key
+
+    def size(self) -> int:
+        self._evict()
+
+        with self._open_locked_store(LOCK_SH) as store:
+            return len(store)
+
+    def memory_usage(self, key: str) -> int | None:
+        self._evict()
+
+        with self._open_locked_store(LOCK_SH) as store:
+            if key not in store:
+                return None
+
+            # Measures the entry as serialized by the shelf
+            return len(key.encode(store.keyencoding)) + len(pickle.dumps(store[key]))
+
+    def acquire(self, key: str, count: int, limit: int, period: float) -> int:
+        now = datetime.timestamp(datetime.now())
+
+        with self._open_locked_store(LOCK_EX) as store:
+            tat, expiry = store.get(key, (None, None))
+            if expiry is not None and expiry < now:
+                tat = None
+
+            taken, tat = self._take_tokens(tat, now, count, limit, period)
+            # The state is useless once the bucket is full again
+            store[key] = (tat, tat)
+
+        return taken
+
     def flush(self) -> bool:
         with self._open_locked_store(LOCK_EX) as store:
             store.clear()
@@ -1,4 +1,6 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+import math
+import time
 import typing as t
 
 from pymemcache.client.base import Client, check_key_helper
@@ -78,6 +80,33 @@ class MemcachedAdapter(BaseAdapter):
         # Can't just cast to bool since we can store falsey values
         return self.store.get(key) is not None
 
+    def scan(self, pattern: str) -> Iterator[str]:
+        raise NotImplementedError("memcached does not support the enumeration of its keys")
+
+    def size(self) -> int:
+        return int(self.store.stats().get(b"curr_items", 0))
+
+    def memory_usage(self, key: str) -> int | None:
+        # Memcached does not expose the size of an item, so we measure its raw value
+        value = self.store.get(key)
+        if value is None:
+            return None
+
+        return len(key.encode(self.store.encoding)) + len(value)
+
+    def acquire(self, key: str, count: int, limit: int, period: float) -> int:
+        # Memcached can't run scripts, so the bucket is approximated by a counter per window of
+        # `period` seconds, incremented atomically, which allows bursts at the windows' boundaries
+        window_key = f"{key}:{math.floor(time.time() / period)}"
+
+        # Only creates the counter if missing, and keeps it for a bit more than its window
+        self.store.add(window_key, 0, expire=math.ceil(period) + 1, noreply=False)
+        used = self.store.incr(window_key, count, noreply=False)
+        if used is None:  # evicted in between
+            return 0
+
+        return max(0, min(count, limit - (int(used) - count)))
+
     def flush(self) -> bool:
         return self.store.flush_all(noreply=False)
 
@@ -1,6 +1,8 @@
-from collections.abc import Sequence
-from datetime import datetime, timedelta
-from threading import RLock
+from collections.abc import Iterator, Sequence
+from fnmatch import fnmatchcase
+from threading import Lock
+import sys
+import time
 import typing as t
 
 from .base import BaseAdapter
@@ -8,69 +10,165 @@ from .base import BaseAdapter
 
 class MemoryAdapter(BaseAdapter):
     """
-    Exposes a cache store using a in-memory dict.
+    Exposes a cache store using in-memory dicts, striped in shards each guarded by its own lock.
+
+    Concurrency model:
+
+    - a key always lives in the same shard, picked from its hash
+    - writes (set, delete, eviction) lock the shards they modify, so writes to different shards
+    never contend
+    - reads of a key (get, exists) are lock-free, as reading a single dict item is atomic (both with
+    and without the GIL)
+    - iterations (scan, size, eviction) work on a copy of a shard made under its lock, so they never
+    see a shard changing size
+
+    Expired keys are ignored when read, and evicted at most every `eviction_interval` seconds by a
+    sweep over all shards, one shard at a time.
     """
 
-    def __init__(self, **_kwargs: t.Any) -> None:
-        self._lock = RLock()
-        self.store = {}
+    def __init__(self, shards: int = 16, eviction_interval: float = 1.0, **_kwargs: t.Any) -> None:
+        """
+        Params:
+            shards: the number of shards to stripe the store in
+            eviction_interval: the minimum number of seconds between two sweeps of expired keys
+            _kwargs: every additional keyword arguments, ignored
+        """
+        if shards < 1:
+            raise ValueError(f"invalid shards {shards!r}, expecting a positive integer")
+
+        self._shards: list[dict[str, tuple[t.Any, float | None]]] = [{} for _ in range(shards)]
+        self._locks = [Lock() for _ in range(shards)]
+        self._eviction_interval = eviction_interval
+        self._next_eviction = time.monotonic() + eviction_interval
+
+    @property
+    def store(self) -> dict[str, tuple[t.Any, float | None]]:
+        """
+        Merges the shards into a single dict, as a snapshot of the store.
+
+        Returns:
+            the keys and their (value, expiry) couples
+        """
+        store = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                store.update(shard)
+
+        return store
 
     def set(self, key: str, value: t.Any, ttl: int) -> bool:
-        if ttl == -1:
-            expiry = None
-        else:
-            # TODO: use relativedelta
-            expiry = datetime.timestamp(datetime.now() + timedelta(seconds=ttl))
+        self._maybe_evict()
+
+        index = self._shard_index(key)
+        expiry = self._expiry(ttl, time.monotonic())
 
-        with self._lock:
-            self.store[key] = (value, expiry)
+        with self._locks[index]:
+            self._shards[index][key] = (value, expiry)
 
         return True
 
     def batch_set(self, keys: Sequence[str], values: Sequence[t.Any], ttls: Sequence[int]) -> bool:
-        now = datetime.now()
-        expiries = [None if ttl == -1 else datetime.timestamp(now + timedelta(seconds=ttl)) for ttl in ttls]
+        self._maybe_evict()
+
+        now = time.monotonic()
 
-        values_and_expiries = zip(values, expiries)
+        items_by_shard: dict[int, dict[str, tuple[t.Any, float | None]]] = {}
+        for key, value, ttl in zip(keys, values, ttls):
+            items_by_shard.setdefault(self._shard_index(key), {})[key] = (value, self._expiry(ttl, now))
 
-        with self._lock:
-            self.store.update(dict(zip(keys, values_and_expiries)))
+        for index, items in items_by_shard.items():
+            with self._locks[index]:
+                self._shards[index].update(items)
 
         return True
 
     def get(self, key: str) -> t.Any | None:
-        self._evict()
+        self._maybe_evict()
 
-        return self.store.get(key, (None,))[0]
+        return self._get(key, time.monotonic())
 
     def batch_get(self, keys: Sequence[str]) -> Sequence[t.Any | None]:
-        self._evict()
+        self._maybe_evict()
 
-        return [self.store.get(key, (None,))[0] for key in keys]
+        now = time.monotonic()
 
-    def delete(self, key: str) -> bool:
-        self._evict()
+        return [self._get(key, now) for key in keys]
 
-        with self._lock:
-            value = self.store.pop(key, False)
+    def delete(self, key: str) -> bool:
+        self._maybe_evict()
 
-        return bool(value)
+        return self._delete(key, time.monotonic())
 
     def batch_delete(self, keys: Sequence[str]) -> bool:
-        self._evict()
+        self._maybe_evict()
 
-        with self._lock:
-            res = [bool(self.store.pop(key, False)) for key in keys]
+        now = time.monotonic()
+        res = [self._delete(key, now) for key in keys]
 
         return False not in res
 
     def exists(self, key: str) -> bool:
-        self._evict()
+        self._maybe_evict()
+
+        return self._lookup(key, time.monotonic()) is not None
+
+    def scan(self, pattern: str) -> Iterator[str]:
+        self._maybe_evict()
+
+        for shard, lock in zip(self._shards, self._locks):
+            # Copies one shard at a time to allow writes while the caller consumes the generator
+            with lock:
+                items = list(shard.items())
+
+            now = time.monotonic()
+            for key, (_, expiry) in items:
+                if not self._is_expired(expiry, now) and fnmatchcase(key, pattern):
+                    yield key
+
+    def size(self) -> int:
+        self._maybe_evict()
+
+        size = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                expiries = list(shard.values())
 
-        return key in self.store
+            now = time.monotonic()
+            size += sum(not self._is_expired(expiry, now) for _, expiry in expiries)
+
+        return size
+
+    def memory_usage(self, key: str) -> int | None:
+        self._maybe_evict()
+
+        entry = self._lookup(key, time.monotonic())
+        if entry is None:
+            return None
+
+        value, expiry = entry
+
+        return sys.getsizeof(key) + sys.getsizeof(value) + sys.getsizeof(expiry)
+
+    def acquire(self, key: str, count: int, limit: int, period: float) -> int:
+        self._maybe_evict()
+
+        index = self._shard_index(key)
+        now = time.monotonic()
+
+        with self._locks[index]:
+            entry = self._shards[index].get(key)
+            tat = None if entry is None or self._is_expired(entry[1], now) else entry[0]
+
+            taken, tat = self._take_tokens(tat, now, count, limit, period)
+            # The state is useless once the bucket is full again
+            self._shards[index][key] = (tat, tat)
+
+        return taken
 
     def flush(self) -> bool:
-        self.store.clear()
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
 
         return True
 
@@ -81,15 +179,52 @@ class MemoryAdapter(BaseAdapter):
     def connection_exceptions(self) -> tuple[type[Exception], ...]:
         return ()
 
+    def _shard_index(self, key: str) -> int:
+        return hash(key) % len(self._shards)
+
+    def _lookup(self, key: str, now: float) -> tuple[t.Any, float | None] | None:
+        # Lock-free: fetching a single item from a dict is atomic
+        entry = self._shards[self._shard_index(key)].get(key)
+        if entry is None or self._is_expired(entry[1], now):
+            return None
+
+        return entry
+
+    def _get(self, key: str, now: float) -> t.Any | None:
+        entry = self._lookup(key, now)
+
+        return None if entry is None else entry[0]
+
+    def _delete(self, key: str, now: float) -> bool:
+        index = self._shard_index(key)
+
+        with self._locks[index]:
+            entry = self._shards[index].pop(key, None)
+
+        return entry is not None and not self._is_expired(entry[1], now)
+
+    def _maybe_evict(self) -> None:
+        # Racy on purpose: at worst, two threads sweep at the same time, which is harmless
+        if time.monotonic() < self._next_eviction:
+            return
+
+        self._next_eviction = time.monotonic() + self._eviction_interval
+
+        self._evict()
+
     def _evict(self) -> None:
-        now = datetime.timestamp(datetime.now())
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                now = time.monotonic()
 
-        expired_keys = set()
+                expired_keys = [key for key, (_, expiry) in shard.items() if self._is_expired(expiry, now)]
+                for expired_key in expired_keys:
+                    del shard[expired_key]
 
-        for key, (_, expiry) in self.store.items():
-            if expiry is not None and expiry < now:
-                expired_keys.add(key)
+    @staticmethod
+    def _expiry(ttl: int, now: float) -> float | None:
+        return None if ttl == -1 else now + ttl
 
-        with self._lock:
-            for expired_key in expired_keys:
-                del self.store[expired_key]
+    @staticmethod
+    def _is_expired(expiry: float | None, now: float) -> bool:
+        return expiry is not None and expiry < now
@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 import typing as t
 
 from redis import Redis
@@ -10,6 +10,35 @@ from redis.exceptions import TimeoutError as RedisTimeoutError
 from .base import BaseAdapter
 
 
+# Implements `BaseAdapter._take_tokens` server-side, to be atomic and rely on a single clock
+ACQUIRE_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local count = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local interval = period / limit
+
+local tat = tonumber(redis.call("GET", KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+-- Rounds the refill time to the microseconds of TIME, as timestamps around 1.7e9 lose precision
+local refill = math.floor((now + period - tat) * 1000000 + 0.5) / 1000000
+local available = math.floor(refill / interval + 0.000000001)
+local taken = math.max(0, math.min(count, available))
+if taken > 0 then
+    tat = tat + taken * interval
+    -- The state is useless once the bucket is full again
+    redis.call("SET", KEYS[1], string.format("%.6f", tat), "PX", math.ceil((tat - now) * 1000))
+end
+
+return taken
+"""
+
+
 class RedisAdapter(BaseAdapter):
     """
     Exposes a cache store using Redis.
@@ -31,6 +60,8 @@ class RedisAdapter(BaseAdapter):
         # but mockredis does not support it as of 2020-04-24
         self._encoding = encoding
         self.store = Redis(host=host, port=port, db=db, encoding=encoding, **kwargs)
+        # Sent once, then called by its SHA1 digest
+        self._acquire_script = self.store.register_script(ACQUIRE_SCRIPT)
 
     def set(self, key: str, value: t.Any, ttl: int) -> bool:
         if ttl == -1:
@@ -73,6 +104,20 @@ class RedisAdapter(BaseAdapter):
     def exists(self, key: str) -> bool:
         return self.store.exists(key)  # type: ignore because redis command's return type is Awaitable[Any] | Any
 
+    def scan(self, pattern: str) -> Iterator[str]:
+        # Uses SCAN rather than KEYS to iterate by batches without blocking the server
+        for key in self.store.scan_iter(match=pattern):
+            yield key.decode(self._encoding)
+
+    def size(self) -> int:
+        return self.store.dbsize()  # type: ignore because redis command's return type is Awaitable[Any] | Any
+
+    def memory_usage(self, key: str) -> int | None:
+        return self.store.memory_usage(key)  # type: ignore because redis command's return type is Awaitable[Any] | Any
+
+    def acquire(self, key: str, count: int, limit: int, period: float) -> int:
+        return int(self._acquire_script(keys=[key], args=[count, limit, period]))  # type: ignore because redis command's return type is Awaitable[Any] | Any
+
     def flush(self) -> bool:
         return self.store.flushdb()  # type: ignore because redis command's return type is Awaitable[Any] | Any
 
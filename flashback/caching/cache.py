@@ -1,9 +1,16 @@
-from collections.abc import Sequence
+from collections.abc import Hashable, Iterator, Sequence
+from threading import RLock
 import typing as t
 
+import heapq
 import json
 
 from ..importing import import_class_from_path
+from .adapters.base import BaseAdapter
+
+
+_SHARED_ADAPTERS: dict[Hashable, BaseAdapter] = {}
+_SHARED_ADAPTERS_LOCK = RLock()
 
 
 class Cache:
@@ -51,15 +58,43 @@ class Cache:
 
         cache.flush()
         #=> True
+
+        # Introspects the storage
+        cache.set("key", "val")
+
+        list(cache.scan("k*"))
+        #=> ["key"]
+
+        cache.size()
+        #=> 1
+
+        cache.largest_keys(1)
+        #=> [("key", 106)]
+
+        # Defers the adapter's instanciation and first ping until the first operation
+        cache = Cache(adapter="redis", lazy=True)
+
+        # Reuses the adapter of any other cache configured identically
+        cache = Cache(adapter="redis", shared=True)
         ```
     """
 
-    def __init__(self, adapter: str = "memory", ttl: int = -1, flush: bool = False, **kwargs: t.Any) -> None:
+    def __init__(
+        self,
+        adapter: str = "memory",
+        ttl: int = -1,
+        flush: bool = False,
+        lazy: bool = False,
+        shared: bool = False,
+        **kwargs: t.Any,
+    ) -> None:
         """
         Params:
             adapter: the adapter to use for the storage
             ttl: the number of seconds before expiring the keys (default: -1 (never))
             flush: whether or not to flush the storage after connecting
+            lazy: whether or not to wait for the first operation to instanciate and ping the adapter
+            shared: whether or not to reuse the adapter of caches having the same adapter and kwargs
             kwargs: every additional keyword arguments, forwarded to the adapter
         """
         super().__init__()
@@ -67,17 +102,40 @@ class Cache:
         self.ttl = ttl
 
         try:
-            adapter_class = import_class_from_path(f"{adapter}_adapter", ".adapters")
-
-            self.adapter = adapter_class(**kwargs)
+            self._adapter_class = import_class_from_path(f"{adapter}_adapter", ".adapters")
         except (ImportError, AttributeError) as e:
             raise NotImplementedError(f"adapter {adapter!r} is not yet supported") from e
 
-        if flush:
-            self.flush()
+        self._adapter_kwargs = kwargs
+        self._adapter: BaseAdapter | None = None
+        self._shared = shared
+        self._flush_on_connect = flush
+        self._connected = False
+        self._lock = RLock()
+
+        if not lazy:
+            self._connect()
 
-        # Notifies that we have a new connection
-        self.ping()
+    @property
+    def adapter(self) -> BaseAdapter:
+        """
+        Returns the adapter used for the storage, instanciating it on first access.
+
+        Returns:
+            the adapter instance
+        """
+        if self._adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    self._adapter = self._build_adapter()
+
+        return self._adapter
+
+    @property
+    def _connection_exceptions(self) -> tuple[type[Exception], ...]:
+        # Evaluated in `except` clauses, so never instanciates the adapter: if instanciating it
+        # raised, doing it again would hide the original error
+        return () if self._adapter is None else self._adapter.connection_exceptions
 
     def set(self, key: str, value: t.Any, ttl: int | None = None) -> bool:
         """
@@ -104,8 +162,10 @@ class Cache:
         json_value = json.dumps(self._convert_numeric(value))
 
         try:
+            self._connect()
+
             res = self.adapter.set(key, json_value, ttl=ttl or self.ttl)
-        except self.adapter.connection_exceptions:
+        except self._connection_exceptions:
             res = False
 
         return res
@@ -144,8 +204,10 @@ class Cache:
         json_values = [json.dumps(self._convert_numeric(value)) for value in values]
 
         try:
+            self._connect()
+
             res = self.adapter.batch_set(keys, json_values, ttls=ttls)
-        except self.adapter.connection_exceptions:
+        except self._connection_exceptions:
             res = False
 
         return res
@@ -175,9 +237,11 @@ class Cache:
             the value read from the storage
         """
         try:
+            self._connect()
+
             json_value = self.adapter.get(key)
             value = self._decode_json(json_value)
-        except self.adapter.connection_exceptions:
+        except self._connection_exceptions:
             value = None
 
         return value
@@ -204,9 +268,11 @@ class Cache:
             the values read from the storage
         """
         try:
+            self._connect()
+
             json_values = self.adapter.batch_get(keys)
             values = [self._decode_json(json_value) for json_value in json_values]
-        except self.adapter.connection_exceptions:
+        except self._connection_exceptions:
             values = [None] * len(keys)
 
         return values
@@ -236,8 +302,10 @@ class Cache:
             whether or not the operation succeeded
         """
         try:
+            self._connect()
+
             res = self.adapter.delete(key)
-        except self.adapter.connection_exceptions:
+        except self._connection_exceptions:
             res = False
 
         return res
@@ -267,8 +335,10 @@ class Cache:
             whether or not the operation succeeded
         """
         try:
+            self._connect()
+
             res = self.adapter.batch_delete(keys)
-        except self.adapter.connection_exceptions:
+        except self._connection_exceptions:
             res = False
 
         return res
@@ -298,12 +368,189 @@ class Cache:
             whether or not the key exists
         """
         try:
+            self._connect()
+
             res = self.adapter.exists(key)
-        except self.adapter.connection_exceptions:
+        except self._connection_exceptions:
             res = False
 
         return res
 
+    def scan(self, pattern: str = "*") -> Iterator[str]:
+        """
+        Iterates over the keys matching a glob-style `pattern`, without fetching their values.
+
+        Keys are streamed from the storage (e.g. using `SCAN` with Redis), so that enumerating a large
+        storage does not load all its keys at once.
+
+        Examples:
+            ```python
+            from flashback.caching import Cache
+
+            cache = Cache()
+            cache.batch_set(["user:1", "user:2", "post:1"], ["val1", "val2", "val3"])
+
+            list(cache.scan("user:*"))
+            #=> ["user:1", "user:2"]
+            ```
+
+        Params:
+            pattern: the glob-style pattern to match the keys against
+
+        Returns:
+            the matching keys, yielded one at a time
+
+        Raises:
+            flashback.caching.adapters.base.BaseAdapter.connection_exceptions: if no connection with the storage
+            NotImplementedError: if the adapter can't enumerate its keys (e.g. memcached)
+        """
+        self._connect()
+
+        yield from self.adapter.scan(pattern)
+
+    def size(self) -> int:
+        """
+        Counts the keys in the storage.
+
+        Examples:
+            ```python
+            from flashback.caching import Cache
+
+            cache = Cache()
+            cache.batch_set(["key1", "key2"], ["val1", "val2"])
+
+            cache.size()
+            #=> 2
+            ```
+
+        Returns:
+            the number of keys
+
+        Raises:
+            flashback.caching.adapters.base.BaseAdapter.connection_exceptions: if no connection with the storage
+        """
+        self._connect()
+
+        return self.adapter.size()
+
+    def memory_usage(self, key: str) -> int | None:
+        """
+        Measures the number of bytes used by `key` and its value in the storage.
+
+        The measure depends on the adapter: the memory used by the dict entry for the memory adapter,
+        the serialized entry for the disk adapter, `MEMORY USAGE` for Redis, and the raw value for
+        memcached.
+
+        Examples:
+            ```python
+            from flashback.caching import Cache
+
+            cache = Cache()
+            cache.set("key", "val")
+
+            cache.memory_usage("key")
+            #=> 106
+
+            cache.memory_usage("yek")
+            #=> None
+            ```
+
+        Params:
+            key: the key to measure
+
+        Returns:
+            the number of bytes used, or None if the key does not exist
+
+        Raises:
+            flashback.caching.adapters.base.BaseAdapter.connection_exceptions: if no connection with the storage
+        """
+        self._connect()
+
+        return self.adapter.memory_usage(key)
+
+    def largest_keys(self, count: int = 10, pattern: str = "*") -> list[tuple[str, int]]:
+        """
+        Reports the `count` keys matching `pattern` using the most memory in the storage.
+
+        Only keeps `count` keys in memory while scanning the storage.
+
+        Examples:
+            ```python
+            from flashback.caching import Cache
+
+            cache = Cache()
+            cache.batch_set(["key1", "key2"], ["val", "a much longer val"])
+
+            cache.largest_keys(1)
+            #=> [("key2", 121)]
+            ```
+
+        Params:
+            count: the number of keys to report
+            pattern: the glob-style pattern to match the keys against
+
+        Returns:
+            the keys and their memory usage in bytes, from the largest to the smallest
+
+        Raises:
+            flashback.caching.adapters.base.BaseAdapter.connection_exceptions: if no connection with the storage
+            NotImplementedError: if the adapter can't enumerate its keys (e.g. memcached)
+        """
+        usages = ((key, self.memory_usage(key)) for key in self.scan(pattern))
+
+        # Keys expired or deleted while scanning have no usage
+        existing_usages = ((key, usage) for key, usage in usages if usage is not None)
+
+        return heapq.nlargest(count, existing_usages, key=lambda item: item[1])
+
+    def acquire(self, key: str, count: int = 1, limit: int = 10, period: float = 1.0) -> int | None:
+        """
+        Atomically takes up to `count` tokens from the bucket stored under `key`, which holds at
+        most `limit` tokens and is refilled with `limit` tokens every `period` seconds.
+
+        Meant to share a rate limit across processes and hosts using the same storage. The memory,
+        disk and Redis (via a Lua script) adapters implement a token bucket with the generic cell
+        rate algorithm, while memcached counts the tokens taken per window of `period` seconds
+        (allowing bursts at the windows' boundaries).
+
+        The state of the bucket is stored under `key` (or under `f"{key}:{window}"` for memcached)
+        like any other entry: it is listed by `scan()`, counted by `size()` and `largest_keys()`,
+        and overwritten by `set()`. Prefixing the keys of the buckets, as `@sampled` does with
+        "flashback:sampled:", tells them apart from the keys cached.
+
+        Examples:
+            ```python
+            from flashback.caching import Cache
+
+            cache = Cache(adapter="redis")
+
+            # 10 calls per second, shared by all the processes using the same Redis
+            cache.acquire("api-calls", limit=10, period=1)
+            #=> 1
+
+            # Takes several tokens at once, to save round trips
+            cache.acquire("api-calls", count=20, limit=10, period=1)
+            #=> 9
+            ```
+
+        Params:
+            key: the key under which to store the state of the bucket
+            count: the number of tokens to take
+            limit: the max number of tokens in the bucket
+            period: the number of seconds to refill the bucket
+
+        Returns:
+            the number of tokens taken, between 0 and `count`, or None if the storage is unreachable
+        """
+        try:
+            self._connect()
+
+            taken = self.adapter.acquire(key, count, limit, period)
+        except self._connection_exceptions:
+            taken = None
+
+        return taken
+
     def flush(self) -> bool:
         """
         Flushes all keys from the storage.
@@ -347,7 +594,40 @@ class Cache:
         Raises:
             flashback.caching.adapters.base.BaseAdapter.connection_exceptions: if no connection with the storage
         """
-        return self.adapter.ping()
+        res = self.adapter.ping()
+        self._connected = True
+
+        return res
+
+    def _connect(self) -> None:
+        if self._connected:
+            return
+
+        with self._lock:
+            if self._connected:
+                return
+
+            if self._flush_on_connect:
+                self.flush()
+
+            # Notifies that we have a new connection
+            self.ping()
+
+    def _build_adapter(self) -> BaseAdapter:
+        if not self._shared:
+            return self._adapter_class(**self._adapter_kwargs)
+
+        try:
+            key = (self._adapter_class, tuple(sorted(self._adapter_kwargs.items())))
+            hash(key)
+        except TypeError:  # unhashable kwargs (e.g. dicts), can't be shared safely
+            return self._adapter_class(**self._adapter_kwargs)
+
+        with _SHARED_ADAPTERS_LOCK:
+            if key not in _SHARED_ADAPTERS:
+                _SHARED_ADAPTERS[key] = self._adapter_class(**self._adapter_kwargs)
+
+            return _SHARED_ADAPTERS[key]
 
     @staticmethod
     def _decode_json(json_value: t.Any) -> t.Any:
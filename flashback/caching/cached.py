@@ -5,12 +5,15 @@ import inspect
 import logging
 import typing as t
 
+from ..deadline import remaining_time
 from .cache import Cache
 
 
 def cached[**P, R](
     adapter: str = "memory",
     hash_keys: bool = False,
+    lazy: bool = True,
+    shared: bool = False,
     **kwargs: t.Any,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
@@ -43,44 +46,39 @@ def cached[**P, R](
         func(1, 2)
         #=> Cache hit
         #=> 3
+
+        # Decorators configured identically use the same adapter instance (and connection)
+        @cached(adapter="redis", shared=True)
+        def other_func(a, b):
+            return a - b
         ```
 
+    On a cache miss within an elapsed deadline (see `flashback.deadline`), a `TimeoutError` is
+    raised instead of computing the value.
+
+    By default, the adapter is neither instanciated nor pinged until the first call of the decorated
+    callable, so that decorating does not open any connection (see `lazy`).
+
     Params:
         adapter: the cache storage adapter to use
+        hash_keys: whether or not to hash the keys built with md5
+        lazy: whether or not to wait for the first call to instanciate and ping the adapter
+        shared: whether or not to reuse the adapter of other caches configured identically
         kwargs: every keyword argument, forwarded to the cache adapter
 
     Returns:
         a wrapper used to decorate a callable
     """
-    cache = Cache(adapter, **kwargs)
-
-    def _build_key(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> str:
-        name = getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
-
-        def _format_argument(v: t.Any) -> str:
-            return f"{v!r}<{type(v).__name__}>"
-
-        positional = [_format_argument(a) for a in args]
-        keyword = [f"{k}={_format_argument(v)}" for k, v in sorted(kwargs.items())]
-
-        if positional and keyword:
-            inner = ", ".join([*positional, "*", *keyword])
-        elif positional:
-            inner = ", ".join(positional)
-        else:
-            inner = ", ".join(keyword)
-
-        return f"{name}({inner})"
+    cache = Cache(adapter, lazy=lazy, shared=shared, **kwargs)
 
     if hash_keys:
 
         def _make_key(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> str:
-            key = _build_key(func, *args, **kwargs)
-            return hashlib.md5(key.encode()).hexdigest()
+            return _hash_key(_build_key(_get_name(func), args, kwargs))
     else:
 
         def _make_key(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> str:
-            return _build_key(func, *args, **kwargs)
+            return _build_key(_get_name(func), args, kwargs)
 
     def wrapper(func: Callable[P, R]) -> Callable[P, R]:
         # `.getmodule().__name__` returns the same value as `__name__` called from the module we
@@ -103,6 +101,8 @@ def cached[**P, R](
 
             logger.debug("Cache miss")
 
+            _check_deadline()
+
             value = func(*args, **kwargs)
             cache.set(key, value)
 
@@ -111,3 +111,35 @@ def cached[**P, R](
         return inner
 
     return wrapper
+
+
+def _check_deadline() -> None:
+    # Computing a value past the deadline of the execution context would be wasted work
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise TimeoutError("deadline elapsed before computing the value")
+
+
+def _get_name(func: Callable[..., t.Any]) -> str:
+    return getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
+
+
+def _build_key(name: str, args: tuple[t.Any, ...], kwargs: dict[str, t.Any]) -> str:
+    def _format_argument(v: t.Any) -> str:
+        return f"{v!r}<{type(v).__name__}>"
+
+    positional = [_format_argument(a) for a in args]
+    keyword = [f"{k}={_format_argument(v)}" for k, v in sorted(kwargs.items())]
+
+    if positional and keyword:
+        inner = ", ".join([*positional, "*", *keyword])
+    elif positional:
+        inner = ", ".join(positional)
+    else:
+        inner = ", ".join(keyword)
+
+    return f"{name}({inner})"
+
+
+def _hash_key(key: str) -> str:
+    return hashlib.md5(key.encode()).hexdigest()
@@ -0,0 +1,166 @@
+from collections.abc import Callable
+from threading import RLock
+import functools
+import inspect
+import logging
+import typing as t
+import weakref
+
+from .cache import Cache
+from .cached import _build_key, _check_deadline, _get_name, _hash_key
+
+
+def cached_method[S, **P, R](
+    adapter: str = "memory",
+    identity: str | None = None,
+    hash_keys: bool = False,
+    lazy: bool = True,
+    shared: bool = False,
+    **kwargs: t.Any,
+) -> Callable[[Callable[t.Concatenate[S, P], R]], Callable[t.Concatenate[S, P], R]]:
+    """
+    Caches the return of a method per instance, under a type-aware key built with its arguments.
+
+    Unlike `flashback.caching.cached`, the instance is never part of the key:
+
+    - without `identity`, each instance has its own in-memory cache (in a single shard, to keep it
+    light), referenced weakly and freed along with the instance, which requires the instances to
+    support weak references (e.g. with `__weakref__` in their `__slots__`)
+    - with `identity`, the value of this attribute of the instance is used instead, which allows
+    instances representing the same entity (even across processes) to share their cached values,
+    with any adapter
+
+    Examples:
+        ```python
+        from flashback.caching import cached_method
+
+        class User:
+            def __init__(self, id):
+                self.id = id
+
+            @cached_method()
+            def greet(self, greeting):
+                return f"{greeting} {self.id}"
+
+            # Combines with `property` to cache attributes
+            @property
+            @cached_method(adapter="redis", identity="id")
+            def friends(self):
+                return fetch_friends(self.id)
+
+        user = User(1)
+
+        user.greet("Hello")
+        #=> Cache miss
+        #=> "Hello 1"
+
+        user.greet("Hello")
+        #=> Cache hit
+        #=> "Hello 1"
+
+        # Another instance does not share the cache of the first one
+        User(1).greet("Hello")
+        #=> Cache miss
+        #=> "Hello 1"
+
+        # Unless an identity is given
+        User(1).friends
+        #=> Cache hit
+        ```
+
+    Params:
+        adapter: the cache storage adapter to use, must be "memory" when `identity` is not given
+        identity: the name of the instance attribute used to identify the instance in the keys
+        hash_keys: whether or not to hash the keys built with md5
+        lazy: whether or not to wait for the first call to instanciate and ping the adapter
+        shared: whether or not to reuse the adapter of other caches configured identically (only
+            with `identity`)
+        kwargs: every keyword argument, forwarded to the cache adapter
+
+    Returns:
+        a wrapper used to decorate a method
+
+    Raises:
+        ValueError: if `adapter` is not "memory" and `identity` is not given
+        TypeError: if `identity` is not given and the instance does not support weak references
+    """
+    if identity is None and adapter != "memory":
+        raise ValueError(f"invalid adapter {adapter!r}, per-instance caching without 'identity' expects 'memory'")
+
+    def wrapper(func: Callable[t.Concatenate[S, P], R]) -> Callable[t.Concatenate[S, P], R]:
+        # `.getmodule().__name__` returns the same value as `__name__` called from the module we
+        # decorate.
+        # Since `logging` is a singleton, everytime we call `logging.getLogger()` with the same
+        # name, we receive the same logger, which "hides" this decorator as if the logging was
+        # made from within the callable we decorate
+        module = inspect.getmodule(func)
+        logger = logging.getLogger(None if module is None else module.__name__)
+
+        name = _get_name(func)
+
+        if identity is None:
+            # Keyed by id() rather than by instance to support unhashable instances, the finalizer
+            # removes the entry before the id can be reused by another object
+            caches: dict[int, Cache] = {}
+            lock = RLock()
+
+            def _get_cache(instance: S) -> Cache:
+                instance_id = id(instance)
+
+                cache = caches.get(instance_id)
+                if cache is None:
+                    with lock:
+                        cache = caches.get(instance_id)
+                        if cache is None:
+                            try:
+                                weakref.finalize(instance, caches.pop, instance_id, None)
+                            except TypeError as e:
+                                raise TypeError(
+                                    f"invalid instance of {type(instance).__qualname__!r}, per-instance caching "
+                                    "without 'identity' expects instances supporting weak references",
+                                ) from e
+
+                            # A single shard is enough for the calls of a single instance
+                            cache = Cache(adapter, lazy=lazy, **{"shards": 1, **kwargs})
+                            caches[instance_id] = cache
+
+                return cache
+
+            def _get_prefix(_instance: S) -> str:
+                return name
+        else:
+            shared_cache = Cache(adapter, lazy=lazy, shared=shared, **kwargs)
+
+            def _get_cache(_instance: S) -> Cache:
+                return shared_cache
+
+            def _get_prefix(instance: S) -> str:
+                return f"{name}[{getattr(instance, identity)!r}]"
+
+        @functools.wraps(func)
+        def inner(instance: S, *args: P.args, **kwargs: P.kwargs) -> R:
+            cache = _get_cache(instance)
+
+            key = _build_key(_get_prefix(instance), args, kwargs)
+            if hash_keys:
+                key = _hash_key(key)
+
+            value = cache.get(key)
+
+            if value is not None:
+                logger.debug("Cache hit")
+
+                return t.cast("R", value)
+
+            logger.debug("Cache miss")
+
+            _check_deadline()
+
+            value = func(instance, *args, **kwargs)
+            cache.set(key, value)
+
+            return value
+
+        return inner
+
+    return wrapper
@@ -0,0 +1,81 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+
+# The monotonic time at which the current execution context must complete, if any
+_deadline: ContextVar[float | None] = ContextVar("flashback_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Sets a deadline on the execution context, `seconds` from now.
+
+    The deadline is propagated to the callables called within the context (including in threads
+    started by `@timeoutable` and `@hedged`, and in `asyncio` tasks), and is respected by
+    `@timeoutable`, `@retryable`, `@cached`, and the wait mode of `@sampled`, which shrink their
+    waits to the remaining time, and fail fast once it is elapsed.
+
+    Deadlines only shrink: a deadline later than the one of an enclosing context is ignored.
+
+    Examples:
+        ```python
+        from flashback import deadline, remaining_time
+
+        with deadline(5):
+            remaining_time()
+            #=> 4.99
+
+            with deadline(10):
+                remaining_time()
+                #=> 4.99
+
+        remaining_time()
+        #=> None
+        ```
+
+    Params:
+        seconds: the number of seconds before the deadline
+
+    Returns:
+        a context manager yielding the monotonic time of the deadline
+    """
+    deadline_at = time.monotonic() + seconds
+
+    enclosing_deadline_at = _deadline.get()
+    if enclosing_deadline_at is not None:
+        deadline_at = min(deadline_at, enclosing_deadline_at)
+
+    token = _deadline.set(deadline_at)
+    try:
+        yield deadline_at
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """
+    Computes the number of seconds left before the deadline of the execution context.
+
+    Examples:
+        ```python
+        from flashback import deadline, remaining_time
+
+        remaining_time()
+        #=> None
+
+        with deadline(5):
+            remaining_time()
+            #=> 4.99
+        ```
+
+    Returns:
+        the number of seconds left (negative once the deadline is elapsed), None without deadline
+    """
+    deadline_at = _deadline.get()
+    if deadline_at is None:
+        return None
+
+    return deadline_at - time.monotonic()
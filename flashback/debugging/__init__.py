@@ -1,16 +1,28 @@
 from .caller import caller
+from .continuous_profiler import ContinuousProfiler
+from .flamegraph import FlameGraph
 from .get_callable import get_callable
 from .get_call_context import get_call_context
 from .get_frameinfo import get_frameinfo
+from .memory_profiled import memory_profiled
 from .profiled import profiled
+from .sampling_profiler import SamplingProfiler
+from .switch import disable_debugging, enable_debugging, is_debugging_enabled
 from .xp import xp
 
 
 __all__ = (
+    "ContinuousProfiler",
+    "FlameGraph",
+    "SamplingProfiler",
     "caller",
+    "disable_debugging",
+    "enable_debugging",
     "get_call_context",
     "get_callable",
     "get_frameinfo",
+    "is_debugging_enabled",
+    "memory_profiled",
     "profiled",
     "xp",
 )
@@ -8,6 +8,7 @@ from .formatter import Formatter
 from .get_call_context import get_call_context
 from .get_callable import get_callable
 from .get_frameinfo import get_frameinfo
+from .switch import _switch
 
 
 ANSI_DIM_START = "\x1b[2m"
@@ -61,8 +62,12 @@ def caller(depth: int = 2, context: int = 5, output: t.TextIO = sys.stderr) -> C
         output: where to write to
 
     Returns:
-        the callable calling if found
+        the callable calling if found, or None if the debugging helpers are disabled (see
+        `flashback.debugging.disable_debugging()`)
     """
+    if not _switch.enabled:
+        return None
+
     try:
         frameinfo = get_frameinfo(depth)
     except ValueError:
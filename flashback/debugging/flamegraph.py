@@ -0,0 +1,302 @@
+from collections import Counter
+from collections.abc import Mapping
+from html import escape
+import os
+import typing as t
+import zlib
+
+from ..formatting import oxford_join
+from .sampling_profiler import FunctionKey, FunctionStats
+
+
+class FlameGraph:
+    """
+    Represents the call stacks of a profile, weighted by the time (or number of samples) spent in
+    them, and renders them without any extra dependency:
+        - in the collapsed-stack format (one "caller;callee weight" line per stack), understood by
+        Brendan Gregg's `flamegraph.pl`, speedscope, or inferno
+        - as a self-contained SVG flamegraph, with the details of each frame shown on hover
+        - as a self-contained HTML page embedding the SVG flamegraph, zooming in on a frame on click
+
+    The stacks can be exact, when built from the samples of a `SamplingProfiler`, or estimated from
+    the stats of `cProfile` (or `pstats`), which only keep the callers of each function: the time
+    of a function is then split between its callers in proportion of the time spent in each call.
+
+    Examples:
+        ```python
+        from flashback.debugging import FlameGraph, SamplingProfiler
+
+        profiler = SamplingProfiler()
+        profiler.runcall(handle, request)
+
+        flamegraph = FlameGraph(profiler.snapshot_samples(), unit="samples")
+        flamegraph.dump("handle.svg", "svg")
+
+        print(flamegraph.to_collapsed())
+        #=> handle (app.py:12);parse (app.py:30) 12
+        #=> handle (app.py:12);render (app.py:45) 31
+        ```
+    """
+
+    FORMAT_COLLAPSED = "collapsed"
+    FORMAT_SVG = "svg"
+    FORMAT_HTML = "html"
+    FORMATS = (FORMAT_COLLAPSED, FORMAT_SVG, FORMAT_HTML)
+
+    # The dimensions of the SVG, in pixels
+    WIDTH = 1200
+    FRAME_HEIGHT = 16
+    # The min width of a frame to render, in pixels, to keep the rendering light
+    MIN_FRAME_WIDTH = 0.1
+
+    def __init__(self, stacks: Mapping[tuple[FunctionKey, ...], int | float], unit: str = "samples") -> None:
+        """
+        Params:
+            stacks: the weight of each call stack, outermost frame first
+            unit: the unit of the weights
+        """
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        for stack, weight in stacks.items():
+            if stack and weight > 0:
+                self.stacks[tuple(_label(function) for function in stack)] += round(weight)
+
+        self.unit = unit
+
+    @classmethod
+    def from_stats(cls, stats: Mapping[FunctionKey, FunctionStats]) -> t.Self:
+        """
+        Estimates the call stacks of a profile from its stats, in the format of `pstats`.
+
+        Params:
+            stats: the stats of the profile (e.g. `pstats.Stats(profile).stats`)
+
+        Returns:
+            the flamegraph of the stacks, weighted in microseconds
+        """
+        return cls(_estimate_stacks(stats), unit="us")
+
+    def to_collapsed(self) -> str:
+        """
+        Returns:
+            the stacks in the collapsed-stack format
+        """
+        return "".join(f"{';'.join(stack)} {weight}\n" for stack, weight in sorted(self.stacks.items()))
+
+    def to_svg(self, title: str = "Flame Graph") -> str:
+        """
+        Params:
+            title: the title displayed above the flamegraph
+
+        Returns:
+            the flamegraph as a self-contained SVG document
+        """
+        frames = self._layout()
+        depth = max((frame_depth for _, frame_depth, _, _ in frames), default=0)
+        height = (depth + 3) * self.FRAME_HEIGHT
+        total = sum(self.stacks.values())
+
+        elements = [
+            (
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.WIDTH}" height="{height}" '
+                f'viewBox="0 0 {self.WIDTH} {height}" font-family="Verdana, sans-serif" font-size="12">'
+            ),
+            "<style>.frame:hover rect { stroke: #000; stroke-width: 0.5; cursor: pointer; }</style>",
+            (
+                f'<text x="{self.WIDTH / 2}" y="{self.FRAME_HEIGHT}" text-anchor="middle" font-size="16">'
+                f"{escape(title)}</text>"
+            ),
+        ]
+        for label, frame_depth, start, weight in frames:
+            x = start / total * self.WIDTH
+            width = weight / total * self.WIDTH
+            y = height - (frame_depth + 1) * self.FRAME_HEIGHT
+            # Fits as many characters as possible, assuming 7 pixels per character
+            characters = int((width - 6) / 7)
+            text = label if len(label) <= characters else f"{label[: characters - 2]}.." if characters > 2 else ""
+
+            elements.append(
+                f'<g class="frame" data-start="{start}" data-weight="{weight}" data-depth="{frame_depth}">'
+                f"<title>{escape(label)} ({weight} {escape(self.unit)}, {weight / total:.2%})</title>"
+                f'<rect x="{x:.2f}" y="{y}" width="{width:.2f}" height="{self.FRAME_HEIGHT - 1}" '
+                f'fill="{_color(label)}" rx="2" />'
+                f'<text x="{x + 3:.2f}" y="{y + self.FRAME_HEIGHT - 4}">{escape(text)}</text>'
+                "</g>",
+            )
+        elements.append("</svg>")
+
+        return "\n".join(elements)
+
+    def to_html(self, title: str = "Flame Graph") -> str:
+        """
+        Params:
+            title: the title of the page
+
+        Returns:
+            the flamegraph as a self-contained HTML page
+        """
+        return _HTML_TEMPLATE.format(
+            title=escape(title),
+            svg=self.to_svg(title),
+            total=sum(self.stacks.values()),
+            width=self.WIDTH,
+        )
+
+    def dump(self, file: str | os.PathLike[str], output_format: str, title: str | None = None) -> None:
+        """
+        Writes the flamegraph to a file.
+
+        Params:
+            file: the path of the file to write to
+            output_format: the format to write the flamegraph in
+            title: the title of the flamegraph, by default the name of the file
+
+        Raises:
+            ValueError: if `output_format` is unknown
+        """
+        title = title or os.path.basename(file)
+
+        if output_format == self.FORMAT_COLLAPSED:
+            content = self.to_collapsed()
+        elif output_format == self.FORMAT_SVG:
+            content = self.to_svg(title)
+        elif output_format == self.FORMAT_HTML:
+            content = self.to_html(title)
+        else:
+            formats_choices = oxford_join(self.FORMATS, last_sep=", or ")
+            raise ValueError(f"invalid output_format {output_format!r}, expecting {formats_choices}")
+
+        with open(file, "w", encoding="utf-8") as outfile:
+            outfile.write(content)
+
+    def _layout(self) -> list[tuple[str, int, int, int]]:
+        # Merges the stacks in a tree, whose children are sorted alphabetically as in `flamegraph.pl`
+        root: _Node = _Node()
+        for stack, weight in self.stacks.items():
+            node = root
+            node.weight += weight
+            for label in stack:
+                node = node.children.setdefault(label, _Node())
+                node.weight += weight
+
+        total = max(root.weight, 1)
+        min_weight = total * self.MIN_FRAME_WIDTH / self.WIDTH
+
+        frames: list[tuple[str, int, int, int]] = []
+        pending = [(root, 0, 0)]
+        while pending:
+            node, depth, start = pending.pop()
+            for label in sorted(node.children):
+                child = node.children[label]
+                if child.weight >= min_weight:
+                    frames.append((label, depth, start, child.weight))
+                    pending.append((child, depth + 1, start))
+                start += child.weight
+
+        return frames
+
+
+class _Node:
+    __slots__ = ("children", "weight")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.weight = 0
+
+
+def _estimate_stacks(stats: Mapping[FunctionKey, FunctionStats]) -> Counter[tuple[FunctionKey, ...]]:
+    callees: dict[FunctionKey, dict[FunctionKey, float]] = {}
+    for callee, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, caller_cumulative) in callers.items():
+            callees.setdefault(caller, {})[callee] = caller_cumulative
+
+    stacks: Counter[tuple[FunctionKey, ...]] = Counter()
+    # The roots are the functions called from outside the profile
+    roots = [function for function, (_, _, _, _, callers) in stats.items() if not set(callers) & set(stats)]
+    pending = [((root,), stats[root][3]) for root in roots]
+    # Prunes the stacks too light to be rendered, as the number of paths in a call graph can explode
+    min_cumulative = sum(cumulative for _, cumulative in pending) * 1e-4
+    while pending:
+        stack, cumulative = pending.pop()
+        function = stack[-1]
+        _, _, own, total, _ = stats[function]
+        # The share of the time of the function spent in this stack
+        ratio = cumulative / total if total > 0 else 0
+
+        stacks[stack] += own * ratio * 1e6
+        for callee, callee_cumulative in callees.get(function, {}).items():
+            # Recursive calls are already accounted in the cumulative time of the outer call
+            if callee not in stack and callee in stats and callee_cumulative * ratio >= min_cumulative:
+                pending.append(((*stack, callee), callee_cumulative * ratio))
+
+    return stacks
+
+
+def _label(function: FunctionKey) -> str:
+    filename, lineno, name = function
+    if filename == "~":
+        # Built-in functions, as named by `cProfile`
+        return name.replace(";", ":")
+
+    return f"{name} ({os.path.basename(filename)}:{lineno})".replace(";", ":")
+
+
+def _color(label: str) -> str:
+    # A warm color, stable across renderings
+    hashed = zlib.crc32(label.encode())
+    red = 205 + hashed % 50
+    green = (hashed >> 8) % 230
+    blue = (hashed >> 16) % 55
+
+    return f"rgb({red},{green},{blue})"
+
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>body {{ margin: 8px; }} #reset {{ font-family: Verdana, sans-serif; font-size: 12px; }}</style>
+</head>
+<body>
+<button id="reset">Reset zoom</button>
+{svg}
+<script>
+const total = {total};
+const width = {width};
+const frames = Array.from(document.querySelectorAll(".frame"));
+
+function zoom(start, weight, depth) {{
+    for (const frame of frames) {{
+        const frameStart = Number(frame.dataset.start);
+        const frameWeight = Number(frame.dataset.weight);
+        const visible = frameStart + frameWeight > start && frameStart < start + weight
+            && (Number(frame.dataset.depth) >= depth || frameWeight >= weight);
+        frame.style.display = visible ? "" : "none";
+        if (!visible) continue;
+
+        const x = (Math.max(frameStart, start) - start) / weight * width;
+        const frameWidth = (Math.min(frameStart + frameWeight, start + weight) - Math.max(frameStart, start))
+            / weight * width;
+        const rect = frame.querySelector("rect");
+        const text = frame.querySelector("text");
+        const label = frame.querySelector("title").textContent.replace(/ \\([^(]*\\)$/, "");
+        const characters = Math.floor((frameWidth - 6) / 7);
+
+        rect.setAttribute("x", x);
+        rect.setAttribute("width", frameWidth);
+        text.setAttribute("x", x + 3);
+        text.textContent = label.length <= characters ? label
+            : characters > 2 ? label.slice(0, characters - 2) + ".." : "";
+    }}
+}}
+
+for (const frame of frames) {{
+    frame.addEventListener("click", () => zoom(
+        Number(frame.dataset.start), Number(frame.dataset.weight), Number(frame.dataset.depth),
+    ));
+}}
+document.getElementById("reset").addEventListener("click", () => zoom(0, total, 0));
+</script>
+</body>
+</html>
+"""
@@ -1,6 +1,16 @@
 import ast
 import inspect
+import typing as t
 from textwrap import dedent
+from threading import Lock
+
+
+# The max number of call contexts cached (and of calls parsed, or call sites counted, by
+# `flashback.debugging.xp`)
+CACHE_SIZE = 1024
+
+_call_contexts: dict[t.Hashable, tuple[list[str], int | None, tuple[int, int] | None]] = {}
+_lock = Lock()
 
 
 def get_call_context(
@@ -14,6 +24,15 @@ def get_call_context(
     Returns empty results if the frame has no code_context, or if the call is not found in the
     source file.
 
+    Locates the end of the call with the position of the instruction being executed by the frame,
+    and only falls back to parsing growing slices of the source when the call is part of a larger
+    statement. The results are cached per call site, identified by the code and the instruction of
+    the frame, so that calls made in a loop only inspect their source once.
+
+    The cache follows the code running rather than its source file: a module edited and reloaded
+    has new code, and is inspected again, while a module edited but not reloaded keeps the results
+    of its former source. The code of the call sites cached is kept alive, up to `CACHE_SIZE` ones.
+
     Examples:
         ```python
         from flashback.debugging import get_frameinfo, get_call_context
@@ -52,6 +71,26 @@ def get_call_context(
     if not frameinfo.code_context:
         return [], None, None
 
+    code = frameinfo.frame.f_code
+    # Code objects compare by content, whatever their file
+    key = (code.co_filename, code, frameinfo.frame.f_lasti, size)
+    cached = _call_contexts.get(key)
+    if cached is not None:
+        context, context_lineno, call_boundaries = cached
+
+        return list(context), context_lineno, call_boundaries
+
+    context, context_lineno, call_boundaries = _find_call_context(frameinfo, size)
+    if context:
+        _remember(_call_contexts, key, (list(context), context_lineno, call_boundaries))
+
+    return context, context_lineno, call_boundaries
+
+
+def _find_call_context(
+    frameinfo: inspect.FrameInfo,
+    size: int,
+) -> tuple[list[str], int | None, tuple[int, int] | None]:
     try:
         source, _ = inspect.findsource(frameinfo.frame)
     except OSError:
@@ -65,7 +104,15 @@ def get_call_context(
     lineno = frameinfo.lineno
     index_start = lineno - 1
 
-    for index_end in range(index_start + 1, len(source) + 1):
+    # The call ends on the last line of the instruction being executed, unless it is part of a
+    # statement going on after it
+    positions = frameinfo.positions
+    first_index_end = index_start + 1
+    if positions is not None and positions.end_lineno is not None and positions.end_lineno >= lineno:
+        first_index_end = positions.end_lineno
+
+    call_line = ""
+    for index_end in range(first_index_end, len(source) + 1):
         call_line = dedent("".join(source[index_start:index_end]))
 
         try:
@@ -90,3 +137,19 @@ def get_call_context(
     call_boundaries = (call_start, call_start + call_statement_len)
 
     return context, context_lineno, call_boundaries
+
+
+def _remember[K, V](cache: dict[K, V], key: K, value: V) -> V:
+    # Reads are lock-free, as getting a single dict item is atomic, while the evictions iterate
+    with _lock:
+        # Another thread may have remembered a value meanwhile
+        if key in cache:
+            return cache[key]
+
+        # Evicts the oldest entry, as dicts keep the insertion order
+        while cache and len(cache) >= CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+
+        cache[key] = value
+
+        return value
@@ -0,0 +1,236 @@
+from collections.abc import Awaitable, Callable
+from threading import Lock
+from tracemalloc import Snapshot, StatisticDiff, Traceback
+from types import TracebackType
+import functools
+import inspect
+import linecache
+import tracemalloc
+import typing as t
+
+from .switch import _switch
+
+
+class memory_profiled:  # noqa: N801
+    """
+    Measures the memory allocated by a callable (or a block of code) with `tracemalloc`, and dumps
+    a report to a file for further analysis.
+
+    By default, writes the report to a file called f"{func.__name__}.memory.txt" (or
+    "memory_profiled.memory.txt" for a block of code), located in the folder from where it has been
+    called, next to the stats written by `@profiled`.
+
+    For each call, records:
+        - its net allocations, the memory still allocated at its end
+        - its peak allocations, the max memory allocated during its execution
+        - its top allocating lines, with the difference to the previous call, which points out the
+        lines allocating more at each call (e.g. a leak)
+
+    The report is rewritten at the end of each call, and the measures of the last call are exposed
+    as attributes (`net`, `peak`, `max_peak` across the calls, and `top_lines`).
+
+    If `tracemalloc` is not tracing yet, it is only started during the calls, so that the rest of
+    the program is not slowed down. Since `tracemalloc` traces the whole process, the allocations
+    made by other threads (or tasks) during a call are accounted to it, and overlapping calls (e.g.
+    recursive calls) are measured as one.
+
+    When the debugging helpers are disabled (see `flashback.debugging.disable_debugging()`), the
+    decorated callables are called without being measured.
+
+    Examples:
+        ```python
+        from flashback.debugging import memory_profiled
+
+        @memory_profiled()
+        def load(path):
+            with open(path) as infile:
+                return infile.readlines()
+
+        load("data.csv")
+        #=> Writes "load.memory.txt"
+
+        load.memory_profile.peak
+        #=> 10485760
+
+        with memory_profiled("parsing.memory.txt") as profile:
+            parse(lines)
+
+        profile.net
+        #=> 2048
+        ```
+    """
+
+    def __init__(self, output: str | None = None, *, limit: int = 10) -> None:
+        """
+        Params:
+            output: the output to write the report to
+            limit: the number of top allocating lines to report
+
+        Raises:
+            ValueError: if `limit` is not strictly positive
+        """
+        if limit < 1:
+            raise ValueError(f"invalid limit {limit!r}, expecting a strictly positive integer")
+
+        self.output = output
+        self.limit = limit
+        self.name = "memory_profiled"
+
+        self.calls = 0
+        self.net = 0
+        self.peak = 0
+        self.max_peak = 0
+        self.top_lines: list[StatisticDiff] = []
+
+        self._lock = Lock()
+        self._depth = 0
+        self._started_tracing = False
+        self._traced_before = 0
+        self._snapshot_before: Snapshot | None = None
+        self._previous_allocations: dict[Traceback, tuple[int, int]] = {}
+
+    def __call__[**P, R](self, func: Callable[P, R]) -> Callable[P, R]:
+        self.name = func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            coroutine_func = t.cast("Callable[P, Awaitable[t.Any]]", func)
+
+            @functools.wraps(func)
+            async def async_inner(*args: P.args, **kwargs: P.kwargs) -> t.Any:
+                if not _switch.enabled:
+                    return await coroutine_func(*args, **kwargs)
+
+                with self:
+                    return await coroutine_func(*args, **kwargs)
+
+            setattr(async_inner, "memory_profile", self)  # noqa: B010
+
+            return t.cast("Callable[P, R]", async_inner)
+
+        @functools.wraps(func)
+        def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _switch.enabled:
+                return func(*args, **kwargs)
+
+            with self:
+                return func(*args, **kwargs)
+
+        setattr(inner, "memory_profile", self)  # noqa: B010
+
+        return inner
+
+    def __enter__(self) -> t.Self:
+        with self._lock:
+            self._depth += 1
+            if self._depth > 1:
+                return self
+
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+                self._snapshot_before = None
+            else:
+                # The allocations made before the call are already traced, and need to be excluded
+                self._snapshot_before = _take_snapshot()
+
+            self._traced_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        with self._lock:
+            self._depth -= 1
+            if self._depth > 0:
+                return
+
+            traced, peak = tracemalloc.get_traced_memory()
+            snapshot = _take_snapshot()
+            if self._started_tracing:
+                tracemalloc.stop()
+
+            self.calls += 1
+            self.net = traced - self._traced_before
+            self.peak = peak - self._traced_before
+            self.max_peak = max(self.max_peak, self.peak)
+            self.top_lines = self._diff_allocations(snapshot)
+
+            self.dump()
+
+    def dump(self) -> None:
+        """
+        Writes the report of the calls measured so far.
+        """
+        lines = [
+            f"Memory profile of {self.name} after {self.calls} call(s)",
+            f"Last call: net={_format_size(self.net)}, peak={_format_size(self.peak)}",
+            f"Max peak: {_format_size(self.max_peak)}",
+            "",
+            f"Top {self.limit} lines allocating during the last call (with the difference to the previous call):",
+        ]
+        for index, statistic in enumerate(self.top_lines, start=1):
+            frame = statistic.traceback[0]
+            lines.append(
+                f"#{index}: {frame.filename}:{frame.lineno}: size={_format_size(statistic.size)} "
+                f"({_format_size(statistic.size_diff, signed=True)}), count={statistic.count} "
+                f"({statistic.count_diff:+d})",
+            )
+            if source := linecache.getline(frame.filename, frame.lineno).strip():
+                lines.append(f"    {source}")
+
+        with open(self.output or f"{self.name}.memory.txt", "w", encoding="utf-8") as outfile:
+            outfile.write("\n".join(lines) + "\n")
+
+    def _diff_allocations(self, snapshot: Snapshot) -> list[StatisticDiff]:
+        if self._snapshot_before is None:
+            allocations = {
+                statistic.traceback: (statistic.size, statistic.count) for statistic in snapshot.statistics("lineno")
+            }
+        else:
+            allocations = {
+                statistic.traceback: (statistic.size_diff, statistic.count_diff)
+                for statistic in snapshot.compare_to(self._snapshot_before, "lineno")
+                if statistic.size_diff > 0
+            }
+
+        top_lines = []
+        for traceback, (size, count) in sorted(allocations.items(), key=lambda item: item[1][0], reverse=True):
+            previous_size, previous_count = self._previous_allocations.get(traceback, (0, 0))
+            top_lines.append(StatisticDiff(traceback, size, size - previous_size, count, count - previous_count))
+
+            if len(top_lines) >= self.limit:
+                break
+
+        self._previous_allocations = allocations
+        self._snapshot_before = None
+
+        return top_lines
+
+
+def _take_snapshot() -> Snapshot:
+    # Excludes the allocations made by tracemalloc and by the measures themselves
+    return tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+            tracemalloc.Filter(inclusive=False, filename_pattern=__file__),
+        ),
+    )
+
+
+def _format_size(size: int, *, signed: bool = False) -> str:
+    sign = "+" if signed and size >= 0 else ""
+    if abs(size) < 1024:
+        return f"{sign}{size} B"
+
+    value = float(size)
+    for unit in ("KiB", "MiB", "GiB"):
+        value /= 1024
+        if abs(value) < 1024 or unit == "GiB":
+            break
+
+    return f"{sign}{value:.1f} {unit}"
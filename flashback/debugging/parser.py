@@ -3,12 +3,12 @@ from textwrap import dedent
 import ast
 import inspect
 import os
+import sys
 import typing as t
 
 import re
 
-from .get_call_context import get_call_context
-from .get_frameinfo import get_frameinfo
+from .get_call_context import _remember, get_call_context
 
 
 class Parser:
@@ -21,6 +21,11 @@ class Parser:
 
     If needed, flattens the multi-line parameters to use them as argument names, using
     `CRE_OPENING_BRACKET` and `CRE_CLOSING_BRACKET`.
+
+    The calls parsed are cached per call site, identified by the code and the instruction of the
+    calling frame, so that calls made in a loop neither inspect their frame nor parse their
+    statement again. As with `flashback.debugging.get_call_context`, only the modules reloaded are
+    parsed again once edited.
     """
 
     COMPLEX_NODES = (
@@ -42,6 +47,7 @@ class Parser:
     def __init__(self, _offset: int = 2) -> None:
         # This is useful for tests or direct call to `Parser.parse` (in that case use 1)
         self._offset = _offset
+        self._calls: dict[t.Hashable, tuple[str, int, ast.Call | None, list[str] | None, str | None]] = {}
 
     def parse(self, *arguments: t.Any) -> tuple[str, int, list[tuple[str | None, t.Any]], str | None]:
         """
@@ -63,12 +69,23 @@ class Parser:
         try:
             # We access [2] because an end-user call to xp() calls this code (thus, two layers of calls)
             # If this code would have been called directly by the end-user, we would need to access [1]
-            frameinfo = get_frameinfo(self._offset)
-
-            filename = os.path.relpath(frameinfo.filename)
-            lineno = frameinfo.lineno
-
-            node, code, warning = self._parse_call(frameinfo, filename)
+            frame = sys._getframe(self._offset)  # noqa: SLF001
+
+            key = (frame.f_code.co_filename, frame.f_code, frame.f_lasti)
+            parsed_call = self._calls.get(key)
+            if parsed_call is None:
+                frameinfo = inspect.FrameInfo(frame, *inspect.getframeinfo(frame, 1))
+                parsed_call = (
+                    frameinfo.filename,
+                    frameinfo.lineno,
+                    *self._parse_call(frameinfo, os.path.relpath(frameinfo.filename)),
+                )
+                # The code without source (e.g. evaluated code) is compiled again at each call
+                if frameinfo.code_context:
+                    _remember(self._calls, key, parsed_call)
+
+            absolute_filename, lineno, node, code, warning = parsed_call
+            filename = os.path.relpath(absolute_filename)
             if node and code:
                 parsed_arguments = self._parse_arguments(node, code, arguments)
             else:  # parsing failed
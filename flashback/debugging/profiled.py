@@ -1,17 +1,86 @@
-from collections.abc import Callable
-import typing as t
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from contextvars import ContextVar, Token
+from threading import Lock
+import atexit
 import cProfile
 import functools
+import inspect
+import itertools
+import pstats
+import random
+import sys
+import time
+import typing as t
+
+from ..formatting import oxford_join
+from ..timing.stepping import SteppedAwaitable, step_async_generator, step_generator
+from .flamegraph import FlameGraph
+from .sampling_profiler import SamplingProfiler
+from .switch import _switch
+
+
+MODE_CALL = "call"
+MODE_AGGREGATE = "aggregate"
+MODE_SAMPLING = "sampling"
+MODES = (MODE_CALL, MODE_AGGREGATE, MODE_SAMPLING)
 
+FORMAT_PSTATS = "pstats"
+FORMATS = (FORMAT_PSTATS, *FlameGraph.FORMATS)
 
-def profiled[**P, R](output: str | None = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
+# Whether a profiled call is being profiled in the execution context, as a profiler enabled while
+# another one is enabled in the same thread corrupts the stats of the latter
+_profiling: ContextVar[bool] = ContextVar("profiling", default=False)
+
+
+def profiled[**P, R](  # noqa: PLR0913
+    output: str | None = None,
+    *,
+    mode: str = "call",
+    every: int = 1,
+    sample_rate: float = 1.0,
+    interval: float | None = None,
+    sampling_interval: float = 0.001,
+    output_format: str = "pstats",
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
     Profiles a call made to a callable and dump the stats to a file for further analysis.
 
     By default, prints the stats to a file called f"{func.__name__}.pstats", located in the folder
     from where it has been called.
 
-    To visualize the stats collected during profiling, you can use:
+    Instead of the stats, a flamegraph can be written with `output_format` (to a file called
+    f"{func.__name__}.{output_format}" by default), without any extra dependency: in the
+    collapsed-stack format ("collapsed"), or as a self-contained SVG ("svg") or HTML page ("html").
+    See `flashback.debugging.FlameGraph`. The sampling mode records the exact call stacks, whereas
+    the stats of `cProfile` only allow to estimate them.
+
+    Currently implements three modes:
+
+    - call
+        - Profiles each call with `cProfile`, and dumps its stats on its completion, overwriting
+        the stats of the previous call
+    - aggregate
+        - Profiles each call with `cProfile`, and aggregates the stats of all the calls
+    - sampling
+        - Samples the call stacks of each call with a `flashback.debugging.SamplingProfiler`, and
+        aggregates the samples of all the calls, which barely slows down the calls
+
+    In the aggregate and sampling modes, the stats are dumped every `interval` seconds (by the first
+    call completed after `interval` seconds), and when the interpreter exits. They can also be
+    dumped on demand, with the `dump_stats()` function exposed by the decorated callable.
+
+    To profile a hot callable, only every `every`-th call can be profiled, and/or a random sample of
+    the calls (with a `sample_rate` under 1). The calls made to a profiled callable while another
+    profiled call is being profiled are not profiled on their own, as they are already part of the
+    stats of the outer call. When the debugging helpers are disabled (see
+    `flashback.debugging.disable_debugging()`), the calls are not profiled at all.
+
+    Coroutine functions, generator functions and asynchronous generator functions are supported:
+    the profiler is only enabled during their own steps, so that neither the awaits (and the other
+    tasks running meanwhile) nor the consumers of the generators are profiled. The stats are dumped
+    on their completion (or exhaustion).
+
+    To visualize the stats collected during profiling (besides the flamegraphs), you can use:
         - snakeviz:
             ```bash
             pip install snakeviz
@@ -50,27 +119,271 @@ def profiled[**P, R](output: str | None = None) -> Callable[[Callable[P, R]], Ca
 
         fib(10)
         #=> Writes "profiled.pstats"
+
+        @profiled(mode="sampling", sample_rate=0.01, interval=60)
+        def handle(request):
+            ...
+
+        for request in requests:
+            handle(request)
+        #=> Writes "handle.pstats" every minute, and on exit
+
+        handle.dump_stats()
+        #=> Writes "handle.pstats"
+
+        @profiled(mode="sampling", output_format="html")
+        def render(template):
+            ...
+
+        render("index.html")
+        #=> Writes "render.html" on exit
         ```
 
     Params:
         output: the output to write the stats to
+        mode: whether to profile each call, to aggregate the profiles of the calls, or to aggregate
+            the samples of their call stacks
+        every: the number of calls between two profiled calls
+        sample_rate: the ratio of calls to profile, between 0 and 1
+        interval: the number of seconds between two dumps, in the aggregate and sampling modes
+        sampling_interval: the number of seconds between two samples, in the sampling mode
+        output_format: the format to write the stats in, as `pstats` stats or as a flamegraph
 
     Returns:
         Callable: a wrapper used to decorate a callable
+
+    Raises:
+        ValueError: if `mode` or `output_format` are unknown, or `every`, `sample_rate`, `interval`
+            or `sampling_interval` are out of their bounds
     """
+    if mode not in MODES:
+        modes_choices = oxford_join(MODES, last_sep=", or ")
+        raise ValueError(f"invalid mode {mode!r}, expecting {modes_choices}")
+    if output_format not in FORMATS:
+        formats_choices = oxford_join(FORMATS, last_sep=", or ")
+        raise ValueError(f"invalid output_format {output_format!r}, expecting {formats_choices}")
+    if every < 1:
+        raise ValueError(f"invalid every {every!r}, expecting a strictly positive integer")
+    if not 0 <= sample_rate <= 1:
+        raise ValueError(f"invalid sample_rate {sample_rate!r}, expecting a float between 0 and 1")
+    if interval is not None and interval <= 0:
+        raise ValueError(f"invalid interval {interval!r}, expecting a strictly positive number")
+    if sampling_interval <= 0:
+        raise ValueError(f"invalid sampling_interval {sampling_interval!r}, expecting a strictly positive number")
 
     def wrapper(func: Callable[P, R]) -> Callable[P, R]:
-        @functools.wraps(func)
-        def inner(*args: P.args, **kwargs: P.kwargs) -> R:
-            profiler = cProfile.Profile()
+        profiler = _Profiler(
+            output or f"{func.__name__}.{output_format}",
+            mode=mode,
+            every=every,
+            sample_rate=sample_rate,
+            interval=interval,
+            sampling_interval=sampling_interval,
+            output_format=output_format,
+        )
 
-            runner = t.cast("Callable[..., R]", profiler.runcall)
-            result = runner(func, *args, **kwargs)
-
-            profiler.dump_stats(output or f"{func.__name__}.pstats")
-
-            return result
+        inner = _profile(func, profiler)
+        setattr(inner, "dump_stats", profiler.dump)  # noqa: B010
 
         return inner
 
     return wrapper
+
+
+class _Session:
+    """
+    Enables a profile during the steps of a single call.
+    """
+
+    __slots__ = ("profile", "token")
+
+    def __init__(self, profile: cProfile.Profile | SamplingProfiler) -> None:
+        self.profile = profile
+        self.token: Token[bool] | None = None
+
+    def enter(self) -> None:
+        self.token = _profiling.set(True)
+
+        if isinstance(self.profile, SamplingProfiler):
+            # Samples the frames called by the caller of the hook (the wrapper, or the stepper)
+            self.profile.enable(sys._getframe(1))  # noqa: SLF001
+        else:
+            self.profile.enable()
+
+    def exit(self) -> None:
+        self.profile.disable()
+
+        if self.token is not None:
+            _profiling.reset(self.token)
+            self.token = None
+
+
+class _Profiler:
+    """
+    Profiles the calls of a single decorated callable, and dumps their stats.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str,
+        *,
+        mode: str,
+        every: int,
+        sample_rate: float,
+        interval: float | None,
+        sampling_interval: float,
+        output_format: str,
+    ) -> None:
+        self.path = path
+        self.output_format = output_format
+        self.mode = mode
+        self.every = every
+        self.sample_rate = sample_rate
+        self.interval = interval
+
+        self.stats: pstats.Stats | None = None
+        self.sampler: SamplingProfiler | None = None
+        if mode == MODE_AGGREGATE:
+            self.stats = pstats.Stats()
+        elif mode == MODE_SAMPLING:
+            self.sampler = SamplingProfiler(sampling_interval)
+
+        if mode != MODE_CALL:
+            atexit.register(self.dump)
+
+        self._calls = itertools.count()
+        self._lock = Lock()
+        self._dumped_at = time.monotonic()
+
+    def start(self) -> _Session | None:
+        if _profiling.get():
+            return None
+        # `next()` is atomic on `itertools.count`, which makes the counting thread-safe
+        if self.every > 1 and next(self._calls) % self.every:
+            return None
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return None
+
+        return _Session(self.sampler or cProfile.Profile())
+
+    def stop(self, session: _Session) -> None:
+        if self.mode == MODE_CALL:
+            self._write(session.profile)
+
+            return
+
+        if self.stats is not None:
+            with self._lock:
+                self.stats.add(session.profile)
+
+        if self.interval is not None and time.monotonic() - self._dumped_at >= self.interval:
+            self.dump()
+
+    def dump(self) -> None:
+        with self._lock:
+            self._dumped_at = time.monotonic()
+
+            if self.stats is not None and self.stats.stats:  # type: ignore because stats is untyped
+                self._write(self.stats)
+            elif self.sampler is not None and self.sampler.samples:
+                self._write(self.sampler)
+
+    def _write(self, profile: cProfile.Profile | SamplingProfiler | pstats.Stats) -> None:
+        if self.output_format == FORMAT_PSTATS:
+            profile.dump_stats(self.path)
+
+            return
+
+        if isinstance(profile, SamplingProfiler):
+            flamegraph = FlameGraph(profile.snapshot_samples(), unit="samples")
+        elif isinstance(profile, pstats.Stats):
+            flamegraph = FlameGraph.from_stats(profile.stats)  # type: ignore because stats is untyped
+        else:
+            flamegraph = FlameGraph.from_stats(pstats.Stats(profile).stats)  # type: ignore because stats is untyped
+
+        flamegraph.dump(self.path, self.output_format)
+
+
+def _profile[**P, R](func: Callable[P, R], profiler: _Profiler) -> Callable[P, R]:
+    if inspect.isasyncgenfunction(func):
+        return _profile_async_generator(func, profiler)
+    if inspect.iscoroutinefunction(func):
+        return _profile_coroutine(func, profiler)
+    if inspect.isgeneratorfunction(func):
+        return _profile_generator(func, profiler)
+
+    return _profile_function(func, profiler)
+
+
+def _profile_async_generator[**P, R](func: Callable[P, R], profiler: _Profiler) -> Callable[P, R]:
+    async_generator_func = t.cast("Callable[P, AsyncGenerator[t.Any, t.Any]]", func)
+
+    @functools.wraps(func)
+    async def inner(*args: P.args, **kwargs: P.kwargs) -> AsyncGenerator[t.Any, t.Any]:
+        session = profiler.start() if _switch.enabled else None
+        if session is None:
+            async for item in async_generator_func(*args, **kwargs):
+                yield item
+
+            return
+
+        try:
+            async_generator = async_generator_func(*args, **kwargs)
+            async for item in step_async_generator(async_generator, session.enter, session.exit):
+                yield item
+        finally:
+            profiler.stop(session)
+
+    return t.cast("Callable[P, R]", inner)
+
+
+def _profile_coroutine[**P, R](func: Callable[P, R], profiler: _Profiler) -> Callable[P, R]:
+    coroutine_func = t.cast("Callable[P, Awaitable[t.Any]]", func)
+
+    @functools.wraps(func)
+    async def inner(*args: P.args, **kwargs: P.kwargs) -> t.Any:
+        session = profiler.start() if _switch.enabled else None
+        if session is None:
+            return await coroutine_func(*args, **kwargs)
+
+        try:
+            return await SteppedAwaitable(coroutine_func(*args, **kwargs), session.enter, session.exit)
+        finally:
+            profiler.stop(session)
+
+    return t.cast("Callable[P, R]", inner)
+
+
+def _profile_generator[**P, R](func: Callable[P, R], profiler: _Profiler) -> Callable[P, R]:
+    generator_func = t.cast("Callable[P, Generator[t.Any, t.Any, t.Any]]", func)
+
+    @functools.wraps(func)
+    def inner(*args: P.args, **kwargs: P.kwargs) -> Generator[t.Any, t.Any, t.Any]:
+        session = profiler.start() if _switch.enabled else None
+        if session is None:
+            return (yield from generator_func(*args, **kwargs))
+
+        try:
+            generator = generator_func(*args, **kwargs)
+            return (yield from step_generator(generator, session.enter, session.exit))
+        finally:
+            profiler.stop(session)
+
+    return t.cast("Callable[P, R]", inner)
+
+
+def _profile_function[**P, R](func: Callable[P, R], profiler: _Profiler) -> Callable[P, R]:
+    @functools.wraps(func)
+    def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+        session = profiler.start() if _switch.enabled else None
+        if session is None:
+            return func(*args, **kwargs)
+
+        session.enter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.exit()
+            profiler.stop(session)
+
+    return inner
@@ -0,0 +1,188 @@
+from collections import Counter
+from collections.abc import Callable, Mapping
+from threading import Event, Lock, Thread, get_ident
+from types import CodeType, FrameType
+import itertools
+import marshal
+import sys
+import time
+
+
+type FunctionKey = tuple[str, int, str]
+type CallerStats = tuple[int, int, float, float]
+type FunctionStats = tuple[int, int, float, float, dict[FunctionKey, CallerStats]]
+
+
+class SamplingProfiler:
+    """
+    Implements a statistical profiler, sampling the call stacks of the threads that enabled it from
+    a background thread, every `interval` seconds.
+
+    Contrary to `cProfile.Profile`, the code profiled is not slowed down by a hook called on every
+    function call, which makes it suited to hot paths and to production. The price is the precision:
+    each sample accounts for `interval` seconds, and the number of calls is replaced by the number
+    of samples in which each function appeared.
+
+    Only the frames called from the frame calling `enable()` are sampled, so that the stacks of a
+    profiled callable do not include its callers. Each thread enables and disables the profiler for
+    itself, and several threads can be profiled at once.
+
+    Mimics the interface of `cProfile.Profile` (`enable()`, `disable()`, `runcall()`,
+    `create_stats()` and `dump_stats()`), so it can be loaded by `pstats.Stats`, and the stats it
+    dumps be visualized by the same tools.
+
+    Thread-safe.
+
+    Examples:
+        ```python
+        import pstats
+
+        from flashback.debugging import SamplingProfiler
+
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.runcall(handle, request)
+
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(10)
+        ```
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """
+        Params:
+            interval: the number of seconds between two samples
+
+        Raises:
+            ValueError: if `interval` is not strictly positive
+        """
+        if interval <= 0:
+            raise ValueError(f"invalid interval {interval!r}, expecting a strictly positive number")
+
+        self.interval = interval
+        self.stats: dict[FunctionKey, FunctionStats] = {}
+
+        # The number of samples of each call stack, outermost frame first
+        self.samples: Counter[tuple[FunctionKey, ...]] = Counter()
+
+        self._boundaries: dict[int, FrameType] = {}
+        self._enabled = Event()
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    def enable(self, frame: FrameType | None = None) -> None:
+        """
+        Starts sampling the call stack of the current thread.
+
+        Params:
+            frame: the frame under which to sample the stack, by default the frame calling `enable()`
+        """
+        boundary = frame or sys._getframe(1)  # noqa: SLF001
+
+        with self._lock:
+            self._boundaries[get_ident()] = boundary
+            self._enabled.set()
+
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+                self._thread.start()
+
+    def disable(self) -> None:
+        """
+        Stops sampling the call stack of the current thread.
+        """
+        with self._lock:
+            self._boundaries.pop(get_ident(), None)
+
+            if not self._boundaries:
+                self._enabled.clear()
+
+    def runcall[**P, R](self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """
+        Samples the call stack of a call.
+
+        Params:
+            func: the callable to call
+            args: the positional arguments of the call
+            kwargs: the keyword arguments of the call
+
+        Returns:
+            the result of the call
+        """
+        self.enable(sys._getframe())  # noqa: SLF001
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.disable()
+
+    def snapshot_samples(self) -> Counter[tuple[FunctionKey, ...]]:
+        """
+        Returns:
+            a copy of the number of samples of each call stack, outermost frame first
+        """
+        with self._lock:
+            return self.samples.copy()
+
+    def create_stats(self) -> None:
+        """
+        Computes the stats of the samples taken so far in `stats`, in the format of `pstats`.
+        """
+        self.stats = _compute_stats(self.snapshot_samples(), self.interval)
+
+    def dump_stats(self, file: str) -> None:
+        """
+        Writes the stats of the samples taken so far to a file, in the format of `pstats`.
+
+        Params:
+            file: the path of the file to write to
+        """
+        self.create_stats()
+
+        with open(file, "wb") as outfile:
+            marshal.dump(self.stats, outfile)
+
+    def _run(self) -> None:
+        while self._enabled.wait():
+            time.sleep(self.interval)
+
+            self._sample()
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()  # noqa: SLF001
+
+        with self._lock:
+            for thread_id, boundary in self._boundaries.items():
+                frame = frames.get(thread_id)
+                stack: list[FunctionKey] = []
+
+                while frame is not None and frame is not boundary:
+                    stack.append(_function_key(frame.f_code))
+                    frame = frame.f_back
+
+                # Discards the samples taken outside of the boundary (e.g. between two steps)
+                if frame is boundary and stack:
+                    self.samples[tuple(reversed(stack))] += 1
+
+
+def _compute_stats(samples: Mapping[tuple[FunctionKey, ...], int], interval: float) -> dict[FunctionKey, FunctionStats]:
+    cumulative: Counter[FunctionKey] = Counter()
+    own: Counter[FunctionKey] = Counter()
+    edges: Counter[tuple[FunctionKey, FunctionKey]] = Counter()
+    for stack, count in samples.items():
+        own[stack[-1]] += count
+        # Recursive functions only account once per sample
+        for function in set(stack):
+            cumulative[function] += count
+        for caller, callee in set(itertools.pairwise(stack)):
+            edges[caller, callee] += count
+
+    callers: dict[FunctionKey, dict[FunctionKey, CallerStats]] = {}
+    for (caller, callee), count in edges.items():
+        callers.setdefault(callee, {})[caller] = (count, count, 0.0, count * interval)
+
+    return {
+        function: (count, count, own[function] * interval, count * interval, callers.get(function, {}))
+        for function, count in cumulative.items()
+    }
+
+
+def _function_key(code: CodeType) -> FunctionKey:
+    return (code.co_filename, code.co_firstlineno, code.co_name)
@@ -0,0 +1,70 @@
+import os
+
+
+# The environment variable disabling the debugging helpers when set to "0", "false", "no" or "off"
+ENV_VAR = "FLASHBACK_DEBUGGING"
+
+
+class _Switch:
+    """
+    Holds whether the debugging helpers are enabled, checked by each of their calls.
+    """
+
+    __slots__ = ("enabled",)
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv(ENV_VAR, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+_switch = _Switch()
+
+
+def enable_debugging() -> None:
+    """
+    Enables the debugging helpers (`xp()`, `caller()`, `@profiled` and `@memory_profiled`), enabled
+    by default unless the environment variable `FLASHBACK_DEBUGGING` is set to "0" (or "false",
+    "no", or "off").
+
+    Examples:
+        ```python
+        from flashback.debugging import enable_debugging, xp
+
+        enable_debugging()
+
+        xp(1)
+        #=> xp.py:5
+        #=>     1 (int)
+        ```
+    """
+    _switch.enabled = True
+
+
+def disable_debugging() -> None:
+    """
+    Disables the debugging helpers (`xp()`, `caller()`, `@profiled` and `@memory_profiled`), which
+    become passthroughs only costing an attribute check, so that the calls left in the code do not
+    slow it down in production.
+
+    `xp()` returns its arguments without printing them, `caller()` returns None without printing
+    anything, and the callables decorated with `@profiled` or `@memory_profiled` are called without
+    being profiled.
+
+    Examples:
+        ```python
+        from flashback.debugging import disable_debugging, xp
+
+        disable_debugging()
+
+        xp(1)
+        #=> 1
+        ```
+    """
+    _switch.enabled = False
+
+
+def is_debugging_enabled() -> bool:
+    """
+    Returns:
+        whether the debugging helpers are enabled
+    """
+    return _switch.enabled
@@ -1,19 +1,28 @@
+import itertools
 import typing as t
 import sys
 
+from .get_call_context import _remember
 from .parser import Parser
 from .formatter import Formatter
+from .switch import _switch
 
 
 PARSER = Parser()
 FORMATTER = Formatter()
 
+# The number of calls made from each call site when rate-limited, for the last call sites only (see
+# `flashback.debugging.get_call_context.CACHE_SIZE`), identified by their location to not keep
+# their code alive
+_calls_per_site: "dict[tuple[str, int, int], itertools.count[int]]" = {}
+
 
 def xp(
     *arguments: t.Any,
     o: t.IO[str] = sys.stderr,
     f: bool = True,
     w: int = 120,
+    n: int | None = None,
 ) -> tuple[t.Any, ...] | None:
     """
     Provides a simple and concise way of printing for debugging purposes.
@@ -22,6 +31,12 @@ def xp(
 
     Consumes generators to print them (be careful with infinite ones!).
 
+    Inside hot loops, `n` limits the number of times each call site prints, the next calls only
+    returning their arguments. The calls are only counted for the last 1024 call sites rate-limited
+    (see `flashback.debugging.get_call_context.CACHE_SIZE`): beyond, the call sites forgotten start
+    counting anew, and may print more than `n` times. When the debugging helpers are disabled (see
+    `flashback.debugging.disable_debugging()`), nothing is printed at all.
+
     Inspired by:
 
     - https://github.com/samuelcolvin/python-devtools
@@ -69,6 +84,14 @@ def xp(
 
         assert result == 2
         #=> True
+
+        # Only prints the first 3 iterations
+        for i in range(1000):
+            xp(i, n=3)
+        #=> xp.py:62
+        #=>   i:
+        #=>     0 (int)
+        #=> ...
         ```
 
     Params:
@@ -76,14 +99,16 @@ def xp(
         o: the target output of print
         f: whether of not the output is flushed
         w: the maximum width before wrapping the output
+        n: the maximum number of times to print from the call site, unlimited if None
 
     Returns:
         the arguments or their results
     """
-    filename, lineno, parsed_arguments, warning = PARSER.parse(*arguments)
-    output = FORMATTER.format(filename, lineno, parsed_arguments, warning, width=w)
+    if _switch.enabled and (n is None or _should_print(n)):
+        filename, lineno, parsed_arguments, warning = PARSER.parse(*arguments)
+        output = FORMATTER.format(filename, lineno, parsed_arguments, warning, width=w)
 
-    print(output, file=o, flush=f)
+        print(output, file=o, flush=f)
 
     # Forwards the arguments received to the (possible) next operation
     if len(arguments) == 0:
@@ -94,3 +119,16 @@ def xp(
         result = arguments
 
     return result
+
+
+def _should_print(n: int) -> bool:
+    # Skips the frame of `xp()`, to identify the call site in its caller
+    frame = sys._getframe(2)  # noqa: SLF001
+    key = (frame.f_code.co_filename, frame.f_code.co_firstlineno, frame.f_lasti)
+
+    calls = _calls_per_site.get(key)
+    if calls is None:
+        calls = _remember(_calls_per_site, key, itertools.count())
+
+    # `next()` is atomic on `itertools.count`, which makes the counting thread-safe
+    return next(calls) < n
@@ -0,0 +1,285 @@
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from threading import Lock
+import asyncio
+import functools
+import inspect
+import logging
+import math
+import time
+import typing as t
+
+from .formatting import ordinalize
+from .retrying.retry_budget import RetryBudget
+
+
+def hedged[**P, R](  # noqa: PLR0913
+    delay: float | None = None,
+    percentile: float = 95.0,
+    max_hedges: int = 1,
+    max_extra_load: float = 0.1,
+    *,
+    initial_delay: float = 0.1,
+    min_hedges: int = 1,
+    window: int = 1000,
+    executor: Executor | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Hedges the calls to a callable: if a call has not completed after a given delay, makes a second
+    (hedge) call, and returns the result of whichever completes first.
+
+    By default, the delay adapts to the `percentile` of the latencies observed over the last
+    `window` calls, which trims the tail latency at the cost of a few extra calls. Until a tenth of
+    `window` calls are observed, `initial_delay` is used. The latency of a call is measured from its
+    first attempt, so that the hedged calls do not lower the percentile they are hedged after.
+
+    To avoid overloading a slow dependency, the hedges are capped to `max_extra_load` times the
+    calls made over the last ten seconds, while `min_hedges` hedges are always allowed over the same
+    period, so that callables seldom called are hedged too.
+
+    Functions are called in a thread pool, and coroutine functions in tasks of the running event
+    loop, both in a copy of the caller's context, e.g. to see its `deadline`. The losing calls of
+    coroutine functions are cancelled, while the losing calls of functions run until completion:
+    only decorate idempotent callables.
+
+    If a call raises, the other calls are still awaited, and the first error is raised only if they
+    all raise.
+
+    Examples:
+        ```python
+        from flashback import hedged
+
+        @hedged(percentile=95, max_extra_load=0.05)
+        def get_user(user_id):
+            ...
+
+        @hedged(delay=0.05)
+        async def get_order(order_id):
+            ...
+        ```
+
+    Params:
+        delay: the number of seconds after which to hedge, adaptive if None
+        percentile: the percentile of the observed latencies after which to hedge
+        max_hedges: the max number of hedges per call
+        max_extra_load: the max number of hedges per call made, over the last ten seconds
+        initial_delay: the number of seconds after which to hedge, until enough latencies are observed
+        min_hedges: the number of hedges always allowed over the last ten seconds
+        window: the number of latencies to compute the percentile from
+        executor: the executor to make the calls of functions in, a dedicated thread pool if None
+
+    Returns:
+        a wrapper used to decorate a callable
+
+    Raises:
+        ValueError: if any parameter is out of its bounds
+    """
+    if not 0 < percentile <= 100:
+        raise ValueError(f"invalid percentile {percentile!r}, expecting a number between 0 and 100")
+    if max_hedges < 1:
+        raise ValueError(f"invalid max_hedges {max_hedges!r}, expecting a strictly positive integer")
+    if min_hedges < 0:
+        raise ValueError(f"invalid min_hedges {min_hedges!r}, expecting a positive integer")
+    if window < 1:
+        raise ValueError(f"invalid window {window!r}, expecting a strictly positive integer")
+
+    def wrapper(func: Callable[P, R]) -> Callable[P, R]:
+        hedger = _Hedger(
+            func,
+            delay=delay,
+            max_hedges=max_hedges,
+            latencies=_LatencyWindow(percentile, window, initial_delay),
+            budget=RetryBudget(ratio=max_extra_load, min_retries=min_hedges),
+            executor=executor,
+        )
+
+        if inspect.iscoroutinefunction(func):
+            coroutine_func = t.cast("Callable[P, Awaitable[t.Any]]", func)
+
+            @functools.wraps(func)
+            async def async_inner(*args: P.args, **kwargs: P.kwargs) -> t.Any:
+                return await hedger.async_call(functools.partial(coroutine_func, *args, **kwargs))
+
+            return t.cast("Callable[P, R]", async_inner)
+
+        @functools.wraps(func)
+        def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+            return hedger.call(functools.partial(func, *args, **kwargs))
+
+        return inner
+
+    return wrapper
+
+
+class _LatencyWindow:
+    """
+    Keeps the last latencies observed, and computes their percentile.
+
+    The percentile is recomputed once every tenth of the window, to keep recording cheap.
+    """
+
+    def __init__(self, percentile: float, window: int, initial_value: float) -> None:
+        self._percentile = percentile
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._refresh_every = max(1, window // 10)
+
+        self._lock = Lock()
+        self._records_since_refresh = 0
+        self._value = initial_value
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._records_since_refresh += 1
+
+            if self._records_since_refresh >= self._refresh_every:
+                self._records_since_refresh = 0
+
+                ordered = sorted(self._latencies)
+                index = max(0, math.ceil(len(ordered) * self._percentile / 100) - 1)
+                self._value = ordered[index]
+
+    def percentile(self) -> float:
+        return self._value
+
+
+class _Hedger:
+    """
+    Makes the calls and hedges of a single decorated callable.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        func: Callable[..., t.Any],
+        *,
+        delay: float | None,
+        max_hedges: int,
+        latencies: _LatencyWindow,
+        budget: RetryBudget,
+        executor: Executor | None,
+    ) -> None:
+        self.delay = delay
+        self.max_hedges = max_hedges
+        self.latencies = latencies
+        self.budget = budget
+
+        self.name = getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
+
+        # `.getmodule().__name__` returns the same value as `__name__` called from the module we
+        # decorate.
+        # Since `logging` is a singleton, everytime we call `logging.getLogger()` with the same
+        # name, we receive the same logger, which "hides" this decorator as if the logging was
+        # made from within the callable we decorate
+        module = inspect.getmodule(func)
+        self.logger = logging.getLogger(None if module is None else module.__name__)
+
+        self._executor = executor
+        self._executor_lock = Lock()
+
+    @property
+    def executor(self) -> Executor:
+        # The thread pool is created on the first call, to not spawn threads when decorating
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(thread_name_prefix=f"hedged-{self.name}")
+
+        return self._executor
+
+    def call[R](self, call: Callable[[], R]) -> R:
+        self.budget.record_request()
+
+        started: list[Future[R]] = []
+        errors: list[BaseException] = []
+
+        def _start() -> Future[R]:
+            # Threads do not inherit the caller's context variables, unlike tasks
+            future = self.executor.submit(copy_context().run, call)
+            started.append(future)
+
+            return future
+
+        started_at = time.monotonic()
+
+        pending = {_start()}
+        hedging = True
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=self._timeout(hedging), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future.exception() is None:
+                        self.latencies.record(time.monotonic() - started_at)
+
+                        return future.result()
+
+                    errors.append(t.cast("BaseException", future.exception()))
+
+                if not done:
+                    hedging = self._can_hedge(len(started))
+                    if hedging:
+                        pending.add(_start())
+        finally:
+            # Only cancels the calls not started yet, the running ones complete in the background
+            for future in started:
+                future.cancel()
+
+        raise errors[0]
+
+    async def async_call(self, call: Callable[[], Awaitable[t.Any]]) -> t.Any:
+        self.budget.record_request()
+
+        started: list[asyncio.Future[t.Any]] = []
+        errors: list[BaseException] = []
+
+        def _start() -> asyncio.Future[t.Any]:
+            task = asyncio.ensure_future(call())
+            started.append(task)
+
+            return task
+
+        started_at = time.monotonic()
+
+        pending = {_start()}
+        hedging = True
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self._timeout(hedging),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.record(time.monotonic() - started_at)
+
+                        return task.result()
+
+                    errors.append(t.cast("BaseException", task.exception()))
+
+                if not done:
+                    hedging = self._can_hedge(len(started))
+                    if hedging:
+                        pending.add(_start())
+        finally:
+            for task in started:
+                task.cancel()
+
+        raise errors[0]
+
+    def _timeout(self, hedging: bool) -> float | None:
+        if not hedging:
+            return None
+
+        return self.latencies.percentile() if self.delay is None else self.delay
+
+    def _can_hedge(self, attempts: int) -> bool:
+        if attempts > self.max_hedges or not self.budget.acquire():
+            return False
+
+        self.logger.debug("Hedging the call to %s for the %s time", self.name, ordinalize(attempts))
+
+        return True
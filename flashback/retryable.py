@@ -1,32 +1,79 @@
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Sequence
+import asyncio
 import functools
 import inspect
 import logging
-import math
 import time
+import typing as t
 
+from .deadline import remaining_time
 from .formatting import ordinalize
+from .importing import import_class_from_path
+from .retrying.backoffs.base import BaseBackoff
+from .retrying.rejected_result import RejectedResult
+from .retrying.retry_budget import RetryBudget
+from .retrying.retry_event import RetryEvent
+from .retrying.retry_stats import RetryStats
 
 
-def retryable[**P, R](
+def retryable[**P, R](  # noqa: PLR0913
     max_retries: int = -1,
     plateau_after: int = 10,
     reset_after: int = 3600,
     exceptions: tuple[type[Exception], ...] = (),
+    *,
+    backoff: str | BaseBackoff = "exponential",
+    deadline: float | None = None,
+    budget: RetryBudget | None = None,
+    hooks: Sequence[Callable[[RetryEvent], t.Any]] = (),
+    retry_if: Callable[[Exception], bool] | None = None,
+    retry_on_result: Callable[[R], bool] | None = None,
+    retry_after: Callable[[t.Any], float | None] | None = None,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
     Retries to call a callable when a given exception is raised.
 
-    The back-off starts at 0s and ends up at 60s after 10 retries:
+    The delay between two retries is computed by a backoff strategy, amongst:
+
+    - exponential (default): starts at 0s and ends up at 60s after 10 retries
     ```python
     0.15, 0.70, 1.65, 3.30, 6.15, 11.09, 19.63, 34.41, 60.0
     ```
+    - full_jitter: a random delay between 0 and an exponential delay
+    - decorrelated_jitter: a random delay between a base and three times the previous delay
+    - fibonacci: a delay growing along the Fibonacci sequence
+    - fixed: always the same delay
+
+    The jittered strategies spread the retries of concurrent clients, which avoids having them all
+    retrying in lockstep after an outage. Custom strategies can be given as instances of
+    `flashback.retrying.backoffs.base.BaseBackoff`.
+
+    With a `max_retries` of `-1`, the decorated callable will be retried indefinitely, unless a
+    `deadline` is given: then, the initial error is raised as soon as the next retry would start
+    after `deadline` seconds since the first call. Likewise, within the deadline of the execution
+    context (see `flashback.deadline`, set by `@timeoutable`), the initial error is raised as soon as
+    the next retry would start past it.
+
+    Under a partial outage, retrying indefinitely amplifies the load on the failing dependency. A
+    `budget` shared by the callables calling the same dependency caps their retries to a ratio of
+    their calls: once exhausted, the initial error is raised instead of retrying.
+
+    The decorated callable counts its calls, retries, give ups, time slept and caught exceptions in
+    a `RetryStats` exposed as its `retry_stats` attribute. For finer observability, `hooks` are
+    called with a `RetryEvent` on each retry, give up and success.
+
+    Besides exceptions of the given types, `retry_if` only retries exceptions matching a predicate
+    (any exception if no types are given), and `retry_on_result` retries results matching a
+    predicate: once giving up, the last result is returned. When the exception or result carries a
+    delay provided by the server (e.g. a `Retry-After` header), `retry_after` extracts it to
+    override the computed delay.
 
-    With a `max_retries` of `-1`, the decorated callable will be retried indefinitely.
+    Coroutine functions are supported, and wait between retries without blocking the event loop.
 
     Examples:
         ```python
         from flashback import retryable
+        from flashback.retrying import FullJitterBackoff, RetryBudget
 
         @retryable(exceptions=(TypeError,))
         def will_be_retried(arg):
@@ -50,6 +97,40 @@ def retryable[**P, R](
         #=> Caught TypeError
         #=> Retrying for the 5th time in 6.15s
         #=> ...
+
+        @retryable(exceptions=(ConnectionError,), backoff=FullJitterBackoff(base=0.5, cap=10), deadline=30)
+        async def fetch(url):
+            ...
+
+        budget = RetryBudget(ratio=0.1)
+
+        @retryable(exceptions=(ConnectionError,), budget=budget)
+        def get_user(user_id):
+            ...
+
+        @retryable(exceptions=(ConnectionError,), budget=budget)
+        def get_order(order_id):
+            ...
+
+        def on_event(event):
+            if event.kind == "give_up":
+                metrics.increment(f"{event.name}.give_up.{event.reason}")
+
+        @retryable(exceptions=(ConnectionError,), hooks=(on_event,))
+        def get_payment(payment_id):
+            ...
+
+        @retryable(
+            retry_if=lambda e: isinstance(e, HTTPError) and e.status >= 500,
+            retry_on_result=lambda response: response.status == 503,
+            # Called with the exception caught or the result rejected
+            retry_after=lambda r: float(r.headers["Retry-After"]) if "Retry-After" in r.headers else None,
+        )
+        def get_invoice(invoice_id):
+            ...
+
+        get_payment.retry_stats.as_dict()
+        #=> {'calls': 10, 'attempts': 12, 'successes': 10, 'successes_after_retry': 2, 'give_ups': 0, ...}
         ```
 
     Params:
@@ -57,58 +138,286 @@ def retryable[**P, R](
         plateau_after: the number of retries after which to plateau the delay
         reset_after: the number of seconds after which to reset the delay
         exceptions: the exceptions to trigger a retry on
+        backoff: the name of the backoff strategy to use, or an instance of a backoff strategy
+        deadline: the number of seconds after which to stop retrying, from the first call
+        budget: the retry budget to withdraw each retry from
+        hooks: the callables to call with a `RetryEvent` on each retry, give up and success
+        retry_if: the predicate an exception caught must match to trigger a retry
+        retry_on_result: the predicate a result must match to trigger a retry
+        retry_after: the callable extracting the delay to wait from an exception or a result
 
     Returns :
         a wrapper used to decorate a callable
+
+    Raises:
+        NotImplementedError: if `backoff` is an unknown strategy name
     """
+    if isinstance(backoff, str):
+        try:
+            backoff_class = import_class_from_path(f"{backoff}_backoff", ".retrying.backoffs")
+        except (ImportError, AttributeError) as e:
+            raise NotImplementedError(f"backoff {backoff!r} is not yet supported") from e
+
+        backoff = t.cast("BaseBackoff", backoff_class())
+
+    strategy = backoff
+
+    # Without exception types, a predicate on exceptions is matched against any exception
+    caught_exceptions = exceptions or ((Exception,) if retry_if is not None else ())
+
+    def _is_retryable(caught_exception: Exception) -> bool:
+        return isinstance(caught_exception, caught_exceptions) and (retry_if is None or retry_if(caught_exception))
 
     def wrapper(func: Callable[P, R]) -> Callable[P, R]:
+        retrier = _Retrier(
+            func,
+            retry_after=retry_after,
+            max_retries=max_retries,
+            plateau_after=plateau_after,
+            reset_after=reset_after,
+            backoff=strategy,
+            deadline=deadline,
+            budget=budget,
+            hooks=hooks,
+        )
+
+        if inspect.iscoroutinefunction(func):
+            coroutine_func = t.cast("Callable[P, Awaitable[t.Any]]", func)
+
+            @functools.wraps(func)
+            async def async_inner(*args: P.args, **kwargs: P.kwargs) -> t.Any:
+                state = retrier.start()
+
+                while True:
+                    try:
+                        result = await coroutine_func(*args, **kwargs)
+                    except Exception as caught_exception:
+                        if not _is_retryable(caught_exception):
+                            retrier.on_error(state, caught_exception)
+                            raise
+
+                        await asyncio.sleep(retrier.on_failure(state, caught_exception))
+                    else:
+                        if retry_on_result is None or not retry_on_result(result):
+                            retrier.on_success(state)
+
+                            return result
+
+                        try:
+                            delay = retrier.on_failure(state, RejectedResult(result))
+                        except RejectedResult:
+                            return result
+
+                        await asyncio.sleep(delay)
+
+            setattr(async_inner, "retry_stats", retrier.stats)  # noqa: B010
+
+            return t.cast("Callable[P, R]", async_inner)
+
+        @functools.wraps(func)
+        def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+            state = retrier.start()
+
+            while True:
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as caught_exception:
+                    if not _is_retryable(caught_exception):
+                        retrier.on_error(state, caught_exception)
+                        raise
+
+                    time.sleep(retrier.on_failure(state, caught_exception))
+                else:
+                    if retry_on_result is None or not retry_on_result(result):
+                        retrier.on_success(state)
+
+                        return result
+
+                    try:
+                        delay = retrier.on_failure(state, RejectedResult(result))
+                    except RejectedResult:
+                        return result
+
+                    time.sleep(delay)
+
+        setattr(inner, "retry_stats", retrier.stats)  # noqa: B010
+
+        return inner
+
+    return wrapper
+
+
+class _RetryState:
+    """
+    Holds the progress of the retries of a single call.
+    """
+
+    def __init__(self) -> None:
+        self.retry_count = 0
+        self.current_try = 1
+
+        self.retry_delay = 0.0
+        self.time_waited = 0.0
+
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def give_up(self, caught_exception: Exception) -> t.NoReturn:
+        # Add a few debug info to the exception
+        setattr(caught_exception, "retry_count", self.retry_count)  # noqa: B010
+        setattr(caught_exception, "time_waited", self.time_waited)  # noqa: B010
+
+        raise caught_exception
+
+
+class _Retrier:
+    """
+    Decides whether and when to retry the calls of a single decorated callable, and reports it.
+
+    Shared by all the calls of the decorated callable, the progress of each call being held by its
+    own `_RetryState`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        func: Callable[..., t.Any],
+        *,
+        max_retries: int,
+        plateau_after: int,
+        reset_after: int,
+        backoff: BaseBackoff,
+        deadline: float | None,
+        budget: RetryBudget | None,
+        hooks: Sequence[Callable[[RetryEvent], t.Any]],
+        retry_after: Callable[[t.Any], float | None] | None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.plateau_after = plateau_after
+        self.reset_after = reset_after
+        self.backoff = backoff
+        self.deadline = deadline
+        self.budget = budget
+        self.hooks = hooks
+        self.retry_after = retry_after
+
+        self.name = getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
+        self.stats = RetryStats()
+
         # `.getmodule().__name__` returns the same value as `__name__` called from the module we
         # decorate.
         # Since `logging` is a singleton, everytime we call `logging.getLogger()` with the same
         # name, we receive the same logger, which "hides" this decorator as if the logging was
         # made from within the callable we decorate
         module = inspect.getmodule(func)
-        logger = logging.getLogger(None if module is None else module.__name__)
+        self.logger = logging.getLogger(None if module is None else module.__name__)
 
-        @functools.wraps(func)
-        def inner(*args: P.args, **kwargs: P.kwargs) -> R:
-            retry_count = 0
-            current_try = 1
+    def start(self) -> _RetryState:
+        if self.budget is not None:
+            self.budget.record_request()
 
-            retry_delay = 0.0
-            time_waited = 0.0
+        return _RetryState()
 
-            while True:
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as caught_exception:
-                    logger.warning("Caught %s", caught_exception.__class__.__name__)
+    def on_success(self, state: _RetryState) -> None:
+        self.stats.record_success(state.retry_count + 1)
 
-                    if time_waited > reset_after:
-                        current_try = 1
+        if self.hooks:
+            self._emit(RetryEvent("success", self.name, state.retry_count + 1, elapsed=state.elapsed))
 
-                    if retry_count < plateau_after:
-                        retry_delay = round(math.exp(0.54856421 * current_try - 0.83273953) - 0.60263468, 2)
+    def on_failure(self, state: _RetryState, caught_exception: Exception) -> float:
+        self.logger.warning("Caught %s", caught_exception.__class__.__name__)
 
-                        current_try += 1
+        if state.time_waited > self.reset_after:
+            state.current_try = 1
 
-                    retry_count += 1
-                    if max_retries != -1 and retry_count > max_retries:
-                        logger.warning("Reached the maximum number of retries, raising")
+        # Past the plateau, the attempt stays capped instead of the delay being frozen, so that the
+        # jittered strategies keep drawing a new delay on each retry
+        attempt = min(state.current_try, self.plateau_after)
+        if attempt > 0:
+            state.retry_delay = self.backoff.delay(attempt, state.retry_delay)
 
-                        # Add a few debug info to the exception
-                        setattr(caught_exception, "retry_count", retry_count)  # noqa: B010
-                        setattr(caught_exception, "time_waited", time_waited)  # noqa: B010
+        state.current_try += 1
 
-                        raise caught_exception
+        delay = state.retry_delay
+        if self.retry_after is not None:
+            subject = caught_exception.result if isinstance(caught_exception, RejectedResult) else caught_exception
 
-                    logger.warning("Retrying for the %s time in %.2fs", ordinalize(retry_count), retry_delay)
+            # The delay provided by the server overrides the computed one, avoiding early retries, but
+            # only for this retry: it must not feed the backoff strategy
+            retry_after = self.retry_after(subject)
+            if retry_after is not None:
+                delay = max(0.0, retry_after)
 
-                    time.sleep(retry_delay)
+        state.retry_count += 1
+        if self.max_retries != -1 and state.retry_count > self.max_retries:
+            self.logger.warning("Reached the maximum number of retries, raising")
 
-                    time_waited += retry_delay
+            self._give_up(state, caught_exception, "max_retries")
 
-        return inner
+        if self.deadline is not None and state.elapsed + delay > self.deadline:
+            self.logger.warning("Reached the deadline of %.2fs, raising", self.deadline)
 
-    return wrapper
+            self._give_up(state, caught_exception, "deadline")
+
+        # Retrying past the deadline of the execution context would be wasted work
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            self.logger.warning("Reached the deadline of the execution context, raising")
+
+            self._give_up(state, caught_exception, "deadline")
+
+        if self.budget is not None and not self.budget.acquire():
+            self.logger.warning("Exhausted the retry budget, raising")
+
+            self._give_up(state, caught_exception, "budget")
+
+        self.logger.warning("Retrying for the %s time in %.2fs", ordinalize(state.retry_count), delay)
+
+        self.stats.record_retry(caught_exception, delay)
+        if self.hooks:
+            event = RetryEvent(
+                "retry",
+                self.name,
+                state.retry_count,
+                elapsed=state.elapsed,
+                delay=delay,
+                exception=caught_exception,
+            )
+            self._emit(event)
+
+        state.time_waited += delay
+
+        return delay
+
+    def on_error(self, state: _RetryState, caught_exception: Exception) -> None:
+        # The exception is raised as is by the caller, ending the call as a give up
+        self._record_give_up(state, caught_exception, "not_retryable", state.retry_count + 1)
+
+    def _give_up(self, state: _RetryState, caught_exception: Exception, reason: str) -> t.NoReturn:
+        self._record_give_up(state, caught_exception, reason, state.retry_count)
+
+        state.give_up(caught_exception)
+
+    def _record_give_up(self, state: _RetryState, caught_exception: Exception, reason: str, attempt: int) -> None:
+        self.stats.record_give_up(caught_exception, attempt)
+
+        if self.hooks:
+            event = RetryEvent(
+                "give_up",
+                self.name,
+                attempt,
+                elapsed=state.elapsed,
+                exception=caught_exception,
+                reason=reason,
+            )
+            self._emit(event)
+
+    def _emit(self, event: RetryEvent) -> None:
+        for hook in self.hooks:
+            # A failing hook must neither break nor retry the call it observes
+            try:
+                hook(event)
+            except Exception:
+                self.logger.exception("Hook %r failed on %r", hook, event)
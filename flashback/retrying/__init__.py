@@ -0,0 +1,24 @@
+from .backoffs import (
+    DecorrelatedJitterBackoff,
+    ExponentialBackoff,
+    FibonacciBackoff,
+    FixedBackoff,
+    FullJitterBackoff,
+)
+from .rejected_result import RejectedResult
+from .retry_budget import RetryBudget
+from .retry_event import RetryEvent
+from .retry_stats import RetryStats
+
+
+__all__ = (
+    "DecorrelatedJitterBackoff",
+    "ExponentialBackoff",
+    "FibonacciBackoff",
+    "FixedBackoff",
+    "FullJitterBackoff",
+    "RejectedResult",
+    "RetryBudget",
+    "RetryEvent",
+    "RetryStats",
+)
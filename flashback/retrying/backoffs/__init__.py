@@ -0,0 +1,14 @@
+from .decorrelated_jitter_backoff import DecorrelatedJitterBackoff
+from .exponential_backoff import ExponentialBackoff
+from .fibonacci_backoff import FibonacciBackoff
+from .fixed_backoff import FixedBackoff
+from .full_jitter_backoff import FullJitterBackoff
+
+
+__all__ = (
+    "DecorrelatedJitterBackoff",
+    "ExponentialBackoff",
+    "FibonacciBackoff",
+    "FixedBackoff",
+    "FullJitterBackoff",
+)
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+
+
+class BaseBackoff(ABC):
+    """
+    Defines an abstract class that needs to be implemented to register a new backoff strategy.
+    """
+
+    @abstractmethod
+    def delay(self, attempt: int, previous_delay: float) -> float:
+        """
+        Computes the number of seconds to wait before the next attempt.
+
+        Params:
+            attempt: the number of the retry to compute the delay of, starting at 1
+            previous_delay: the delay computed for the previous retry (0 for the first retry)
+
+        Returns:
+            the number of seconds to wait
+        """
@@ -0,0 +1,24 @@
+import random
+
+from .base import BaseBackoff
+
+
+class DecorrelatedJitterBackoff(BaseBackoff):
+    """
+    Implements a backoff where the delay is drawn uniformly between `base` and three times the
+    previous delay, to spread the retries of concurrent clients while keeping them growing.
+
+    See: https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/.
+    """
+
+    def __init__(self, base: float = 0.1, cap: float = 60.0) -> None:
+        """
+        Params:
+            base: the minimum number of seconds to wait
+            cap: the maximum number of seconds to wait
+        """
+        self._base = base
+        self._cap = cap
+
+    def delay(self, attempt: int, previous_delay: float) -> float:  # noqa: ARG002
+        return min(self._cap, random.uniform(self._base, max(self._base, previous_delay) * 3))
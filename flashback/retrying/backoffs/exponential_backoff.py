@@ -0,0 +1,17 @@
+import math
+
+from .base import BaseBackoff
+
+
+class ExponentialBackoff(BaseBackoff):
+    """
+    Implements an exponential backoff, without jitter.
+
+    The delay starts at 0.15s and reaches 60s after 10 retries:
+    ```python
+    0.15, 0.70, 1.65, 3.30, 6.15, 11.09, 19.63, 34.41, 60.0
+    ```
+    """
+
+    def delay(self, attempt: int, previous_delay: float) -> float:  # noqa: ARG002
+        return round(math.exp(0.54856421 * attempt - 0.83273953) - 0.60263468, 2)
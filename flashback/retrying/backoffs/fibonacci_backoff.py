@@ -0,0 +1,32 @@
+from .base import BaseBackoff
+
+
+class FibonacciBackoff(BaseBackoff):
+    """
+    Implements a backoff growing along the Fibonacci sequence, slower than an exponential one.
+
+    With the default parameters:
+    ```python
+    0.1, 0.1, 0.2, 0.3, 0.5, 0.8, 1.3, 2.1, 3.4, 5.5, ...
+    ```
+    """
+
+    def __init__(self, base: float = 0.1, cap: float = 60.0) -> None:
+        """
+        Params:
+            base: the number of seconds multiplied by the Fibonacci number of the attempt
+            cap: the maximum number of seconds to wait
+        """
+        self._base = base
+        self._cap = cap
+
+    def delay(self, attempt: int, previous_delay: float) -> float:  # noqa: ARG002
+        previous, current = 0, 1
+        for _ in range(attempt - 1):
+            previous, current = current, previous + current
+
+            # Stops computing large numbers once capped
+            if self._base * current >= self._cap:
+                break
+
+        return min(self._cap, self._base * current)
@@ -0,0 +1,17 @@
+from .base import BaseBackoff
+
+
+class FixedBackoff(BaseBackoff):
+    """
+    Implements a backoff always waiting the same delay.
+    """
+
+    def __init__(self, delay: float = 1.0) -> None:
+        """
+        Params:
+            delay: the number of seconds to wait between each attempt
+        """
+        self._delay = delay
+
+    def delay(self, attempt: int, previous_delay: float) -> float:  # noqa: ARG002
+        return self._delay
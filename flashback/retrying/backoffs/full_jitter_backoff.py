@@ -0,0 +1,27 @@
+import random
+
+from .base import BaseBackoff
+
+
+class FullJitterBackoff(BaseBackoff):
+    """
+    Implements an exponential backoff where the delay is drawn uniformly between 0 and the
+    exponential delay, to spread the retries of concurrent clients.
+
+    See: https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/.
+    """
+
+    def __init__(self, base: float = 0.1, cap: float = 60.0) -> None:
+        """
+        Params:
+            base: the number of seconds of the first exponential delay
+            cap: the maximum number of seconds to wait
+        """
+        self._base = base
+        self._cap = cap
+
+    def delay(self, attempt: int, previous_delay: float) -> float:  # noqa: ARG002
+        # Bounds the exponent to avoid overflowing with large attempts
+        exponential = min(self._cap, self._base * 2.0 ** min(attempt - 1, 64))
+
+        return random.uniform(0, exponential)
@@ -0,0 +1,19 @@
+import typing as t
+
+
+class RejectedResult(Exception):  # noqa: N818
+    """
+    Stands for a result rejected by the `retry_on_result` predicate of `retryable`, so that retrying
+    on a result is reported (in `RetryStats` and `RetryEvent`) like retrying on an exception.
+
+    It is never raised to the caller: once retryable gives up, the last result is returned.
+    """
+
+    def __init__(self, result: t.Any) -> None:
+        """
+        Params:
+            result: the rejected result
+        """
+        super().__init__(result)
+
+        self.result = result
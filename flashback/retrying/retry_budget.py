@@ -0,0 +1,157 @@
+from threading import Lock
+import math
+import time
+
+
+class RetryBudget:
+    """
+    Caps the retries to a ratio of the requests made over a sliding window, to avoid amplifying the
+    load on a failing dependency.
+
+    A budget is meant to be shared by every callable calling the same dependency: each call deposits
+    `ratio` retry, and each retry withdraws one, until the budget is exhausted and retries are
+    refused. `min_retries` retries per window are always allowed, so that callables seldom called
+    can still retry.
+
+    The window is split in `slots` buckets of counters, so that recording and acquiring run in
+    constant time and memory, whatever the traffic.
+
+    Thread-safe.
+
+    Examples:
+        ```python
+        from flashback import retryable
+        from flashback.retrying import RetryBudget
+
+        budget = RetryBudget(ratio=0.1, window=10)
+
+        @retryable(exceptions=(ConnectionError,), budget=budget)
+        def get_user(user_id):
+            ...
+
+        @retryable(exceptions=(ConnectionError,), budget=budget)
+        def get_order(order_id):
+            ...
+
+        budget.metrics
+        #=> {'requests': 120, 'retries': 22, 'rejected': 3, 'window_requests': 100, ...}
+        ```
+    """
+
+    def __init__(self, ratio: float = 0.1, window: float = 10.0, min_retries: int = 10, slots: int = 10) -> None:
+        """
+        Params:
+            ratio: the number of retries allowed per request made over the window
+            window: the number of seconds of the sliding window
+            min_retries: the number of retries always allowed over the window
+            slots: the number of buckets to split the window in
+
+        Raises:
+            ValueError: if any parameter is negative, or if `window` or `slots` is null
+        """
+        if ratio < 0:
+            raise ValueError(f"invalid ratio {ratio!r}, expecting a positive number")
+        if window <= 0:
+            raise ValueError(f"invalid window {window!r}, expecting a strictly positive number")
+        if min_retries < 0:
+            raise ValueError(f"invalid min_retries {min_retries!r}, expecting a positive integer")
+        if slots < 1:
+            raise ValueError(f"invalid slots {slots!r}, expecting a strictly positive integer")
+
+        self._ratio = ratio
+        self._min_retries = min_retries
+        self._slot_duration = window / slots
+
+        self._lock = Lock()
+        # Each bucket remembers the slot it counts for, to be reset when the window slid past it
+        self._slot_ids = [-1] * slots
+        self._slot_requests = [0] * slots
+        self._slot_retries = [0] * slots
+
+        self._requests = 0
+        self._retries = 0
+        self._rejected = 0
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """
+        Describes the consumption of the budget.
+
+        Returns:
+            the total number of requests, retries and rejected retries, the number of requests and
+            retries over the window, and the number of retries still available
+        """
+        with self._lock:
+            window_requests, window_retries = self._window_counts()
+
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "rejected": self._rejected,
+                "window_requests": window_requests,
+                "window_retries": window_retries,
+                "available": self._available(window_requests, window_retries),
+            }
+
+    @property
+    def available(self) -> int:
+        """
+        Returns:
+            the number of retries still available over the window
+        """
+        with self._lock:
+            return self._available(*self._window_counts())
+
+    def record_request(self) -> None:
+        """
+        Records a request, depositing `ratio` retry in the budget.
+        """
+        with self._lock:
+            self._slot_requests[self._current_slot()] += 1
+            self._requests += 1
+
+    def acquire(self) -> bool:
+        """
+        Withdraws a retry from the budget, if available.
+
+        Returns:
+            whether the retry is allowed
+        """
+        with self._lock:
+            if self._available(*self._window_counts()) <= 0:
+                self._rejected += 1
+
+                return False
+
+            self._slot_retries[self._current_slot()] += 1
+            self._retries += 1
+
+            return True
+
+    def _available(self, window_requests: int, window_retries: int) -> int:
+        allowed = max(self._min_retries, math.floor(window_requests * self._ratio))
+
+        return max(0, allowed - window_retries)
+
+    def _current_slot(self) -> int:
+        slot_id = int(time.monotonic() / self._slot_duration)
+        index = slot_id % len(self._slot_ids)
+
+        if self._slot_ids[index] != slot_id:
+            self._slot_ids[index] = slot_id
+            self._slot_requests[index] = 0
+            self._slot_retries[index] = 0
+
+        return index
+
+    def _window_counts(self) -> tuple[int, int]:
+        oldest_slot_id = int(time.monotonic() / self._slot_duration) - len(self._slot_ids)
+
+        window_requests = 0
+        window_retries = 0
+        for slot_id, requests, retries in zip(self._slot_ids, self._slot_requests, self._slot_retries):
+            if slot_id > oldest_slot_id:
+                window_requests += requests
+                window_retries += retries
+
+        return window_requests, window_retries
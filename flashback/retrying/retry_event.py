@@ -0,0 +1,51 @@
+import typing as t
+
+
+class RetryEvent:
+    """
+    Describes a step in the retries of a call to a callable decorated with `retryable`, as passed to
+    its hooks.
+
+    The kind of the event is one of:
+
+    - retry: an exception was caught and the callable will be called again after `delay` seconds
+    - give_up: an exception was caught and raised, because of `reason` (max_retries, deadline,
+    budget, or not_retryable when the exception is not to be retried)
+    - success: the callable returned after `attempt` calls
+
+    When retrying on a result, `exception` is a `RejectedResult` holding it.
+    """
+
+    __slots__ = ("attempt", "delay", "elapsed", "exception", "kind", "name", "reason")
+
+    def __init__(  # noqa: PLR0913
+        self,
+        kind: t.Literal["retry", "give_up", "success"],
+        name: str,
+        attempt: int,
+        *,
+        elapsed: float,
+        delay: float = 0.0,
+        exception: Exception | None = None,
+        reason: str | None = None,
+    ) -> None:
+        """
+        Params:
+            kind: the kind of the event
+            name: the qualified name of the decorated callable
+            attempt: the number of calls made so far
+            elapsed: the number of seconds since the first call
+            delay: the number of seconds to wait before the next call, for retry events
+            exception: the exception caught, for retry and give_up events
+            reason: the reason for giving up, for give_up events
+        """
+        self.kind = kind
+        self.name = name
+        self.attempt = attempt
+        self.elapsed = elapsed
+        self.delay = delay
+        self.exception = exception
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"<RetryEvent {self.kind} {self.name} attempt={self.attempt} elapsed={self.elapsed:.2f}s>"
@@ -0,0 +1,106 @@
+from collections import Counter
+from threading import Lock
+
+
+class RetryStats:
+    """
+    Counts the calls, retries and outcomes of a callable decorated with `retryable`, to see which
+    dependencies are burning time in retries.
+
+    Counting takes a lock only once per call, and once per caught exception, so it is cheap enough
+    to be always on.
+
+    Thread-safe.
+
+    Examples:
+        ```python
+        from flashback import retryable
+
+        @retryable(exceptions=(ConnectionError,))
+        def get_user(user_id):
+            ...
+
+        get_user.retry_stats.as_dict()
+        #=> {'calls': 120, 'attempts': 131, 'successes': 119, 'successes_after_retry': 9, 'give_ups': 1, ...}
+        ```
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+
+        self.calls = 0
+        self.attempts = 0
+        self.successes = 0
+        self.successes_after_retry = 0
+        self.give_ups = 0
+        self.time_slept = 0.0
+        self.exceptions: Counter[str] = Counter()
+
+    def record_success(self, attempt: int) -> None:
+        """
+        Records a call that returned after `attempt` attempts.
+
+        Params:
+            attempt: the number of attempts made by the call
+        """
+        with self._lock:
+            self.calls += 1
+            self.attempts += attempt
+            self.successes += 1
+            if attempt > 1:
+                self.successes_after_retry += 1
+
+    def record_retry(self, exception: Exception, delay: float) -> None:
+        """
+        Records an exception caught and retried after `delay` seconds.
+
+        Params:
+            exception: the exception caught
+            delay: the number of seconds slept before retrying
+        """
+        with self._lock:
+            self.exceptions[exception.__class__.__name__] += 1
+            self.time_slept += delay
+
+    def record_give_up(self, exception: Exception, attempt: int) -> None:
+        """
+        Records a call that raised `exception` after `attempt` attempts.
+
+        Params:
+            exception: the exception raised
+            attempt: the number of attempts made by the call
+        """
+        with self._lock:
+            self.exceptions[exception.__class__.__name__] += 1
+            self.calls += 1
+            self.attempts += attempt
+            self.give_ups += 1
+
+    def as_dict(self) -> dict[str, int | float | dict[str, int]]:
+        """
+        Returns:
+            a snapshot of the counters
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "successes": self.successes,
+                "successes_after_retry": self.successes_after_retry,
+                "give_ups": self.give_ups,
+                "time_slept": self.time_slept,
+                "exceptions": dict(self.exceptions),
+            }
+
+    def reset(self) -> None:
+        """
+        Resets all the counters.
+        """
+        with self._lock:
+            self.calls = 0
+            self.attempts = 0
+            self.successes = 0
+            self.successes_after_retry = 0
+            self.give_ups = 0
+            self.time_slept = 0.0
+            self.exceptions.clear()
@@ -1,9 +1,17 @@
-from collections.abc import Callable
+from array import array
+from collections.abc import Awaitable, Callable, Hashable
 from queue import Queue
+from threading import Lock
+import asyncio
 import functools
+import inspect
+import math
 import random
 import time
+import typing as t
 
+from .caching import Cache
+from .deadline import remaining_time
 from .formatting import oxford_join
 
 
@@ -11,7 +19,7 @@ class sampled:  # noqa: N801
     """
     Implements a way of sampling requests made to a callable.
 
-    Currently implements three strategies:
+    Currently implements eight strategies:
 
     - constant
         - All calls are accepted (rate=0) or refused (rate=1) (default: 1)
@@ -19,8 +27,49 @@ class sampled:  # noqa: N801
         - A percentage of the calls are accepted (0 < rate < 1) (default: 0.5)
     - ratelimiting
         - A fixed number of requests per second are accepted (rate > 0) (default: 10)
-
-    A callable decorated with `@sampled` will return `None` if the call is not sampled.
+    - tokenbucket
+        - A fixed number of requests per second are accepted, allowing bursts of up to one second
+        of requests (rate > 0) (default: 10)
+    - leakybucket
+        - A fixed number of requests per second are accepted, evenly spaced without bursts
+        (rate > 0) (default: 10)
+    - slidingwindow
+        - A fixed number of requests are accepted over any second, without bursts at second
+        boundaries (rate > 0) (default: 10)
+    - distributed
+        - A fixed number of requests per second are accepted across all the processes sharing a
+        `cache` (rate > 0) (default: 10)
+    - adaptive
+        - A target number of requests per second are accepted, by continuously adapting the
+        probability to accept a request to the observed request rate (rate > 0) (default: 10)
+
+    The tokenbucket, leakybucket and slidingwindow strategies run in constant time, rely on a
+    monotonic clock, and support fractional rates (e.g. 0.5 for one request every two seconds). The
+    slidingwindow strategy remembers the time of the last `rate` accepted requests, so its memory
+    grows with the rate.
+
+    The distributed strategy keeps its state in a `flashback.caching.Cache`, under `key` (by
+    default, derived from the decorated callable's name). To avoid a round trip per call, each
+    process takes `prefetch` tokens at once (by default, a hundredth of the rate, and at least 10),
+    spent locally within a second. Once the storage runs out of tokens, the calls are refused
+    locally until its next refill. If the storage is unreachable, the rate is limited per process
+    instead.
+
+    The adaptive strategy re-computes its probability every second, from the number of requests
+    received (smoothed over the previous seconds), which only costs a counter per request. Contrary
+    to rate limiting, it samples requests evenly over the second instead of the first ones, and
+    captures everything at low traffic. With `key_func`, the probability is adapted per key computed
+    from the arguments of each call (e.g. per endpoint), each key targeting `rate` requests per
+    second. The probabilities are exposed by `probabilities`.
+
+    A callable decorated with `@sampled` will return `None` if the call is not sampled. With
+    `mode="wait"`, the rate-limiting strategies (ratelimiting, tokenbucket, leakybucket,
+    slidingwindow and distributed) instead delay the call until it is accepted, which throttles the
+    calls made to a dependency. The call returns `None` if it is still not accepted after `max_wait`
+    seconds (by default, it waits indefinitely), or at the deadline of the execution context (see
+    `flashback.deadline`).
+
+    Coroutine functions are supported, and wait without blocking the event loop.
 
     Inspired by:
 
@@ -38,8 +87,8 @@ class sampled:  # noqa: N801
         decorated()
         #=> Called
 
-        # Handles rate limiting per second (here 5)
-        @sampled(strategy="ratelimiting", rate=5)
+        # Handles rate limiting per second (here 5), with bursts
+        @sampled(strategy="tokenbucket", rate=5)
         def decorated():
             print("Called")
 
@@ -59,68 +108,192 @@ class sampled:  # noqa: N801
         decorated()
         decorated()
         #=> Called
+
+        # Rate limiting across processes and hosts (here 100 per second)
+        from flashback.caching import Cache
+
+        @sampled(strategy="distributed", rate=100, cache=Cache(adapter="redis", host="redis"))
+        def decorated():
+            print("Called")
+
+        # Adaptive sampling of about 10 requests per second per endpoint
+        @sampled(strategy="adaptive", rate=10, key_func=lambda request: request.path)
+        def trace(request):
+            ...
+
+        trace.probabilities
+        #=> {"/users": 0.05, "/health": 1.0}
+
+        # Throttles the calls to an API to 5 per second, waiting up to 10 seconds
+        @sampled(strategy="leakybucket", rate=5, mode="wait", max_wait=10)
+        async def fetch(url):
+            ...
         ```
     """
 
     STRATEGY_CONSTANT = "constant"
     STRATEGY_PROBABILISTIC = "probabilistic"
     STRATEGY_RATELIMITING = "ratelimiting"
+    STRATEGY_TOKENBUCKET = "tokenbucket"
+    STRATEGY_LEAKYBUCKET = "leakybucket"
+    STRATEGY_SLIDINGWINDOW = "slidingwindow"
+    STRATEGY_DISTRIBUTED = "distributed"
+    STRATEGY_ADAPTIVE = "adaptive"
     STRATEGIES = (
         STRATEGY_CONSTANT,
         STRATEGY_PROBABILISTIC,
         STRATEGY_RATELIMITING,
+        STRATEGY_TOKENBUCKET,
+        STRATEGY_LEAKYBUCKET,
+        STRATEGY_SLIDINGWINDOW,
+        STRATEGY_DISTRIBUTED,
+        STRATEGY_ADAPTIVE,
     )
 
-    def __init__(self, strategy: str = "constant", rate: float | None = None) -> None:
+    MODE_DROP = "drop"
+    MODE_WAIT = "wait"
+    MODES = (MODE_DROP, MODE_WAIT)
+
+    # The number of keys the adaptive strategy keeps a probability for, the others sharing one
+    ADAPTIVE_MAX_KEYS = 1000
+    # The weight of the last second in the request rate observed by the adaptive strategy
+    ADAPTIVE_SMOOTHING = 0.5
+    # The min number of seconds a call waits for before trying again, in the wait mode
+    MIN_WAIT = 0.001
+    # The min number of tokens the distributed strategy takes at once, to batch its round trips
+    DISTRIBUTED_MIN_PREFETCH = 10
+
+    def __init__(  # noqa: PLR0913
+        self,
+        strategy: str = "constant",
+        rate: float | None = None,
+        *,
+        cache: Cache | None = None,
+        key: str | None = None,
+        prefetch: int | None = None,
+        key_func: Callable[..., Hashable] | None = None,
+        mode: str = "drop",
+        max_wait: float | None = None,
+    ) -> None:
         """
         Params:
             strategy: the sampling strategy to use
             rate: the parameter to fine-tune the sampling strategy
+            cache: the cache to keep the state of the distributed strategy in
+            key: the key to keep the state of the distributed strategy under
+            prefetch: the number of tokens taken at once by the distributed strategy
+            key_func: the callable computing the key to adapt the probability per, from the arguments of each call
+            mode: whether to drop the calls not accepted, or to wait until they are
+            max_wait: the max number of seconds to wait for in the wait mode, indefinitely if None
         """
         self._rate: float = 0.0
 
-        if strategy == self.STRATEGY_CONSTANT:
-            if rate is None:
-                rate = 1
-            elif rate not in {0, 1}:
-                raise ValueError(f"invalid rate {rate!r}, expecting an integer of 0 or 1")
-
-            self._rate = rate
-
-            self.should_sample = self._sample_constant
-        elif strategy == self.STRATEGY_PROBABILISTIC:
-            if rate is None:
-                rate = 0.5
-            elif not 0 < rate < 1:
-                raise ValueError(f"invalid rate {rate!r}, expecting a float between 0 and 1")
+        self._cache = cache
+        self._key = key
+        self._prefetch = prefetch
+        self._key_func = key_func
+        # Set by the rate-limiting strategies, to estimate when the next call is accepted
+        self._next_in: Callable[[], float] | None = None
+
+        initializers = {
+            self.STRATEGY_CONSTANT: self._init_constant,
+            self.STRATEGY_PROBABILISTIC: self._init_probabilistic,
+            self.STRATEGY_RATELIMITING: self._init_ratelimiting,
+            self.STRATEGY_TOKENBUCKET: self._init_tokenbucket,
+            self.STRATEGY_LEAKYBUCKET: self._init_leakybucket,
+            self.STRATEGY_SLIDINGWINDOW: self._init_slidingwindow,
+            self.STRATEGY_DISTRIBUTED: self._init_distributed,
+            self.STRATEGY_ADAPTIVE: self._init_adaptive,
+        }
+        if strategy not in initializers:
+            strategies_choices = oxford_join(self.STRATEGIES, last_sep=", or ")
+            raise ValueError(f"invalid strategy {strategy!r}, expecting {strategies_choices}")
 
-            self._rate = rate
+        if key_func is not None and strategy != self.STRATEGY_ADAPTIVE:
+            raise ValueError(f"invalid key_func {key_func!r}, only supported by the adaptive strategy")
 
-            self.should_sample = self._sample_probabilistic
-        elif strategy == self.STRATEGY_RATELIMITING:
-            if rate is None:
-                rate = 10
-            elif rate <= 0:
-                raise ValueError(f"invalid rate {rate!r}, expecting a positive integer")
+        initializers[strategy](rate)
 
-            self._rate = rate
-            self._queue = Queue(maxsize=0)
+        if mode not in self.MODES:
+            modes_choices = oxford_join(self.MODES, last_sep=", or ")
+            raise ValueError(f"invalid mode {mode!r}, expecting {modes_choices}")
+        if mode == self.MODE_WAIT and self._next_in is None:
+            raise ValueError(f"invalid mode {mode!r}, only supported by the rate-limiting strategies")
+        if max_wait is not None and max_wait < 0:
+            raise ValueError(f"invalid max_wait {max_wait!r}, expecting a positive number")
 
-            self.should_sample = self._sample_ratelimiting
+        # Dropping a call is the same as waiting for it for no time
+        if mode == self.MODE_DROP:
+            self._max_wait = 0.0
         else:
-            strategies_choices = oxford_join(self.STRATEGIES, last_sep=", or ")
-            raise ValueError(f"invalid strategy {strategy!r}, expecting {strategies_choices}")
+            self._max_wait = math.inf if max_wait is None else max_wait
 
     def __call__[**P, R](self, func: Callable[P, R]) -> Callable[P, R | None]:
+        if self._key is None:
+            name = getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
+            self._key = f"flashback:sampled:{func.__module__}.{name}"
+
+        if inspect.iscoroutinefunction(func):
+            coroutine_func = t.cast("Callable[P, Awaitable[t.Any]]", func)
+
+            @functools.wraps(func)
+            async def async_inner(*args: P.args, **kwargs: P.kwargs) -> t.Any:
+                started_at = time.monotonic()
+                while not self._sample_call(args, kwargs):
+                    delay = self._wait_for(time.monotonic() - started_at)
+                    if delay is None:
+                        return None
+
+                    await asyncio.sleep(delay)
+
+                return await coroutine_func(*args, **kwargs)
+
+            return t.cast("Callable[P, R | None]", async_inner)
+
         @functools.wraps(func)
         def inner(*args: P.args, **kwargs: P.kwargs) -> R | None:
-            if not self.should_sample():
-                return None
+            started_at = time.monotonic()
+            while not self._sample_call(args, kwargs):
+                delay = self._wait_for(time.monotonic() - started_at)
+                if delay is None:
+                    return None
+
+                time.sleep(delay)
 
             return func(*args, **kwargs)
 
         return inner
 
+    @property
+    def probabilities(self) -> dict[Hashable, float]:
+        """
+        Lists the probabilities computed by the adaptive strategy.
+
+        Returns:
+            the probability to accept a request, per key (under None without `key_func`)
+        """
+        return {key: state.probability for key, state in list(getattr(self, "_adaptive_states", {}).items())}
+
+    def _sample_call(self, args: tuple[t.Any, ...], kwargs: dict[str, t.Any]) -> bool:
+        if self._key_func is None:
+            return self.should_sample()
+
+        return self.should_sample(self._key_func(*args, **kwargs))
+
+    def _wait_for(self, waited: float) -> float | None:
+        remaining = self._max_wait - waited
+
+        # Does not wait past the deadline of the execution context
+        deadline_remaining = remaining_time()
+        if deadline_remaining is not None:
+            remaining = min(remaining, deadline_remaining)
+
+        if remaining <= 0:
+            return None
+
+        # Waits a little at least, to not spin while another waiter takes the capacity
+        return min(remaining, max(self.MIN_WAIT, t.cast("Callable[[], float]", self._next_in)()))
+
     def _sample_constant(self) -> bool:
         return self._rate > 0
 
@@ -147,3 +320,252 @@ class sampled:  # noqa: N801
         self._queue.put(now)
 
         return True
+
+    def _init_constant(self, rate: float | None) -> None:
+        if rate is None:
+            rate = 1
+        elif rate not in {0, 1}:
+            raise ValueError(f"invalid rate {rate!r}, expecting an integer of 0 or 1")
+
+        self._rate = rate
+
+        self.should_sample = self._sample_constant
+
+    def _init_probabilistic(self, rate: float | None) -> None:
+        if rate is None:
+            rate = 0.5
+        elif not 0 < rate < 1:
+            raise ValueError(f"invalid rate {rate!r}, expecting a float between 0 and 1")
+
+        self._rate = rate
+
+        self.should_sample = self._sample_probabilistic
+
+    def _init_ratelimiting(self, rate: float | None) -> None:
+        if rate is None:
+            rate = 10
+        elif rate <= 0:
+            raise ValueError(f"invalid rate {rate!r}, expecting a positive integer")
+
+        self._rate = rate
+        self._queue = Queue(maxsize=0)
+
+        self.should_sample = self._sample_ratelimiting
+        self._next_in = self._next_in_ratelimiting
+
+    def _init_tokenbucket(self, rate: float | None) -> None:
+        self._init_rate(rate)
+
+        # Holds up to one second of tokens, and at least one to accept fractional rates
+        self._capacity = max(1.0, self._rate)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+
+        self.should_sample = self._sample_tokenbucket
+        self._next_in = self._next_in_tokenbucket
+
+    def _init_leakybucket(self, rate: float | None) -> None:
+        self._init_rate(rate)
+
+        self._interval = 1 / self._rate
+        self._next_at = time.monotonic()
+
+        self.should_sample = self._sample_leakybucket
+        self._next_in = self._next_in_leakybucket
+
+    def _init_slidingwindow(self, rate: float | None) -> None:
+        self._init_rate(rate)
+
+        # Rounds the limit up and stretches the window accordingly, to accept fractional rates
+        self._limit = math.ceil(self._rate)
+        self._window = self._limit / self._rate
+        # Remembers when the last `limit` requests were accepted, the oldest one being at `_oldest`
+        self._accepted_at = array("d", [-math.inf] * self._limit)
+        self._oldest = 0
+
+        self.should_sample = self._sample_slidingwindow
+        self._next_in = self._next_in_slidingwindow
+
+    def _init_distributed(self, rate: float | None) -> None:
+        if self._cache is None:
+            raise ValueError("invalid cache None, expecting a flashback.caching.Cache")
+
+        # Limits the rate per process when the storage is unreachable
+        self._init_tokenbucket(rate)
+
+        # Rounds the limit up and stretches the period accordingly, to accept fractional rates
+        self._limit = math.ceil(self._rate)
+        self._period = self._limit / self._rate
+
+        if self._prefetch is None:
+            self._prefetch = max(min(self._limit, self.DISTRIBUTED_MIN_PREFETCH), self._limit // 100)
+        elif self._prefetch < 1:
+            raise ValueError(f"invalid prefetch {self._prefetch!r}, expecting a strictly positive integer")
+
+        self._prefetched_tokens = 0
+        self._prefetched_at = -math.inf
+        self._empty_until = -math.inf
+
+        self.should_sample = self._sample_distributed
+        self._next_in = self._next_in_distributed
+
+    def _init_adaptive(self, rate: float | None) -> None:
+        self._init_rate(rate)
+
+        self._adaptive_states: dict[Hashable, _AdaptiveState] = {}
+
+        self.should_sample = self._sample_adaptive
+
+    def _init_rate(self, rate: float | None) -> None:
+        if rate is None:
+            rate = 10
+        elif rate <= 0:
+            raise ValueError(f"invalid rate {rate!r}, expecting a positive number")
+
+        self._rate = rate
+        self._lock = Lock()
+
+    def _sample_tokenbucket(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * self._rate)
+            self._refilled_at = now
+
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+
+            return True
+
+    def _sample_leakybucket(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+
+            # Implements the leaky bucket as a meter (GCRA): a request is accepted once the previous
+            # one leaked out of the bucket
+            if now < self._next_at:
+                return False
+
+            self._next_at = now + self._interval
+
+            return True
+
+    def _sample_slidingwindow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+
+            # Accepts a request if the oldest of the last `limit` accepted requests left the window
+            if now - self._accepted_at[self._oldest] < self._window:
+                return False
+
+            self._accepted_at[self._oldest] = now
+            self._oldest = (self._oldest + 1) % self._limit
+
+            return True
+
+    def _sample_distributed(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+
+            # Spends the prefetched tokens within the period they were taken in, to not exceed the rate
+            if self._prefetched_tokens > 0 and now - self._prefetched_at < self._period:
+                self._prefetched_tokens -= 1
+
+                return True
+
+            # Saves the round trips while the storage is known to be out of tokens
+            if now < self._empty_until:
+                return False
+
+        cache = t.cast("Cache", self._cache)
+        key = self._key or "flashback:sampled"
+        taken = cache.acquire(key, t.cast("int", self._prefetch), self._limit, self._period)
+        if taken is None:
+            return self._sample_tokenbucket()
+
+        with self._lock:
+            now = time.monotonic()
+            # The bucket is empty, until it is refilled with a token every 1 / rate seconds
+            if taken < t.cast("int", self._prefetch):
+                self._empty_until = now + 1 / self._rate
+            if taken == 0:
+                return False
+
+            if now - self._prefetched_at >= self._period:
+                self._prefetched_tokens = 0
+
+            self._prefetched_tokens += taken - 1
+            self._prefetched_at = now
+
+        return True
+
+    def _next_in_ratelimiting(self) -> float:
+        # The requests are counted per second of the wall clock
+        now = time.time()
+
+        return math.floor(now) + 1 - now
+
+    def _next_in_tokenbucket(self) -> float:
+        tokens = self._tokens + (time.monotonic() - self._refilled_at) * self._rate
+
+        return (1 - tokens) / self._rate
+
+    def _next_in_leakybucket(self) -> float:
+        return self._next_at - time.monotonic()
+
+    def _next_in_slidingwindow(self) -> float:
+        return self._accepted_at[self._oldest] + self._window - time.monotonic()
+
+    def _next_in_distributed(self) -> float:
+        # The tokens taken by the other processes are unknown, so polls once the bucket is refilled
+        return self._empty_until - time.monotonic()
+
+    def _sample_adaptive(self, key: Hashable = None) -> bool:
+        state = self._adaptive_states.get(key)
+        if state is None:
+            with self._lock:
+                if key not in self._adaptive_states and len(self._adaptive_states) >= self.ADAPTIVE_MAX_KEYS:
+                    key = None
+
+                state = self._adaptive_states.setdefault(key, _AdaptiveState(time.monotonic()))
+
+        # Not atomic on purpose, as a lost increment barely skews the observed request rate
+        state.calls += 1
+
+        now = time.monotonic()
+        if now - state.started_at >= 1:
+            with self._lock:
+                # Another thread may have already started a new second
+                if now - state.started_at >= 1:
+                    state.adapt(now, self._rate, self.ADAPTIVE_SMOOTHING)
+
+        return state.probability >= 1 or random.random() < state.probability
+
+
+class _AdaptiveState:
+    """
+    Holds the probability of the adaptive strategy of `sampled` for a key, and the requests
+    received since its last update.
+    """
+
+    __slots__ = ("calls", "probability", "rate", "started_at")
+
+    def __init__(self, started_at: float) -> None:
+        self.calls = 0
+        self.started_at = started_at
+        self.rate: float | None = None
+        # Accepts every request until the rate is observed
+        self.probability = 1.0
+
+    def adapt(self, now: float, target: float, smoothing: float) -> None:
+        elapsed = now - self.started_at
+        observed = self.calls / elapsed
+
+        # Smoothes the observed rate to not overreact to spikes
+        self.rate = observed if self.rate is None else smoothing * observed + (1 - smoothing) * self.rate
+        self.probability = 1.0 if self.rate <= target else target / self.rate
+
+        self.calls = 0
+        self.started_at = now
@@ -1,14 +1,84 @@
-from collections.abc import Callable
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from contextvars import Token
+from threading import Lock
 import functools
 import inspect
 import logging
+import random
 import time
+import typing as t
 
+from .formatting import oxford_join
+from .timing.exporters.base import BaseSpanExporter
+from .timing.histogram import Histogram
+from .timing.span import Span, _current_span
+from .timing.stepping import SteppedAwaitable, step_async_generator, step_generator
 
-def timed[**P, R](func: Callable[P, R]) -> Callable[P, R]:
+
+MODE_LOG = "log"
+MODE_HISTOGRAM = "histogram"
+MODE_SPAN = "span"
+MODES = (MODE_LOG, MODE_HISTOGRAM, MODE_SPAN)
+
+
+@t.overload
+def timed[**P, R](func: Callable[P, R]) -> Callable[P, R]: ...
+
+
+@t.overload
+def timed[**P, R](
+    func: None = None,
+    *,
+    mode: str = "log",
+    sample_rate: float = 1.0,
+    interval: float = 60.0,
+    precision: int = 8,
+    exporter: BaseSpanExporter | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, R]]: ...
+
+
+def timed[**P, R](  # noqa: PLR0913
+    func: Callable[P, R] | None = None,
+    *,
+    mode: str = "log",
+    sample_rate: float = 1.0,
+    interval: float = 60.0,
+    precision: int = 8,
+    exporter: BaseSpanExporter | None = None,
+) -> Callable[P, R] | Callable[[Callable[P, R]], Callable[P, R]]:
     """
     Logs the start and end of a function call, and records the time spent executing it.
 
+    Currently implements three modes:
+
+    - log
+        - Logs the start and end of each call, with its execution time
+    - histogram
+        - Records the execution times in a `flashback.timing.Histogram`, and logs a summary of the
+        calls (count, mean, p50, p90, p99 and max) every `interval` seconds, which suits hot paths
+    - span
+        - Records each call as a `flashback.timing.Span` (name, start, duration, thread, exception,
+        parent span), emitted to `exporter` to feed a tracing pipeline
+
+    The execution times are measured with `time.perf_counter_ns`, along with the time spent on CPU
+    by the calling thread (`time.thread_time_ns`). With a `sample_rate` under 1, only a random sample
+    of the calls are timed, the others only paying for a random draw.
+
+    Coroutine functions, generator functions and asynchronous generator functions are supported:
+    their execution time spans from their first step to their completion (or exhaustion), while
+    their time on CPU only accounts for their own steps, excluding the awaits, and the time spent
+    by the consumers of the generators.
+
+    In the histogram mode, the decorated callable exposes its histograms as its `histogram` and
+    `cpu_histogram` attributes (in nanoseconds), reset after each summary. The summary is logged by
+    the first call made after `interval` seconds, so no summary is logged while the callable is not
+    called.
+
+    In the span mode, the span of the timed call being executed is the current span of the
+    execution context (see `flashback.timing.current_span()`), and becomes the parent of the spans
+    of the timed calls it makes. The exporter buffers the spans, and exports them in batches from a
+    background thread, so that the calls never wait on the export.
+
     Examples:
         ```python
         from flashback import timed
@@ -20,33 +90,336 @@ def timed[**P, R](func: Callable[P, R]) -> Callable[P, R]:
         printer()
         #=> Started execution of printer
         #=> Executing
-        #=> Completed execution of printer after 2.47955322265625e-05s
+        #=> Completed execution of printer after 0.000024s (0.000023s on CPU)
+
+        @timed
+        async def fetch(url):
+            await asyncio.sleep(1)
+
+        await fetch("https://example.com")
+        #=> Started execution of fetch
+        #=> Completed execution of fetch after 1.001163s (0.000086s on CPU)
+
+        @timed(mode="histogram", sample_rate=0.1, interval=10)
+        def parse(line):
+            ...
+
+        for line in lines:
+            parse(line)
+        #=> Timed 10342 executions of parse in the last 10s: mean=0.000012s, ..., cpu_mean=0.000012s
+
+        parse.histogram.percentile(99)
+        #=> 23040
+
+        from flashback.timing import OTLPJSONFileExporter
+
+        @timed(mode="span", exporter=OTLPJSONFileExporter("spans.jsonl"))
+        def handle(request):
+            ...
         ```
 
     Params:
         func: the callable to time
+        mode: whether to log each call, a summary of the calls, or to export each call as a span
+        sample_rate: the ratio of calls to time, between 0 and 1
+        interval: the number of seconds between two summaries, in the histogram mode
+        precision: the number of significant bits kept for each execution time, in the histogram mode
+        exporter: the exporter to emit the spans to, in the span mode
 
     Returns:
-        a wrapper used to decorate a callable
+        the decorated callable, or a wrapper used to decorate a callable if `func` is None
+
+    Raises:
+        ValueError: if `mode` is unknown, `sample_rate` or `interval` are out of their bounds, or
+            `exporter` is missing in the span mode (or given in another mode)
     """
-    # `.getmodule().__name__` returns the same value as `__name__` called from the module we
-    # decorate.
-    # Since `logging` is a singleton, everytime we call `logging.getLogger()` with the same
-    # name, we receive the same logger, which "hides" this decorator as if the logging was
-    # made from within the callable we decorate
-    module = inspect.getmodule(func)
-    logger = logging.getLogger(None if module is None else module.__name__)
+    if mode not in MODES:
+        modes_choices = oxford_join(MODES, last_sep=", or ")
+        raise ValueError(f"invalid mode {mode!r}, expecting {modes_choices}")
+    if not 0 <= sample_rate <= 1:
+        raise ValueError(f"invalid sample_rate {sample_rate!r}, expecting a float between 0 and 1")
+    if interval <= 0:
+        raise ValueError(f"invalid interval {interval!r}, expecting a strictly positive number")
+    if (exporter is None) == (mode == MODE_SPAN):
+        raise ValueError(f"invalid exporter {exporter!r}, expecting an exporter in the span mode only")
+
+    def wrapper(func: Callable[P, R]) -> Callable[P, R]:
+        timer = _Timer(
+            func,
+            mode=mode,
+            sample_rate=sample_rate,
+            interval=interval,
+            precision=precision,
+            exporter=exporter,
+        )
+
+        inner = _time(func, timer)
+        if timer.histogram is not None:
+            setattr(inner, "histogram", timer.histogram)  # noqa: B010
+            setattr(inner, "cpu_histogram", timer.cpu_histogram)  # noqa: B010
+
+        return inner
+
+    if func is not None:
+        return wrapper(func)
+
+    return wrapper
+
+
+class _Measure:
+    """
+    Measures the wall time of a single call, and the CPU time spent in its steps.
+
+    With a span, makes it the current span of the execution context during the steps.
+    """
+
+    __slots__ = ("cpu_time", "error", "span", "span_token", "started_at", "step_started_at")
+
+    def __init__(self, span: Span | None = None) -> None:
+        self.span = span
+        self.span_token: Token[Span | None] | None = None
+        self.error: BaseException | None = None
+
+        self.started_at = time.perf_counter_ns()
+        self.step_started_at = 0
+        self.cpu_time = 0
+
+    def enter(self) -> None:
+        if self.span is not None:
+            self.span_token = _current_span.set(self.span)
+
+        self.step_started_at = time.thread_time_ns()
+
+    def exit(self) -> None:
+        self.cpu_time += time.thread_time_ns() - self.step_started_at
+
+        if self.span_token is not None:
+            _current_span.reset(self.span_token)
+            self.span_token = None
+
+    def fail(self, error: BaseException) -> None:
+        # Closing a generator before its exhaustion is not a failure
+        if not isinstance(error, GeneratorExit):
+            self.error = error
+
+
+class _Timer:
+    """
+    Times the calls of a single decorated callable, and reports their execution times.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        func: Callable[..., t.Any],
+        *,
+        mode: str,
+        sample_rate: float,
+        interval: float,
+        precision: int,
+        exporter: BaseSpanExporter | None,
+    ) -> None:
+        self.mode = mode
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.interval = interval
+
+        self.name = func.__name__
+        self.qualname = getattr(func, "__qualname__", self.name)
+
+        # `.getmodule().__name__` returns the same value as `__name__` called from the module we
+        # decorate.
+        # Since `logging` is a singleton, everytime we call `logging.getLogger()` with the same
+        # name, we receive the same logger, which "hides" this decorator as if the logging was
+        # made from within the callable we decorate
+        module = inspect.getmodule(func)
+        self.logger = logging.getLogger(None if module is None else module.__name__)
+        self.namespace = func.__module__
+
+        self.histogram: Histogram | None = None
+        self.cpu_histogram: Histogram | None = None
+        if mode == MODE_HISTOGRAM:
+            self.histogram = Histogram(precision)
+            self.cpu_histogram = Histogram(precision)
+
+        self._interval_ns = int(interval * 1e9)
+        self._summary_lock = Lock()
+        self._summary_at = time.perf_counter_ns() + self._interval_ns
+
+    def should_time(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def start(self) -> _Measure:
+        if self.mode == MODE_SPAN:
+            span = Span(
+                self.qualname,
+                start_time=time.time_ns(),
+                parent=_current_span.get(),
+                attributes={"code.function": self.qualname, "code.namespace": self.namespace},
+            )
+
+            return _Measure(span)
+
+        if self.mode == MODE_LOG:
+            self.logger.info("Started execution of %s", self.name)
+
+        return _Measure()
+
+    def stop(self, measure: _Measure) -> None:
+        stopped_at = time.perf_counter_ns()
+        wall_time = stopped_at - measure.started_at
+
+        if measure.span is not None:
+            measure.span.attributes["cpu_time"] = measure.cpu_time
+            measure.span.end(wall_time, measure.error)
+
+            t.cast("BaseSpanExporter", self.exporter).emit(measure.span)
+
+            return
+
+        if self.histogram is None or self.cpu_histogram is None:
+            self.logger.info(
+                "%s execution of %s after %fs (%fs on CPU)",
+                "Completed" if measure.error is None else "Failed",
+                self.name,
+                wall_time / 1e9,
+                measure.cpu_time / 1e9,
+            )
+
+            return
+
+        self.histogram.record(wall_time)
+        self.cpu_histogram.record(measure.cpu_time)
+
+        if stopped_at >= self._summary_at:
+            self._log_summary(stopped_at)
+
+    def _log_summary(self, now: int) -> None:
+        histogram = t.cast("Histogram", self.histogram)
+        cpu_histogram = t.cast("Histogram", self.cpu_histogram)
+
+        # Only one of the concurrent calls logs the summary
+        if not self._summary_lock.acquire(blocking=False):
+            return
+
+        try:
+            if now < self._summary_at:
+                return
+            self._summary_at = now + self._interval_ns
+
+            summary = histogram.summary()
+            cpu_mean = cpu_histogram.summary()["mean"]
+            histogram.reset()
+            cpu_histogram.reset()
+
+            if summary["count"]:
+                self.logger.info(
+                    "Timed %d executions of %s in the last %gs: mean=%fs, p50=%fs, p90=%fs, p99=%fs, max=%fs, "
+                    "cpu_mean=%fs",
+                    summary["count"],
+                    self.name,
+                    self.interval,
+                    *(summary[name] / 1e9 for name in ("mean", "p50", "p90", "p99", "max")),
+                    cpu_mean / 1e9,
+                )
+        finally:
+            self._summary_lock.release()
+
+
+def _time[**P, R](func: Callable[P, R], timer: _Timer) -> Callable[P, R]:
+    if inspect.isasyncgenfunction(func):
+        return _time_async_generator(func, timer)
+    if inspect.iscoroutinefunction(func):
+        return _time_coroutine(func, timer)
+    if inspect.isgeneratorfunction(func):
+        return _time_generator(func, timer)
+
+    return _time_function(func, timer)
+
+
+def _time_async_generator[**P, R](func: Callable[P, R], timer: _Timer) -> Callable[P, R]:
+    async_generator_func = t.cast("Callable[P, AsyncGenerator[t.Any, t.Any]]", func)
 
     @functools.wraps(func)
-    def inner(*args: P.args, **kwargs: P.kwargs) -> R:
-        logger.info("Started execution of %s", func.__name__)
-        before = time.time()
+    async def async_generator_inner(*args: P.args, **kwargs: P.kwargs) -> AsyncGenerator[t.Any, t.Any]:
+        async_generator = async_generator_func(*args, **kwargs)
+        if not timer.should_time():
+            async for item in async_generator:
+                yield item
+
+            return
+
+        measure = timer.start()
+        try:
+            async for item in step_async_generator(async_generator, measure.enter, measure.exit):
+                yield item
+        except BaseException as e:
+            measure.fail(e)
+
+            raise
+        finally:
+            timer.stop(measure)
+
+    return t.cast("Callable[P, R]", async_generator_inner)
+
+
+def _time_coroutine[**P, R](func: Callable[P, R], timer: _Timer) -> Callable[P, R]:
+    coroutine_func = t.cast("Callable[P, Awaitable[t.Any]]", func)
+
+    @functools.wraps(func)
+    async def async_inner(*args: P.args, **kwargs: P.kwargs) -> t.Any:
+        if not timer.should_time():
+            return await coroutine_func(*args, **kwargs)
+
+        measure = timer.start()
+        try:
+            return await SteppedAwaitable(coroutine_func(*args, **kwargs), measure.enter, measure.exit)
+        except BaseException as e:
+            measure.fail(e)
+
+            raise
+        finally:
+            timer.stop(measure)
 
-        result = func(*args, **kwargs)
+    return t.cast("Callable[P, R]", async_inner)
+
+
+def _time_generator[**P, R](func: Callable[P, R], timer: _Timer) -> Callable[P, R]:
+    generator_func = t.cast("Callable[P, Generator[t.Any, t.Any, t.Any]]", func)
+
+    @functools.wraps(func)
+    def generator_inner(*args: P.args, **kwargs: P.kwargs) -> Generator[t.Any, t.Any, t.Any]:
+        if not timer.should_time():
+            return (yield from generator_func(*args, **kwargs))
+
+        measure = timer.start()
+        try:
+            return (yield from step_generator(generator_func(*args, **kwargs), measure.enter, measure.exit))
+        except BaseException as e:
+            measure.fail(e)
+
+            raise
+        finally:
+            timer.stop(measure)
+
+    return t.cast("Callable[P, R]", generator_inner)
+
+
+def _time_function[**P, R](func: Callable[P, R], timer: _Timer) -> Callable[P, R]:
+    @functools.wraps(func)
+    def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+        if not timer.should_time():
+            return func(*args, **kwargs)
 
-        after = time.time() - before
-        logger.info("Completed execution of %s after %fs", func.__name__, after)
+        measure = timer.start()
+        measure.enter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException as e:
+            measure.fail(e)
 
-        return result
+            raise
+        finally:
+            measure.exit()
+            timer.stop(measure)
 
     return inner
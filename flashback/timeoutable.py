@@ -1,15 +1,67 @@
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from importlib import import_module
+import asyncio
+import contextvars
 import functools
-from collections.abc import Callable
+import inspect
+import math
+import multiprocessing
 import signal
+import threading
+import time
+import typing as t
+import warnings
+
+from .deadline import deadline, remaining_time
+from .formatting import oxford_join
+
+
+BACKEND_SIGNAL = "signal"
+BACKEND_THREAD = "thread"
+BACKEND_PROCESS = "process"
+BACKEND_ASYNCIO = "asyncio"
+BACKENDS = (BACKEND_SIGNAL, BACKEND_THREAD, BACKEND_PROCESS, BACKEND_ASYNCIO)
 
 
 def timeoutable[**P, R](
-    seconds: int = 5,
+    seconds: float = 5,
     message: str = "execution timed out",
+    *,
+    backend: str | None = None,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
     Times out a callable's execution if its runtime exceeds `seconds`.
 
+    Currently implements four backends:
+
+    - signal
+        - Interrupts the callable with a `SIGALRM` scheduled by `signal.setitimer`, which only works
+        in the main thread (supports fractions of seconds, and restores the previous alarm)
+    - thread
+        - Runs the callable in a new thread, and stops waiting for it after `seconds`: the thread
+        can't be interrupted and runs until completion in the background
+    - process
+        - Runs the callable in a new process, killed after `seconds`, which suits long CPU-bound
+        code: the process is started by a fork server (or spawned on platforms without one), as
+        forking a multi-threaded process may deadlock the child, so starting it costs the import of
+        the modules of the callable, which must be defined at the top level of a module, and its
+        arguments, return value and exceptions must be picklable
+    - asyncio
+        - Cancels the coroutine with `asyncio.timeout`
+
+    By default, the backend is picked at each call: asyncio for coroutine functions, signal in the
+    main thread, and thread otherwise, with a `RuntimeWarning` as the threads timing out keep running
+    in the background.
+
+    With `seconds` of 0, the execution is not timed out (but still within the deadline of the
+    execution context, if any).
+
+    The timeout is set as the deadline of the execution (see `flashback.deadline`), so that nested
+    `@timeoutable` and `@retryable` callables do not wait past it. Within a deadline, the timeout is
+    shrunk to the remaining time, and the call fails right away once it is elapsed.
+
     Examples:
         ```python
         import time
@@ -32,33 +84,256 @@ def timeoutable[**P, R](
 
         slow()
         #=> TimeoutError: Execution timed out
+
+        @timeoutable(0.5, backend="process")
+        def compute():
+            return sum(i * i for i in range(10**9))
+
+        compute()
+        #=> TimeoutError: Execution timed out
         ```
 
     Params:
         seconds: the number of seconds to wait before timing out
         message: the custom message to display when timing out
+        backend: the backend timing out the execution, picked at each call if None
 
     Return:
         a wrapper used to decorate a callable
 
     Raises:
+        ValueError: if `seconds` is negative, or `backend` is unknown or unsupported
         TimeoutError: if the callable's execution time is longer than `seconds`
     """
+    if seconds < 0:
+        raise ValueError(f"invalid seconds {seconds!r}, expecting a positive number")
+    if backend is not None and backend not in BACKENDS:
+        backends_choices = oxford_join(BACKENDS, last_sep=", or ")
+        raise ValueError(f"invalid backend {backend!r}, expecting {backends_choices}")
 
     def wrapper(func: Callable[P, R]) -> Callable[P, R]:
-        def _sigalrm_handler(_signum, _frame):
-            raise TimeoutError(message)
+        if inspect.iscoroutinefunction(func):
+            if backend not in {None, BACKEND_ASYNCIO}:
+                raise ValueError(f"invalid backend {backend!r}, expecting asyncio for coroutine functions")
+
+            coroutine_func = t.cast("Callable[P, Awaitable[t.Any]]", func)
+
+            @functools.wraps(func)
+            async def async_inner(*args: P.args, **kwargs: P.kwargs) -> t.Any:
+                shrunk_seconds = _shrink(seconds, message)
+                if math.isinf(shrunk_seconds):
+                    return await coroutine_func(*args, **kwargs)
+
+                timeout = asyncio.timeout(shrunk_seconds)
+                try:
+                    with deadline(shrunk_seconds):
+                        async with timeout:
+                            return await coroutine_func(*args, **kwargs)
+                except TimeoutError as e:
+                    # Lets the timeouts raised by the coroutine itself through
+                    if not timeout.expired():
+                        raise
+
+                    raise TimeoutError(message) from e
+
+            return t.cast("Callable[P, R]", async_inner)
+
+        if backend == BACKEND_ASYNCIO:
+            raise ValueError(f"invalid backend {backend!r}, expecting a coroutine function")
 
         @functools.wraps(func)
         def inner(*args: P.args, **kwargs: P.kwargs) -> R:
-            signal.signal(signal.SIGALRM, _sigalrm_handler)
-            signal.alarm(seconds)
+            call = functools.partial(func, *args, **kwargs)
+            timeout = _shrink(seconds, message)
+            if math.isinf(timeout):
+                return call()
+
+            with deadline(timeout):
+                if backend == BACKEND_PROCESS:
+                    return _call_in_process(call, timeout, message)
+                if backend == BACKEND_THREAD:
+                    return _call_in_thread(call, timeout, message)
+                if backend is None and threading.current_thread() is not threading.main_thread():
+                    warnings.warn(
+                        f"timing out {_name(call)} in a thread outside of the main thread, the thread keeps "
+                        "running in the background when timing out",
+                        category=RuntimeWarning,
+                        stacklevel=2,
+                    )
+
+                    return _call_in_thread(call, timeout, message)
 
-            try:
-                return func(*args, **kwargs)
-            finally:
-                signal.alarm(0)
+                return _call_with_signal(call, timeout, message)
+
+        # Allows the process backend to find the callable from its wrapper, bound to its name
+        setattr(inner, "_timeoutable_func", func)  # noqa: B010
 
         return inner
 
     return wrapper
+
+
+def _shrink(seconds: float, message: str) -> float:
+    # A timeout of 0 does not time out, unless within a deadline
+    if seconds == 0:
+        seconds = math.inf
+
+    remaining = remaining_time()
+    if remaining is None:
+        return seconds
+    if remaining <= 0:
+        raise TimeoutError(message)
+
+    return min(seconds, remaining)
+
+
+def _call_with_signal[R](call: Callable[[], R], seconds: float, message: str) -> R:
+    def _sigalrm_handler(_signum, _frame):
+        raise TimeoutError(message)
+
+    previous_handler = signal.signal(signal.SIGALRM, _sigalrm_handler)
+    previous_delay, previous_interval = signal.setitimer(signal.ITIMER_REAL, seconds)
+    started_at = time.monotonic()
+
+    try:
+        return call()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+        # Re-arms the alarm of an enclosing call, firing it right away if it expired meanwhile
+        if previous_delay > 0:
+            remaining = max(previous_delay - (time.monotonic() - started_at), 1e-6)
+            signal.setitimer(signal.ITIMER_REAL, remaining, previous_interval)
+
+
+def _call_in_thread[R](call: Callable[[], R], seconds: float, message: str) -> R:
+    future: Future[R] = Future()
+    # Runs the callable with the context of the caller, as a direct call would
+    context = contextvars.copy_context()
+
+    def _run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(context.run(call))
+        except BaseException as e:  # noqa: BLE001
+            future.set_exception(e)
+
+    threading.Thread(target=_run, name=f"timeoutable-{_name(call)}", daemon=True).start()
+
+    try:
+        return future.result(timeout=seconds)
+    except TimeoutError as e:
+        # Lets the timeouts raised by the callable itself through
+        if future.done():
+            raise
+
+        raise TimeoutError(message) from e
+
+
+def _call_in_process[R](call: functools.partial[R], seconds: float, message: str) -> R:
+    # Never forks, as forking a multi-threaded process may deadlock the child
+    start_methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in start_methods else "spawn")
+
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_in_process,
+        args=(sender, _picklable(call)),
+        name=f"timeoutable-{_name(call)}",
+    )
+    process.daemon = True
+    process.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(seconds):
+            raise TimeoutError(message)
+
+        succeeded, value = receiver.recv()
+    except EOFError:
+        process.join()
+
+        raise ChildProcessError(f"process exited with code {process.exitcode} before returning") from None
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+
+    if not succeeded:
+        raise value
+
+    return value
+
+
+def _run_in_process(sender: Connection, call: Callable[[], t.Any]) -> None:
+    try:
+        outcome = (True, call())
+    except BaseException as e:  # noqa: BLE001
+        outcome = (False, e)
+
+    try:
+        sender.send(outcome)
+    except Exception as e:  # noqa: BLE001
+        sender.send((False, RuntimeError(f"unable to send the outcome of the call: {e!r}")))
+    finally:
+        sender.close()
+
+
+def _picklable[R](call: functools.partial[R]) -> Callable[[], R]:
+    func = call.func
+    module_name = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", None)
+
+    # The name of a decorated function is bound to its wrapper, which `pickle` refuses to pickle
+    # the function by, so the function is found from the wrapper in the process instead
+    if module_name is not None and qualname is not None and _find_func(module_name, qualname) is func:
+        return _FuncCall(module_name, qualname, call.args, call.keywords)
+
+    return call
+
+
+def _find_func(module_name: str, qualname: str) -> Callable[..., t.Any] | None:
+    try:
+        obj: t.Any = import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError):
+        return None
+
+    # Unwraps the decorators applied on top of `@timeoutable`
+    while obj is not None and not hasattr(obj, "_timeoutable_func"):
+        obj = getattr(obj, "__wrapped__", None)
+
+    return None if obj is None else obj._timeoutable_func  # noqa: SLF001
+
+
+class _FuncCall:
+    """
+    Calls a function decorated with `@timeoutable` in another process, pickled by reference to its
+    wrapper.
+    """
+
+    __slots__ = ("args", "kwargs", "module_name", "qualname")
+
+    def __init__(self, module_name: str, qualname: str, args: tuple[t.Any, ...], kwargs: dict[str, t.Any]) -> None:
+        self.module_name = module_name
+        self.qualname = qualname
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self) -> t.Any:
+        func = _find_func(self.module_name, self.qualname)
+        if func is None:
+            raise RuntimeError(f"unable to find {self.module_name}.{self.qualname} in the process")
+
+        return func(*self.args, **self.kwargs)
+
+
+def _name(call: Callable[..., t.Any]) -> str:
+    func = getattr(call, "func", call)
+
+    return getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
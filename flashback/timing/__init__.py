@@ -0,0 +1,18 @@
+from .exporters import BaseSpanExporter, OTLPJSONFileExporter
+from .histogram import Histogram
+from .ring_buffer import RingBuffer
+from .span import Span, current_span
+from .stepping import SteppedAwaitable, step_async_generator, step_generator
+
+
+__all__ = (
+    "BaseSpanExporter",
+    "Histogram",
+    "OTLPJSONFileExporter",
+    "RingBuffer",
+    "Span",
+    "SteppedAwaitable",
+    "current_span",
+    "step_async_generator",
+    "step_generator",
+)
@@ -0,0 +1,8 @@
+from .base import BaseSpanExporter
+from .otlp_json_file_exporter import OTLPJSONFileExporter
+
+
+__all__ = (
+    "BaseSpanExporter",
+    "OTLPJSONFileExporter",
+)
@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from threading import Event, Lock, Thread
+import atexit
+import logging
+
+from ..ring_buffer import RingBuffer
+from ..span import Span
+
+
+logger = logging.getLogger(__name__)
+
+
+class BaseSpanExporter(ABC):
+    """
+    Defines an abstract class that needs to be implemented to register a new span exporter.
+
+    The spans emitted are pushed to a bounded `RingBuffer` (dropping the oldest spans when full),
+    and exported in batches by a background thread, started on the first span emitted. Each batch
+    is exported once `batch_size` spans are buffered, or after `interval` seconds. The remaining
+    spans are exported on `shutdown()`, called when the interpreter exits.
+    """
+
+    def __init__(self, capacity: int = 2048, batch_size: int = 512, interval: float = 1.0) -> None:
+        """
+        Params:
+            capacity: the max number of spans buffered
+            batch_size: the number of spans buffered that triggers an export
+            interval: the max number of seconds between two exports
+
+        Raises:
+            ValueError: if `batch_size` or `interval` is not strictly positive
+        """
+        if batch_size < 1:
+            raise ValueError(f"invalid batch_size {batch_size!r}, expecting a strictly positive integer")
+        if interval <= 0:
+            raise ValueError(f"invalid interval {interval!r}, expecting a strictly positive number")
+
+        self.buffer: RingBuffer[Span] = RingBuffer(capacity)
+        self.batch_size = batch_size
+        self.interval = interval
+
+        self._wake_up = Event()
+        self._stopped = Event()
+        self._export_lock = Lock()
+        self._thread: Thread | None = None
+        self._thread_lock = Lock()
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """
+        Exports a batch of spans.
+
+        Params:
+            spans: the spans to export
+        """
+
+    def emit(self, span: Span) -> None:
+        """
+        Buffers an ended span, to export in the background.
+
+        Params:
+            span: the span to export
+        """
+        if self._thread is None:
+            self._start()
+
+        self.buffer.push(span)
+
+        if len(self.buffer) >= self.batch_size:
+            self._wake_up.set()
+
+    def flush(self) -> None:
+        """
+        Exports all the spans buffered.
+        """
+        with self._export_lock:
+            while spans := self.buffer.drain(self.batch_size):
+                # A failing export must not stop the exports of the next batches
+                try:
+                    self.export(spans)
+                except Exception:
+                    logger.exception("Failed to export %d spans with %r", len(spans), self)
+
+    def shutdown(self) -> None:
+        """
+        Stops the background thread, and exports the spans buffered.
+        """
+        self._stopped.set()
+        self._wake_up.set()
+
+        if self._thread is not None:
+            self._thread.join()
+
+        self.flush()
+
+    def _start(self) -> None:
+        with self._thread_lock:
+            if self._thread is not None:
+                return
+
+            self._thread = Thread(target=self._run, name=f"{self.__class__.__name__}", daemon=True)
+            self._thread.start()
+
+            atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake_up.wait(self.interval)
+            self._wake_up.clear()
+
+            self.flush()
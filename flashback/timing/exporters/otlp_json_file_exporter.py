@@ -0,0 +1,121 @@
+from collections.abc import Sequence
+from threading import Lock
+import json
+import os
+import typing as t
+
+from ..span import Span
+from .base import BaseSpanExporter
+
+
+# The span kind and status codes of the OpenTelemetry protocol
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+
+class OTLPJSONFileExporter(BaseSpanExporter):
+    """
+    Implements a span exporter appending the spans to a file, in the JSON encoding of the
+    OpenTelemetry protocol (OTLP), one `ExportTraceServiceRequest` per line.
+
+    The file can be read by the `otlpjsonfile` receiver of the OpenTelemetry Collector, which makes
+    it possible to test the export offline, or to ship the spans to a tracing backend later.
+
+    Examples:
+        ```python
+        from flashback import timed
+        from flashback.timing import OTLPJSONFileExporter
+
+        exporter = OTLPJSONFileExporter("spans.jsonl", service_name="api")
+
+        @timed(mode="span", exporter=exporter)
+        def get_user(user_id):
+            ...
+        ```
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        service_name: str = "unknown_service",
+        **kwargs: t.Any,
+    ) -> None:
+        """
+        Params:
+            path: the path of the file to append the spans to
+            service_name: the name of the service emitting the spans
+            kwargs: every keyword argument, forwarded to `BaseSpanExporter`
+        """
+        super().__init__(**kwargs)
+
+        self.path = path
+        self.service_name = service_name
+
+        self._file_lock = Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _encode_attributes({"service.name": self.service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "flashback"},
+                            "spans": [_encode_span(span) for span in spans],
+                        },
+                    ],
+                },
+            ],
+        }
+
+        line = json.dumps(request, separators=(",", ":"), default=repr)
+        with self._file_lock, open(self.path, "a", encoding="utf-8") as outfile:
+            outfile.write(f"{line}\n")
+
+
+def _encode_span(span: Span) -> dict[str, t.Any]:
+    attributes = {"thread.id": span.thread_id, "thread.name": span.thread_name, **span.attributes}
+
+    encoded: dict[str, t.Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": SPAN_KIND_INTERNAL,
+        # 64-bit integers are encoded as strings in OTLP/JSON
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": _encode_attributes(attributes),
+        "status": {"code": STATUS_CODE_OK},
+    }
+    if span.parent_id is not None:
+        encoded["parentSpanId"] = span.parent_id
+
+    if span.error is not None:
+        encoded["status"] = {"code": STATUS_CODE_ERROR, "message": str(span.error)}
+        encoded["events"] = [
+            {
+                "name": "exception",
+                "timeUnixNano": str(span.end_time),
+                "attributes": _encode_attributes(
+                    {"exception.type": span.error.__class__.__name__, "exception.message": str(span.error)},
+                ),
+            },
+        ]
+
+    return encoded
+
+
+def _encode_attributes(attributes: dict[str, t.Any]) -> list[dict[str, t.Any]]:
+    return [{"key": key, "value": _encode_value(value)} for key, value in attributes.items()]
+
+
+def _encode_value(value: t.Any) -> dict[str, t.Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+
+    return {"stringValue": str(value)}
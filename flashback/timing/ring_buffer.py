@@ -0,0 +1,81 @@
+from collections import deque
+
+
+class RingBuffer[T]:
+    """
+    Holds up to `capacity` items, dropping the oldest ones when full, so that producers never block
+    nor grow the memory used.
+
+    Relies on the atomicity of `deque.append()` and `deque.popleft()`, so that neither pushing nor
+    draining takes a lock.
+
+    Thread-safe.
+
+    Examples:
+        ```python
+        from flashback.timing import RingBuffer
+
+        buffer = RingBuffer(capacity=2)
+        buffer.push(1)
+        buffer.push(2)
+        buffer.push(3)
+
+        buffer.drain()
+        #=> [2, 3]
+
+        buffer.dropped
+        #=> 1
+        ```
+    """
+
+    def __init__(self, capacity: int = 2048) -> None:
+        """
+        Params:
+            capacity: the max number of items held
+
+        Raises:
+            ValueError: if `capacity` is not strictly positive
+        """
+        if capacity < 1:
+            raise ValueError(f"invalid capacity {capacity!r}, expecting a strictly positive integer")
+
+        self.capacity = capacity
+        # Approximate under concurrent pushes, as counting is not atomic
+        self.dropped = 0
+
+        self._items: deque[T] = deque(maxlen=capacity)
+
+    def push(self, item: T) -> None:
+        """
+        Pushes an item, dropping the oldest one if full.
+
+        Params:
+            item: the item to push
+        """
+        if len(self._items) >= self.capacity:
+            self.dropped += 1
+
+        self._items.append(item)
+
+    def drain(self, max_items: int | None = None) -> list[T]:
+        """
+        Pops the oldest items.
+
+        Params:
+            max_items: the max number of items to pop, all if None
+
+        Returns:
+            the items popped, oldest first
+        """
+        items: list[T] = []
+
+        while max_items is None or len(items) < max_items:
+            try:
+                items.append(self._items.popleft())
+            except IndexError:
+                break
+
+        return items
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,112 @@
+from contextvars import ContextVar
+import random
+import threading
+import typing as t
+
+
+class Span:
+    """
+    Records a timed call, the way tracing systems (e.g. OpenTelemetry) represent an operation.
+
+    A span started while another one is the current span of the execution context becomes its
+    child, sharing its trace identifier.
+
+    Examples:
+        ```python
+        import time
+        from flashback.timing import Span
+
+        span = Span("get_user", start_time=time.time_ns())
+        ...
+        span.end(1034567)
+
+        span.duration
+        #=> 1034567
+        ```
+    """
+
+    __slots__ = (
+        "attributes",
+        "duration",
+        "end_time",
+        "error",
+        "name",
+        "parent_id",
+        "span_id",
+        "start_time",
+        "thread_id",
+        "thread_name",
+        "trace_id",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        start_time: int,
+        parent: t.Self | None = None,
+        attributes: dict[str, t.Any] | None = None,
+    ) -> None:
+        """
+        Params:
+            name: the name of the operation
+            start_time: the wall-clock time the operation started at, in nanoseconds since the epoch
+            parent: the span of the enclosing operation, if any
+            attributes: the attributes describing the operation
+        """
+        self.name = name
+        self.start_time = start_time
+        self.attributes = attributes or {}
+
+        self.trace_id = f"{random.getrandbits(128):032x}" if parent is None else parent.trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = None if parent is None else parent.span_id
+
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+
+        self.duration = 0
+        self.end_time = start_time
+        self.error: BaseException | None = None
+
+    def end(self, duration: int, error: BaseException | None = None) -> None:
+        """
+        Ends the operation.
+
+        Params:
+            duration: the duration of the operation, in nanoseconds
+            error: the exception the operation raised, if any
+        """
+        self.duration = duration
+        self.end_time = self.start_time + duration
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f"Span(name={self.name!r}, trace_id={self.trace_id!r}, span_id={self.span_id!r}, duration={self.duration})"
+        )
+
+
+# The span of the timed call being executed in the current context, if any
+_current_span: ContextVar[Span | None] = ContextVar("flashback_span", default=None)
+
+
+def current_span() -> Span | None:
+    """
+    Returns the span of the timed call being executed in the current execution context.
+
+    Examples:
+        ```python
+        from flashback import timed
+        from flashback.timing import current_span
+
+        @timed(mode="span", exporter=exporter)
+        def get_user(user_id):
+            current_span().attributes["user.id"] = user_id
+        ```
+
+    Returns:
+        the current span, None outside of a call timed with `mode="span"`
+    """
+    return _current_span.get()
@@ -0,0 +1,137 @@
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+import typing as t
+
+
+def step_generator[Y, S, R](
+    generator: Generator[Y, S, R],
+    on_enter: Callable[[], t.Any],
+    on_exit: Callable[[], t.Any],
+) -> Generator[Y, S, R]:
+    """
+    Runs a generator step by step, calling `on_enter` before and `on_exit` after each step, so that
+    only the execution of the generator itself is measured, and not the one of its consumer.
+
+    Values sent, exceptions thrown, and closing are forwarded to the generator, as `yield from`
+    does. Also steps through coroutines, via their `__await__` iterator, whose steps end at each
+    suspension on an await.
+
+    Examples:
+        ```python
+        from flashback.timing import step_generator
+
+        def numbers():
+            yield 1
+            yield 2
+
+        list(step_generator(numbers(), lambda: print("enter"), lambda: print("exit")))
+        #=> enter
+        #=> exit
+        #=> enter
+        #=> exit
+        #=> enter
+        #=> exit
+        #=> [1, 2]
+        ```
+
+    Params:
+        generator: the generator to run
+        on_enter: the callable called before each step
+        on_exit: the callable called after each step
+
+    Returns:
+        a generator yielding the values of `generator`, and returning its return value
+    """
+    value: t.Any = None
+    error: BaseException | None = None
+
+    while True:
+        on_enter()
+        try:
+            yielded = generator.send(value) if error is None else generator.throw(error)
+        except StopIteration as e:
+            return e.value
+        finally:
+            on_exit()
+
+        value, error = None, None
+        try:
+            value = yield yielded
+        except GeneratorExit:
+            on_enter()
+            try:
+                generator.close()
+            finally:
+                on_exit()
+
+            raise
+        except BaseException as e:  # noqa: BLE001
+            error = e
+
+
+class SteppedAwaitable[R]:
+    """
+    Awaits an awaitable step by step, calling `on_enter` before and `on_exit` after each step, so
+    that the time spent suspended on awaits is not measured.
+
+    Examples:
+        ```python
+        from flashback.timing import SteppedAwaitable
+
+        async def main():
+            await SteppedAwaitable(asyncio.sleep(1), on_enter, on_exit)
+        ```
+    """
+
+    def __init__(self, awaitable: Awaitable[R], on_enter: Callable[[], t.Any], on_exit: Callable[[], t.Any]) -> None:
+        """
+        Params:
+            awaitable: the awaitable to await
+            on_enter: the callable called before each step
+            on_exit: the callable called after each step
+        """
+        self._awaitable = awaitable
+        self._on_enter = on_enter
+        self._on_exit = on_exit
+
+    def __await__(self) -> Generator[t.Any, t.Any, R]:
+        return step_generator(self._awaitable.__await__(), self._on_enter, self._on_exit)
+
+
+async def step_async_generator[Y](
+    async_generator: AsyncGenerator[Y, t.Any],
+    on_enter: Callable[[], t.Any],
+    on_exit: Callable[[], t.Any],
+) -> AsyncGenerator[Y, t.Any]:
+    """
+    Runs an asynchronous generator step by step, calling `on_enter` before and `on_exit` after each
+    step, so that neither its consumer nor the time spent suspended on awaits are measured.
+
+    Values sent, exceptions thrown, and closing are forwarded to the asynchronous generator.
+
+    Params:
+        async_generator: the asynchronous generator to run
+        on_enter: the callable called before each step
+        on_exit: the callable called after each step
+
+    Returns:
+        an asynchronous generator yielding the values of `async_generator`
+    """
+    value: t.Any = None
+    error: BaseException | None = None
+
+    while True:
+        step = async_generator.asend(value) if error is None else async_generator.athrow(error)
+        try:
+            yielded = await SteppedAwaitable(step, on_enter, on_exit)
+        except StopAsyncIteration:
+            return
+
+        value, error = None, None
+        try:
+            value = yield yielded
+        except GeneratorExit:
+            await SteppedAwaitable(async_generator.aclose(), on_enter, on_exit)
+
+            raise
+        except BaseException as e:  # noqa: BLE001
+            error = e
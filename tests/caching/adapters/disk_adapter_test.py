@@ -87,6 +87,47 @@ class DiskAdapterTest:
 
         assert not adapter.exists("a")
 
+    def scan_test(self, adapter: DiskAdapter) -> None:
+        adapter.batch_set(["user:1", "user:2", "post:1"], ["1", "2", "3"], [-1, -1, -1])
+
+        assert sorted(adapter.scan("user:*")) == ["user:1", "user:2"]
+        assert sorted(adapter.scan("*")) == ["post:1", "user:1", "user:2"]
+        assert list(adapter.scan("none:*")) == []
+
+    def scan_expired_test(self, adapter: DiskAdapter) -> None:
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, 1])
+
+        time.sleep(1)
+
+        assert list(adapter.scan("*")) == ["a"]
+
+    def size_test(self, adapter: DiskAdapter) -> None:
+        assert adapter.size() == 0
+
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, -1])
+
+        assert adapter.size() == 2
+
+    def size_expired_test(self, adapter: DiskAdapter) -> None:
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, 1])
+
+        time.sleep(1)
+
+        assert adapter.size() == 1
+
+    def memory_usage_test(self, adapter: DiskAdapter) -> None:
+        adapter.batch_set(["a", "b"], ["1", "1" * 100], [-1, -1])
+
+        assert adapter.memory_usage("a") > 0
+        assert adapter.memory_usage("b") > adapter.memory_usage("a")
+        assert adapter.memory_usage("z") is None
+
+    def acquire_test(self, adapter: DiskAdapter) -> None:
+        assert adapter.acquire("a", 3, 10, 60) == 3
+        assert adapter.acquire("a", 10, 10, 60) == 7
+        assert adapter.acquire("a", 1, 10, 60) == 0
+        assert adapter.acquire("b", 1, 10, 60) == 1
+
     def flush_test(self, adapter: DiskAdapter) -> None:
         adapter.set("a", "1", -1)
         adapter.flush()
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 import time
 
 import pytest
@@ -114,6 +114,38 @@ class MemcachedAdapterTest:
 
         assert not adapter.exists("a")
 
+    def scan_test(self, adapter: MemcachedAdapter) -> None:
+        with pytest.raises(NotImplementedError):
+            adapter.scan("*")
+
+    def size_test(self, adapter: MemcachedAdapter) -> None:
+        # MockMemcacheClient does not count its items
+        adapter.store.stats = Mock(return_value={b"curr_items": 2})  # type: ignore because store is a MockMemcacheClient
+
+        assert adapter.size() == 2
+
+    def memory_usage_test(self, adapter: MemcachedAdapter) -> None:
+        adapter.batch_set(["a", "b"], ["1", "1" * 100], [-1, -1])
+
+        assert adapter.memory_usage("a") == 2
+        assert adapter.memory_usage("b") == 101
+        assert adapter.memory_usage("z") is None
+
+    def acquire_test(self, adapter: MemcachedAdapter) -> None:
+        with patch("flashback.caching.adapters.memcached_adapter.time.time", return_value=100.5) as mock_time:
+            assert adapter.acquire("a", 3, 10, 1) == 3
+            assert adapter.acquire("a", 10, 10, 1) == 7
+            assert adapter.acquire("a", 1, 10, 1) == 0
+
+            # Counts the tokens taken per window
+            mock_time.return_value = 101.0
+            assert adapter.acquire("a", 20, 10, 1) == 10
+
+    def acquire_evicted_test(self, adapter: MemcachedAdapter) -> None:
+        adapter.store.incr = Mock(return_value=None)  # type: ignore because store is a MockMemcacheClient
+
+        assert adapter.acquire("a", 1, 10, 1) == 0
+
     def flush_test(self, adapter: MemcachedAdapter) -> None:
         adapter.set("a", "1", -1)
         adapter.flush()
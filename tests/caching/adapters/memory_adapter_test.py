@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest.mock import patch
 import time
 
 import pytest
@@ -11,6 +14,16 @@ def adapter() -> MemoryAdapter:
 
 
 class MemoryAdapterTest:
+    def invalid_shards_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid shards"):
+            MemoryAdapter(shards=0)
+
+    def single_shard_test(self) -> None:
+        adapter = MemoryAdapter(shards=1)
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, -1])
+
+        assert adapter.batch_get(["a", "b"]) == ["1", "2"]
+
     def set_test(self, adapter: MemoryAdapter) -> None:
         assert adapter.set("a", "1", -1)
 
@@ -87,6 +100,59 @@ class MemoryAdapterTest:
 
         assert not adapter.exists("a")
 
+    def scan_test(self, adapter: MemoryAdapter) -> None:
+        adapter.batch_set(["user:1", "user:2", "post:1"], ["1", "2", "3"], [-1, -1, -1])
+
+        assert sorted(adapter.scan("user:*")) == ["user:1", "user:2"]
+        assert sorted(adapter.scan("*")) == ["post:1", "user:1", "user:2"]
+        assert list(adapter.scan("none:*")) == []
+
+    def scan_expired_test(self, adapter: MemoryAdapter) -> None:
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, 1])
+
+        time.sleep(1)
+
+        assert list(adapter.scan("*")) == ["a"]
+
+    def size_test(self, adapter: MemoryAdapter) -> None:
+        assert adapter.size() == 0
+
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, -1])
+
+        assert adapter.size() == 2
+
+    def size_expired_test(self, adapter: MemoryAdapter) -> None:
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, 1])
+
+        time.sleep(1)
+
+        assert adapter.size() == 1
+
+    def memory_usage_test(self, adapter: MemoryAdapter) -> None:
+        adapter.batch_set(["a", "b"], ["1", "1" * 100], [-1, -1])
+
+        assert adapter.memory_usage("a") > 0
+        assert adapter.memory_usage("b") > adapter.memory_usage("a")
+        assert adapter.memory_usage("z") is None
+
+    def acquire_test(self, adapter: MemoryAdapter) -> None:
+        with patch("flashback.caching.adapters.memory_adapter.time.monotonic", return_value=100.0) as mock_monotonic:
+            assert adapter.acquire("a", 3, 10, 1) == 3
+            assert adapter.acquire("a", 10, 10, 1) == 7
+            assert adapter.acquire("a", 1, 10, 1) == 0
+
+            # Refills a token every 0.1s
+            mock_monotonic.return_value = 100.25
+            assert adapter.acquire("a", 10, 10, 1) == 2
+
+            # Refills entirely after a period
+            mock_monotonic.return_value = 102.0
+            assert adapter.acquire("a", 20, 10, 1) == 10
+
+    def acquire_keys_test(self, adapter: MemoryAdapter) -> None:
+        assert adapter.acquire("a", 10, 10, 60) == 10
+        assert adapter.acquire("b", 10, 10, 60) == 10
+
     def flush_test(self, adapter: MemoryAdapter) -> None:
         adapter.set("a", "1", -1)
         adapter.flush()
@@ -95,5 +161,66 @@ class MemoryAdapterTest:
 
         assert item is None
 
+    def delete_falsy_test(self, adapter: MemoryAdapter) -> None:
+        adapter.set("a", "", -1)
+
+        assert adapter.delete("a")
+
+    def evict_test(self) -> None:
+        adapter = MemoryAdapter(eviction_interval=0)
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, 1])
+
+        time.sleep(1)
+
+        adapter.get("a")
+
+        assert list(adapter.store) == ["a"]
+
+    def evict_interval_test(self) -> None:
+        adapter = MemoryAdapter(eviction_interval=60)
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, 1])
+
+        time.sleep(1)
+
+        # Not swept yet, but ignored when read
+        assert adapter.get("b") is None
+        assert sorted(adapter.store) == ["a", "b"]
+
+    def concurrent_access_test(self) -> None:
+        # Sweeps on every call, while keys with a TTL of 0 expire right away
+        adapter = MemoryAdapter(shards=4, eviction_interval=0)
+        writing = Event()
+
+        def _write(worker: int) -> None:
+            for i in range(100):
+                key = f"{worker}:{i}"
+                adapter.set(key, str(i), -1)
+                adapter.batch_set([f"{key}:a", f"{key}:b", f"{key}:c"], ["a", "b", "c"], [-1, -1, 0])
+                adapter.delete(f"{key}:a")
+
+                assert adapter.get(key) == str(i)
+
+        def _read() -> None:
+            while writing.is_set():
+                list(adapter.scan("*"))
+                adapter.size()
+
+        writing.set()
+        with ThreadPoolExecutor(max_workers=12) as executor:
+            readers = [executor.submit(_read) for _ in range(4)]
+            writers = [executor.submit(_write, worker) for worker in range(8)]
+
+            for writer in writers:
+                writer.result()
+
+            writing.clear()
+            for reader in readers:
+                reader.result()
+
+        assert adapter.size() == 8 * 100 * 2
+        assert len(adapter.store) == 8 * 100 * 2
+        assert sorted(adapter.scan("0:*:b")) == sorted(f"0:{i}:b" for i in range(100))
+        assert list(adapter.scan("*:c")) == []
+
     def ping_test(self, adapter: MemoryAdapter) -> None:
         assert adapter.ping()
@@ -1,11 +1,14 @@
+from collections.abc import Callable
 import time
-from unittest.mock import patch
+import typing as t
+from unittest.mock import patch, Mock
 
 import pytest
 
 from mockredis import mock_redis_client
 
 from flashback.caching.adapters import RedisAdapter
+from flashback.caching.adapters.redis_adapter import ACQUIRE_SCRIPT
 
 
 @pytest.fixture
@@ -14,6 +17,39 @@ def adapter() -> RedisAdapter:
     return RedisAdapter()
 
 
+@pytest.fixture
+def acquire_script() -> Callable[[str, int, int, float, float], int]:
+    # MockRedis' Lua support expects lunatic-python, so the script runs in lupa against a minimal Redis
+    lupa = pytest.importorskip("lupa")
+    runtime = lupa.LuaRuntime()
+    store: dict[str, str] = {}
+    clock = [0.0]
+
+    def call(command: str, *args: str) -> t.Any:
+        match command:
+            case "TIME":
+                seconds, microseconds = divmod(round(clock[0] * 1_000_000), 1_000_000)
+                return runtime.table(str(seconds), str(microseconds))
+            case "GET":
+                return store.get(args[0], False)
+            case "SET":
+                store[args[0]] = args[1]
+                return "OK"
+            case _:
+                raise AssertionError(f"unexpected command {command!r}")
+
+    runtime.globals().redis = runtime.table_from({"call": call})
+
+    def run(key: str, count: int, limit: int, period: float, now: float) -> int:
+        clock[0] = now
+        runtime.globals().KEYS = runtime.table(key)
+        runtime.globals().ARGV = runtime.table(str(count), str(limit), str(period))
+
+        return int(runtime.execute(ACQUIRE_SCRIPT))
+
+    return run
+
+
 class RedisAdapterTest:
     def set_test(self, adapter: RedisAdapter) -> None:
         assert adapter.set("a", "1", -1)
@@ -96,6 +132,48 @@ class RedisAdapterTest:
 
         assert not adapter.exists("a")
 
+    def scan_test(self, adapter: RedisAdapter) -> None:
+        adapter.batch_set(["user:1", "user:2", "post:1"], ["1", "2", "3"], [-1, -1, -1])
+
+        assert sorted(adapter.scan("user:*")) == ["user:1", "user:2"]
+        assert sorted(adapter.scan("*")) == ["post:1", "user:1", "user:2"]
+        assert list(adapter.scan("none:*")) == []
+
+    def size_test(self, adapter: RedisAdapter) -> None:
+        assert adapter.size() == 0
+
+        adapter.batch_set(["a", "b"], ["1", "2"], [-1, -1])
+
+        assert adapter.size() == 2
+
+    def memory_usage_test(self, adapter: RedisAdapter) -> None:
+        # MockRedis does not implement MEMORY USAGE
+        adapter.store.memory_usage = Mock(side_effect=[56, None])  # type: ignore because store is a MockRedis
+
+        assert adapter.memory_usage("a") == 56
+        assert adapter.memory_usage("z") is None
+
+    def acquire_test(self, adapter: RedisAdapter) -> None:
+        # MockRedis runs Lua scripts with lunatic-python, see `acquire_script_test` for the script itself
+        adapter._acquire_script = Mock(return_value=3)  # noqa: SLF001
+
+        assert adapter.acquire("a", 5, 10, 1) == 3
+        adapter._acquire_script.assert_called_once_with(keys=["a"], args=[5, 10, 1])  # noqa: SLF001
+
+    def acquire_script_test(self, acquire_script: Callable[[str, int, int, float, float], int]) -> None:
+        start = 1_700_000_000.0
+
+        assert acquire_script("a", 3, 5, 1, start) == 3
+        assert acquire_script("a", 3, 5, 1, start) == 2
+        assert acquire_script("a", 1, 5, 1, start) == 0
+        assert acquire_script("b", 5, 5, 1, start) == 5
+
+        # Refills one token per `period / limit`
+        assert acquire_script("a", 5, 5, 1, start + 0.2) == 1
+        assert acquire_script("a", 5, 5, 1, start + 0.6) == 2
+        # Never holds more than `limit` tokens
+        assert acquire_script("a", 10, 5, 1, start + 60) == 5
+
     def flush_test(self, adapter: RedisAdapter) -> None:
         adapter.set("a", "1", -1)
         adapter.flush()
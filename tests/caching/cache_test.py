@@ -5,6 +5,7 @@ from mockredis import mock_redis_client
 from pymemcache.test.utils import MockMemcacheClient
 
 from flashback.caching import Cache
+from flashback.caching.adapters.redis_adapter import RedisConnectionError
 
 
 @pytest.fixture
@@ -45,6 +46,65 @@ class CacheTest:
             with pytest.raises(NotImplementedError):
                 Cache(adapter="dummy")
 
+        def invalid_lazy_test(self) -> None:
+            with pytest.raises(NotImplementedError):
+                Cache(adapter="dummy", lazy=True)
+
+        @patch("flashback.caching.adapters.redis_adapter.Redis")
+        def lazy_test(self, mocked_redis: Mock) -> None:
+            cache = Cache(adapter="redis", lazy=True)
+
+            assert not mocked_redis.called
+
+            cache.exists("a")
+
+            assert mocked_redis.called
+            assert mocked_redis.return_value.ping.called
+
+        @patch("flashback.caching.adapters.redis_adapter.Redis")
+        def lazy_unreachable_test(self, mocked_redis: Mock) -> None:
+            mocked_redis.return_value.ping.side_effect = [RedisConnectionError, True]
+            mocked_redis.return_value.get.return_value = b'"val"'
+
+            cache = Cache(adapter="redis", lazy=True)
+
+            assert cache.get("a") is None
+            assert cache.get("a") == "val"
+            assert mocked_redis.return_value.ping.call_count == 2
+
+        @patch("flashback.caching.adapters.redis_adapter.Redis")
+        def lazy_invalid_adapter_test(self, mocked_redis: Mock) -> None:
+            mocked_redis.side_effect = [ValueError("invalid host"), ValueError("other error")]
+
+            cache = Cache(adapter="redis", lazy=True)
+
+            with pytest.raises(ValueError, match="invalid host"):
+                cache.get("a")
+
+        @patch.object(Cache, "flush")
+        def lazy_with_flush_test(self, mocked_flush: Mock) -> None:
+            cache = Cache(flush=True, lazy=True)
+
+            assert not mocked_flush.called
+
+            cache.get("a")
+
+            assert mocked_flush.called
+
+        def shared_test(self) -> None:
+            cache = Cache(shared=True, namespace="shared_test")
+            other_cache = Cache(shared=True, namespace="shared_test")
+
+            assert cache.adapter is other_cache.adapter
+            assert Cache(namespace="shared_test").adapter is not cache.adapter
+            assert Cache(shared=True, namespace="other_shared_test").adapter is not cache.adapter
+
+        def shared_unhashable_test(self) -> None:
+            cache = Cache(shared=True, options={"a": 1})
+            other_cache = Cache(shared=True, options={"a": 1})
+
+            assert cache.adapter is not other_cache.adapter
+
     class SetTest:
         def ttl_test(self, cache: Cache) -> None:
             assert cache.set("a", "a", 1)
@@ -172,6 +232,71 @@ class CacheTest:
         def empty_test(self, cache: Cache) -> None:
             assert not cache.exists("z")
 
+    class ScanTest:
+        def simple_test(self, cache: Cache) -> None:
+            cache.batch_set(["user:1", "user:2", "post:1"], [1, 2, 3])
+
+            assert sorted(cache.scan("user:*")) == ["user:1", "user:2"]
+            assert sorted(cache.scan()) == ["post:1", "user:1", "user:2"]
+
+        def empty_test(self, cache: Cache) -> None:
+            assert list(cache.scan()) == []
+
+    class SizeTest:
+        def simple_test(self, cache: Cache) -> None:
+            cache.batch_set(["a", "b"], [1, 2])
+
+            assert cache.size() == 2
+
+    class MemoryUsageTest:
+        def simple_test(self, cache: Cache) -> None:
+            cache.set("a", 1)
+
+            assert cache.memory_usage("a") > 0
+
+        def empty_test(self, cache: Cache) -> None:
+            assert cache.memory_usage("z") is None
+
+    class LargestKeysTest:
+        def simple_test(self, cache: Cache) -> None:
+            cache.batch_set(["a", "b", "c"], ["a", "b" * 100, "c" * 10])
+
+            largest_keys = cache.largest_keys(2)
+
+            assert [key for key, _ in largest_keys] == ["b", "c"]
+            assert largest_keys[0][1] > largest_keys[1][1]
+
+        def pattern_test(self, cache: Cache) -> None:
+            cache.batch_set(["user:1", "post:1"], ["a", "b" * 100])
+
+            assert [key for key, _ in cache.largest_keys(pattern="user:*")] == ["user:1"]
+
+        def empty_test(self, cache: Cache) -> None:
+            assert cache.largest_keys() == []
+
+    class AcquireTest:
+        def simple_test(self, cache: Cache) -> None:
+            assert cache.acquire("a", count=3, limit=10, period=60) == 3
+            assert cache.acquire("a", count=10, limit=10, period=60) == 7
+            assert cache.acquire("a", limit=10, period=60) == 0
+
+        def introspection_test(self, cache: Cache) -> None:
+            cache.acquire("bucket:a", limit=10, period=60)
+            cache.set("user:1", "a")
+
+            # The state of the bucket is stored like any other entry
+            assert sorted(cache.scan()) == ["bucket:a", "user:1"]
+            assert list(cache.scan("user:*")) == ["user:1"]
+            assert cache.size() == 2
+
+        @patch("flashback.caching.adapters.redis_adapter.Redis")
+        def unreachable_test(self, mocked_redis: Mock) -> None:
+            mocked_redis.return_value.ping.side_effect = RedisConnectionError
+
+            cache = Cache(adapter="redis", lazy=True)
+
+            assert cache.acquire("a") is None
+
     class FlushTest:
         def simple_test(self, cache: Cache) -> None:
             cache.set("a", 1)
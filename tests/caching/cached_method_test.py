@@ -0,0 +1,168 @@
+from unittest.mock import patch, Mock
+import gc
+import time
+import typing as t
+import weakref
+
+import pytest
+from mockredis import mock_redis_client
+
+from flashback import deadline
+from flashback.caching import cached_method
+
+
+class Dummy:
+    def __init__(self, identifier: int, spy: Mock) -> None:
+        self.identifier = identifier
+        self.spy = spy
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Dummy) and self.identifier == other.identifier
+
+    # Makes sure unhashable instances are supported
+    __hash__ = None  # type: ignore
+
+    @cached_method()
+    def add(self, left: t.Any, right: t.Any) -> t.Any:
+        self.spy()
+
+        return left + right
+
+    @property
+    @cached_method()
+    def doubled(self) -> list[int]:
+        self.spy()
+
+        return [self.identifier] * 2
+
+
+class CachedMethodTest:
+    def execution_test(self) -> None:
+        assert callable(cached_method())
+        assert callable(cached_method(adapter="redis", identity="identifier"))
+
+    def invalid_adapter_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid adapter"):
+            cached_method(adapter="redis")
+
+    def cache_hit_test(self) -> None:
+        spy = Mock()
+        dummy = Dummy(1, spy)
+
+        assert dummy.add([1], [2]) == [1, 2]
+        assert dummy.add([1], [2]) == [1, 2]
+        assert spy.call_count == 1
+
+        assert dummy.add([2], [1]) == [2, 1]
+        assert spy.call_count == 2
+
+    def property_test(self) -> None:
+        spy = Mock()
+        dummy = Dummy(2, spy)
+
+        assert dummy.doubled == [2, 2]
+        assert dummy.doubled == [2, 2]
+        assert spy.call_count == 1
+
+    def per_instance_test(self) -> None:
+        spy = Mock()
+
+        Dummy(1, spy).add([1], [2])
+        Dummy(1, spy).add([1], [2])
+
+        assert spy.call_count == 2
+
+    def freed_with_instance_test(self) -> None:
+        spy = Mock()
+        dummy = Dummy(1, spy)
+        dummy.add([1], [2])
+
+        # The caches are held by the closure of the `_get_cache` helper of the decorated method
+        get_cache = next(
+            cell.cell_contents
+            for cell in Dummy.add.__closure__ or ()
+            if getattr(cell.cell_contents, "__name__", None) == "_get_cache"
+        )
+        caches = next(cell.cell_contents for cell in get_cache.__closure__ if isinstance(cell.cell_contents, dict))
+        assert id(dummy) in caches
+
+        dummy_id = id(dummy)
+        dummy_ref = weakref.ref(dummy)
+        del dummy
+        gc.collect()
+
+        assert dummy_ref() is None
+        assert dummy_id not in caches
+
+    def single_shard_test(self) -> None:
+        dummy = Dummy(1, Mock())
+        dummy.add([1], [2])
+
+        get_cache = next(
+            cell.cell_contents
+            for cell in Dummy.add.__closure__ or ()
+            if getattr(cell.cell_contents, "__name__", None) == "_get_cache"
+        )
+
+        assert len(get_cache(dummy).adapter.store) == 1
+        assert len(get_cache(dummy).adapter._shards) == 1  # noqa: SLF001
+
+    def without_weak_references_test(self) -> None:
+        class SlottedDummy:
+            __slots__ = ("identifier",)
+
+            def __init__(self, identifier: int) -> None:
+                self.identifier = identifier
+
+            @cached_method()
+            def get(self) -> int:
+                return self.identifier
+
+        with pytest.raises(TypeError, match=r"invalid instance of .*SlottedDummy.* weak references"):
+            SlottedDummy(1).get()
+
+    @patch("flashback.caching.adapters.redis_adapter.Redis", mock_redis_client)
+    def identity_test(self) -> None:
+        spy = Mock()
+
+        class RedisDummy(Dummy):
+            @cached_method(adapter="redis", identity="identifier")
+            def add(self, left: t.Any, right: t.Any) -> t.Any:
+                self.spy()
+
+                return left + right
+
+        assert RedisDummy(1, spy).add([1], [2]) == [1, 2]
+        assert RedisDummy(1, spy).add([1], [2]) == [1, 2]
+        assert spy.call_count == 1
+
+        assert RedisDummy(2, spy).add([1], [2]) == [1, 2]
+        assert spy.call_count == 2
+
+    @patch("flashback.caching.Cache.set")
+    @patch("flashback.caching.Cache.get")
+    def hash_keys_test(self, mocked_cache_get: Mock, mocked_cache_set: Mock) -> None:
+        mocked_cache_get.side_effect = [None]
+        mocked_cache_set.side_effect = [True]
+
+        class HashedDummy(Dummy):
+            @cached_method(hash_keys=True)
+            def add(self, left: t.Any, right: t.Any) -> t.Any:
+                return left + right
+
+        HashedDummy(1, Mock()).add(1, 2)
+
+        (key, _), _ = mocked_cache_set.call_args
+        assert len(key) == 32
+        assert "HashedDummy" not in key
+
+    def elapsed_deadline_test(self) -> None:
+        spy = Mock()
+
+        with deadline(0.01):
+            time.sleep(0.02)
+
+            with pytest.raises(TimeoutError, match="deadline elapsed"):
+                Dummy(1, spy).add(1, 2)
+
+        assert not spy.called
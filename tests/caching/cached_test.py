@@ -1,9 +1,13 @@
 from unittest.mock import patch, Mock
+import time
 import typing as t
 
+import pytest
 from mockredis import mock_redis_client
 
+from flashback import deadline
 from flashback.caching import cached
+from flashback.caching.adapters.redis_adapter import RedisConnectionError
 
 
 def dummy_func(left: t.Any, right: t.Any) -> t.Any:
@@ -16,6 +20,16 @@ class CachedTest:
         assert callable(cached())
         assert callable(cached(adapter="redis"))
 
+    @patch("flashback.caching.adapters.redis_adapter.Redis")
+    def lazy_test(self, mocked_redis: Mock) -> None:
+        mocked_redis.return_value.ping.side_effect = RedisConnectionError
+
+        decorated_function = cached(adapter="redis")(dummy_func)
+
+        assert not mocked_redis.called
+        assert decorated_function(1, 2) == 3
+        assert mocked_redis.called
+
     @patch("flashback.caching.Cache.set")
     @patch("flashback.caching.Cache.get")
     def cache_miss_test(self, mocked_cache_get: Mock, mocked_cache_set: Mock) -> None:
@@ -92,3 +106,21 @@ class CachedTest:
 
         assert mocked_cache_get.called
         assert not mocked_cache_set.called
+
+    @patch("flashback.caching.Cache.get")
+    def elapsed_deadline_test(self, mocked_cache_get: Mock) -> None:
+        mocked_cache_get.side_effect = [None, 3]
+        spy_func = Mock(return_value=3)
+
+        decorated_function = cached()(spy_func)
+
+        with deadline(0.01):
+            time.sleep(0.02)
+
+            # Fails fast on a cache miss, but still serves cache hits
+            with pytest.raises(TimeoutError, match="deadline elapsed"):
+                decorated_function(1, 2)
+
+            assert decorated_function(1, 2) == 3
+
+        assert not spy_func.called
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+from flashback import deadline, remaining_time
+
+
+class DeadlineTest:
+    def execution_test(self) -> None:
+        assert remaining_time() is None
+
+        with deadline(5) as deadline_at:
+            remaining = remaining_time()
+
+            assert remaining is not None
+            assert 4 < remaining <= 5
+            assert deadline_at > time.monotonic()
+
+        assert remaining_time() is None
+
+    def nested_test(self) -> None:
+        with deadline(1):
+            with deadline(10):
+                remaining = remaining_time()
+
+                # The enclosing deadline is earlier
+                assert remaining is not None
+                assert remaining <= 1
+
+            with deadline(0.5):
+                remaining = remaining_time()
+
+                assert remaining is not None
+                assert remaining <= 0.5  # noqa: PLR2004
+
+    def elapsed_test(self) -> None:
+        with deadline(0.01):
+            time.sleep(0.02)
+
+            remaining = remaining_time()
+
+            assert remaining is not None
+            assert remaining < 0
+
+    def thread_test(self) -> None:
+        # The context is not propagated to threads started without it
+        with deadline(5), ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(remaining_time).result() is None
+
+    def asyncio_test(self) -> None:
+        async def get_remaining_time() -> float | None:
+            return remaining_time()
+
+        async def run() -> float | None:
+            with deadline(5):
+                return await asyncio.create_task(get_remaining_time())
+
+        remaining = asyncio.run(run())
+
+        assert remaining is not None
+        assert remaining <= 5
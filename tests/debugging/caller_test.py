@@ -3,7 +3,7 @@ from io import StringIO
 import pytest
 from unittest.mock import patch, Mock
 
-from flashback.debugging import caller
+from flashback.debugging import caller, disable_debugging, enable_debugging
 
 
 @pytest.fixture
@@ -67,3 +67,13 @@ class CallerTest:
 
         assert caller_instance is None
         assert len(captured.splitlines()) == 12
+
+    def disabled_test(self, output: StringIO) -> None:
+        disable_debugging()
+        try:
+            caller_instance = caller(output=output)
+        finally:
+            enable_debugging()
+
+        assert caller_instance is None
+        assert output.getvalue() == ""
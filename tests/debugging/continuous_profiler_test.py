@@ -0,0 +1,94 @@
+from pathlib import Path
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from flashback.debugging import ContinuousProfiler
+
+
+def busy_func(duration: float) -> None:
+    until = time.monotonic() + duration
+    while time.monotonic() < until:
+        pass
+
+
+def run_busy_thread(duration: float) -> None:
+    thread = threading.Thread(target=busy_func, args=(duration,))
+    thread.start()
+    thread.join()
+
+
+def sampled_names(profiler: ContinuousProfiler) -> set[str]:
+    return {name for stack in profiler.snapshot_samples() for _, _, name in stack}
+
+
+class ContinuousProfilerTest:
+    def execution_test(self) -> None:
+        profiler = ContinuousProfiler(frequency=1000)
+        profiler.start()
+        try:
+            run_busy_thread(0.1)
+        finally:
+            profiler.stop()
+
+        # Samples all the threads
+        assert {"busy_func", "execution_test"} <= sampled_names(profiler)
+
+    def window_test(self) -> None:
+        profiler = ContinuousProfiler(frequency=1000, window=0.3)
+        profiler.start()
+        try:
+            run_busy_thread(0.05)
+            assert "busy_func" in sampled_names(profiler)
+
+            time.sleep(0.4)
+        finally:
+            profiler.stop()
+
+        # The samples older than the window are dropped
+        assert "busy_func" not in sampled_names(profiler)
+
+    @pytest.mark.parametrize("output_format", ["collapsed", "svg", "html", "pstats"])
+    def dump_test(self, tmp_path: Path, output_format: str) -> None:
+        profiler = ContinuousProfiler(frequency=1000, directory=tmp_path, output_format=output_format)
+        profiler.start()
+        try:
+            run_busy_thread(0.05)
+        finally:
+            profiler.stop()
+
+        path = profiler.dump()
+
+        assert os.path.dirname(path) == str(tmp_path)
+        assert path.endswith(f"-{os.getpid()}.{output_format}")
+        assert b"busy_func" in Path(path).read_bytes()
+
+    def signal_test(self, tmp_path: Path) -> None:
+        previous_handler = signal.getsignal(signal.SIGUSR1)
+        profiler = ContinuousProfiler(frequency=1000, directory=tmp_path, signum=signal.SIGUSR1)
+        profiler.start()
+        try:
+            run_busy_thread(0.05)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            time.sleep(0.05)
+        finally:
+            profiler.stop()
+
+        (path,) = tmp_path.iterdir()
+        assert "busy_func" in path.read_text()
+        assert signal.getsignal(signal.SIGUSR1) == previous_handler
+
+    @pytest.mark.parametrize(
+        ("kwargs", "message"),
+        [
+            ({"frequency": 0}, "invalid frequency"),
+            ({"window": 0}, "invalid window"),
+            ({"output_format": "png"}, "invalid output_format"),
+        ],
+    )
+    def invalid_arguments_test(self, kwargs: dict, message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            ContinuousProfiler(**kwargs)
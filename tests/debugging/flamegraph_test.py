@@ -0,0 +1,97 @@
+from pathlib import Path
+import cProfile
+import pstats
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from flashback.debugging import FlameGraph
+
+
+MAIN = ("app.py", 1, "main")
+PARSE = ("app.py", 10, "parse")
+RENDER = ("app.py", 20, "render")
+BUILTIN = ("~", 0, "<built-in method builtins.sorted>")
+
+
+def leaf_func() -> int:
+    return sum(range(100_000))
+
+
+def root_func() -> int:
+    return leaf_func() + leaf_func()
+
+
+class FlameGraphTest:
+    def to_collapsed_test(self) -> None:
+        flamegraph = FlameGraph({(MAIN, PARSE): 3, (MAIN, RENDER): 5, (MAIN,): 1, (MAIN, BUILTIN): 2})
+
+        assert flamegraph.to_collapsed() == (
+            "main (app.py:1) 1\n"
+            "main (app.py:1);<built-in method builtins.sorted> 2\n"
+            "main (app.py:1);parse (app.py:10) 3\n"
+            "main (app.py:1);render (app.py:20) 5\n"
+        )
+
+    def to_svg_test(self) -> None:
+        flamegraph = FlameGraph({(MAIN, PARSE): 1, (MAIN, RENDER): 3})
+
+        svg = ET.fromstring(flamegraph.to_svg("Dummy <title>"))
+
+        namespace = {"svg": "http://www.w3.org/2000/svg"}
+        frames = {
+            frame.find("svg:title", namespace).text: frame.find("svg:rect", namespace).attrib  # type: ignore
+            for frame in svg.findall("svg:g", namespace)
+        }
+        assert frames["main (app.py:1) (4 samples, 100.00%)"]["width"] == "1200.00"
+        assert frames["parse (app.py:10) (1 samples, 25.00%)"]["width"] == "300.00"
+        assert frames["render (app.py:20) (3 samples, 75.00%)"]["x"] == "300.00"
+        assert svg.find("svg:text", namespace).text == "Dummy <title>"  # type: ignore
+
+    def to_html_test(self) -> None:
+        flamegraph = FlameGraph({(MAIN, PARSE): 1})
+
+        html = flamegraph.to_html("Dummy")
+
+        assert html.startswith("<!DOCTYPE html>")
+        assert "<title>Dummy</title>" in html
+        assert "<svg" in html
+        assert "const total = 1;" in html
+
+    def from_stats_test(self) -> None:
+        profile = cProfile.Profile()
+        profile.runcall(root_func)
+
+        flamegraph = FlameGraph.from_stats(pstats.Stats(profile).stats)  # type: ignore because stats is untyped
+
+        stacks = {tuple(label.split(" ")[0] for label in stack) for stack in flamegraph.stacks}
+        assert ("root_func", "leaf_func", "<built-in") in stacks
+        assert flamegraph.unit == "us"
+
+    def from_stats_recursive_test(self) -> None:
+        stats = {
+            MAIN: (1, 1, 0.1, 1.0, {}),
+            # parse calls itself, which must not loop
+            PARSE: (2, 1, 0.9, 0.9, {MAIN: (1, 1, 0.5, 0.9), PARSE: (1, 1, 0.4, 0.4)}),
+        }
+
+        flamegraph = FlameGraph.from_stats(stats)
+
+        assert flamegraph.stacks == {
+            ("main (app.py:1)",): 100_000,
+            ("main (app.py:1)", "parse (app.py:10)"): 900_000,
+        }
+
+    def dump_test(self, tmp_path: Path) -> None:
+        output = tmp_path / "flamegraph.collapsed"
+        flamegraph = FlameGraph({(MAIN, PARSE): 1})
+
+        flamegraph.dump(output, "collapsed")
+
+        assert output.read_text() == "main (app.py:1);parse (app.py:10) 1\n"
+
+    def invalid_output_format_test(self, tmp_path: Path) -> None:
+        flamegraph = FlameGraph({(MAIN, PARSE): 1})
+
+        with pytest.raises(ValueError, match="invalid output_format"):
+            flamegraph.dump(tmp_path / "flamegraph.png", "png")
@@ -1,4 +1,10 @@
 from inspect import FrameInfo
+from pathlib import Path
+from unittest.mock import patch
+import importlib
+import inspect
+
+import pytest
 
 from flashback.debugging import get_frameinfo, get_call_context
 
@@ -11,6 +17,15 @@ def dummy_function_multiline() -> FrameInfo:  # Used for TestGetCallContext
     return get_frameinfo(depth=0)
 
 
+def dummy_function_nested() -> tuple[FrameInfo, ...]:
+    return (
+        get_frameinfo(),
+        get_frameinfo(
+            depth=0,
+        ),
+    )
+
+
 class GetCallContextTest:
     def one_line_call_test(self) -> None:
         frameinfo = dummy_function()
@@ -18,7 +33,7 @@ class GetCallContextTest:
         context, context_lineno, call_boundaries = get_call_context(frameinfo)
 
         assert len(context) == 11
-        assert context_lineno == 2
+        assert context_lineno == 8
         assert call_boundaries == (5, 6)
 
     def one_line_call_with_size_test(self) -> None:
@@ -26,9 +41,9 @@ class GetCallContextTest:
 
         context, context_lineno, call_boundaries = get_call_context(frameinfo, size=20)
 
-        assert len(context) == 27
+        assert len(context) == 33
         assert context_lineno == 1
-        assert call_boundaries == (6, 7)
+        assert call_boundaries == (12, 13)
 
     def multiline_call_test(self) -> None:
         frameinfo = dummy_function_multiline()
@@ -36,9 +51,66 @@ class GetCallContextTest:
         context, context_lineno, call_boundaries = get_call_context(frameinfo)
 
         assert len(context) == 11
-        assert context_lineno == 6
+        assert context_lineno == 12
         assert call_boundaries == (5, 6)
 
+    def multiline_nested_call_test(self) -> None:
+        _, frameinfo = dummy_function_nested()
+
+        context, context_lineno, call_boundaries = get_call_context(frameinfo)
+
+        # Ends with the call, located without parsing the rest of the statement
+        assert call_boundaries is not None
+        assert [line.strip() for line in context[slice(*call_boundaries)]] == [
+            "get_frameinfo(",
+            "depth=0,",
+            "),",
+        ]
+        assert context_lineno is not None
+
+    def cached_test(self) -> None:
+        frameinfo = dummy_function()
+
+        with patch("flashback.debugging.get_call_context.inspect.findsource", wraps=inspect.findsource) as findsource:
+            first_context = get_call_context(frameinfo, size=3)
+            second_context = get_call_context(frameinfo, size=3)
+
+        assert first_context == second_context
+        assert findsource.call_count <= 1
+
+    def reloaded_module_test(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        module_path = tmp_path / "reloaded_module.py"
+        module_path.write_text("def dummy_function():\n    return get_frameinfo()\n")
+        monkeypatch.syspath_prepend(tmp_path)
+        module = importlib.import_module("reloaded_module")
+        module.get_frameinfo = get_frameinfo
+
+        first_context, _, _ = get_call_context(module.dummy_function(), size=1)
+
+        module_path.write_text("def edited_dummy_function():\n    return get_frameinfo()\n")
+        importlib.reload(module)
+        module.get_frameinfo = get_frameinfo
+
+        second_context, _, _ = get_call_context(module.edited_dummy_function(), size=1)
+
+        assert first_context[0] == "def dummy_function():\n"
+        assert second_context[0] == "def edited_dummy_function():\n"
+
+    def same_code_in_other_file_test(self, tmp_path: Path) -> None:
+        source = "def dummy_function():\n    return get_frameinfo()\n"
+        contexts = []
+        for name in ("first", "second"):
+            path = tmp_path / f"{name}.py"
+            path.write_text(f"{source}# {name}\n")
+            namespace = {"get_frameinfo": get_frameinfo}
+            exec(compile(path.read_text(), str(path), "exec"), namespace)
+
+            context, _, _ = get_call_context(namespace["dummy_function"](), size=1)
+            contexts.append(context)
+
+        # The code objects are equal, though in different files
+        assert contexts[0] != contexts[1]
+
     def no_context_test(self) -> None:
         frameinfo = eval("get_frameinfo()")
 
@@ -54,7 +126,7 @@ class GetCallContextTest:
         context, context_lineno, call_boundaries = get_call_context(frameinfo)
 
         assert len(context) == 6
-        assert context_lineno == 57
+        assert context_lineno == 129
         assert call_boundaries == (5, 6)
 
 
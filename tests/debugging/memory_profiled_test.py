@@ -0,0 +1,140 @@
+from pathlib import Path
+import asyncio
+import tracemalloc
+
+import pytest
+
+from flashback.debugging import disable_debugging, enable_debugging, memory_profiled
+
+
+# Keeps the allocations alive across calls, like a leak would
+leaked: list[bytes] = []
+
+
+def allocating_func(size: int) -> None:
+    leaked.append(bytes(size))
+
+
+def temporary_func(size: int) -> int:
+    return len(bytes(size))
+
+
+class MemoryProfiledTest:
+    def setup_method(self) -> None:
+        leaked.clear()
+
+    def execution_test(self, tmp_path: Path) -> None:
+        output = tmp_path / "allocating.memory.txt"
+        decorated_func = memory_profiled(str(output))(allocating_func)
+
+        decorated_func(100_000)
+
+        profile = decorated_func.memory_profile  # type: ignore because memory_profile is set dynamically
+        assert profile.calls == 1
+        assert profile.net >= 100_000
+        assert profile.peak >= 100_000
+        assert profile.top_lines[0].traceback[0].lineno == allocating_func.__code__.co_firstlineno + 1
+        assert not tracemalloc.is_tracing()
+
+        report = output.read_text()
+        assert report.startswith("Memory profile of allocating_func after 1 call(s)\n")
+        assert "leaked.append(bytes(size))" in report
+
+    def default_output_test(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        decorated_func = memory_profiled()(allocating_func)
+
+        decorated_func(10)
+
+        assert (tmp_path / "allocating_func.memory.txt").exists()
+
+    def peak_test(self, tmp_path: Path) -> None:
+        decorated_func = memory_profiled(str(tmp_path / "temporary.memory.txt"))(temporary_func)
+
+        decorated_func(1_000_000)
+
+        profile = decorated_func.memory_profile  # type: ignore because memory_profile is set dynamically
+        # The allocations are released by the end of the call
+        assert profile.net < 100_000
+        assert profile.peak >= 1_000_000
+        assert profile.max_peak == profile.peak
+
+    def diff_across_calls_test(self, tmp_path: Path) -> None:
+        decorated_func = memory_profiled(str(tmp_path / "allocating.memory.txt"))(allocating_func)
+
+        decorated_func(100_000)
+        decorated_func(300_000)
+
+        profile = decorated_func.memory_profile  # type: ignore because memory_profile is set dynamically
+        assert profile.calls == 2
+        top_line = profile.top_lines[0]
+        assert top_line.size >= 300_000
+        assert 190_000 <= top_line.size_diff <= 210_000
+
+    def already_tracing_test(self, tmp_path: Path) -> None:
+        decorated_func = memory_profiled(str(tmp_path / "allocating.memory.txt"))(allocating_func)
+
+        tracemalloc.start()
+        try:
+            allocating_func(1_000_000)
+            decorated_func(100_000)
+
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+        profile = decorated_func.memory_profile  # type: ignore because memory_profile is set dynamically
+        # Excludes the allocations made before the call
+        assert 100_000 <= profile.net < 1_000_000
+        assert 100_000 <= profile.top_lines[0].size < 1_000_000
+
+    def context_manager_test(self, tmp_path: Path) -> None:
+        output = tmp_path / "block.memory.txt"
+
+        with memory_profiled(str(output), limit=1) as profile:
+            allocating_func(100_000)
+
+        assert profile.net >= 100_000
+        assert len(profile.top_lines) == 1
+        assert output.read_text().startswith("Memory profile of memory_profiled after 1 call(s)\n")
+
+    def recursive_test(self, tmp_path: Path) -> None:
+        @memory_profiled(str(tmp_path / "recursive.memory.txt"))
+        def decorated_func(n: int) -> None:
+            allocating_func(10_000)
+            if n > 0:
+                decorated_func(n - 1)
+
+        decorated_func(4)
+
+        profile = decorated_func.memory_profile  # type: ignore because memory_profile is set dynamically
+        # Measured as a single call
+        assert profile.calls == 1
+        assert profile.net >= 50_000
+
+    def coroutine_test(self, tmp_path: Path) -> None:
+        @memory_profiled(str(tmp_path / "coroutine.memory.txt"))
+        async def decorated_func() -> None:
+            await asyncio.sleep(0)
+            allocating_func(100_000)
+
+        asyncio.run(decorated_func())
+
+        assert decorated_func.memory_profile.net >= 100_000  # type: ignore because memory_profile is set dynamically
+
+    def disabled_test(self, tmp_path: Path) -> None:
+        output = tmp_path / "disabled.memory.txt"
+        decorated_func = memory_profiled(str(output))(allocating_func)
+
+        disable_debugging()
+        try:
+            decorated_func(100_000)
+        finally:
+            enable_debugging()
+
+        assert decorated_func.memory_profile.calls == 0  # type: ignore because memory_profile is set dynamically
+        assert not output.exists()
+
+    def invalid_limit_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid limit"):
+            memory_profiled(limit=0)
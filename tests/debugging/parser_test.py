@@ -1,4 +1,6 @@
 from unittest.mock import patch
+import ast
+import inspect
 
 import pytest
 
@@ -17,7 +19,7 @@ class ParserTest:
         filename, lineno, parsed_arguments, warning = parser.parse(None)
 
         assert filename == "tests/debugging/parser_test.py"
-        assert lineno == 17
+        assert lineno == 19
         assert parsed_arguments == [(None, None)]
         assert warning is None
 
@@ -29,9 +31,24 @@ class ParserTest:
         assert parsed_arguments == [(None, None)]
         assert warning == "error parsing code, no code context found"
 
-    @patch("flashback.debugging.parser.get_frameinfo")
-    def parse_exception_test(self, mocked_get_frameinfo, parser: Parser) -> None:
-        mocked_get_frameinfo.side_effect = ValueError("call stack is not deep enough")
+    def parse_cached_test(self) -> None:
+        parser = Parser(_offset=1)
+
+        with (
+            patch("flashback.debugging.parser.ast.parse", wraps=ast.parse) as parse,
+            patch("flashback.debugging.parser.inspect.getframeinfo", wraps=inspect.getframeinfo) as getframeinfo,
+        ):
+            for value in range(3):
+                _, _, parsed_arguments, _ = parser.parse(value)
+
+                assert parsed_arguments == [("value", value)]
+
+        # Only inspected and parsed on the first iteration (to find the statement, then its call)
+        assert getframeinfo.call_count == 1
+        assert parse.call_count == 2
+
+    def parse_exception_test(self) -> None:
+        parser = Parser(_offset=10_000)
 
         filename, lineno, parsed_arguments, warning = parser.parse(None)
 
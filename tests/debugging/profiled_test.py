@@ -1,12 +1,31 @@
+from collections.abc import AsyncGenerator, Generator
+from pathlib import Path
+from unittest.mock import patch
+import asyncio
 import os
+import pstats
+import time
 
-from flashback.debugging import profiled
+import pytest
+
+from flashback.debugging import disable_debugging, enable_debugging, profiled
+from flashback.debugging.profiled import _Profiler
 
 
 def dummy_func(left: int, right: int) -> bool:
     return left > right
 
 
+def slow_func(duration: float) -> None:
+    time.sleep(duration)
+
+
+def call_counts(output: str) -> dict[str, int]:
+    stats = pstats.Stats(output).stats  # type: ignore because stats is untyped
+
+    return {name: value[1] for (_, _, name), value in stats.items()}
+
+
 class ProfiledTest:
     def profiled_test(self) -> None:
         output_name = "dummy_func.pstats"
@@ -26,6 +45,205 @@ class ProfiledTest:
 
         self.assert_output_valid(output_name)
 
+    def coroutine_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "coroutine.pstats")
+
+        @profiled(output)
+        async def decorated_func() -> bool:
+            await asyncio.sleep(0.01)
+
+            return dummy_func(1, 2)
+
+        assert asyncio.run(decorated_func()) is False
+
+        functions = {name for _, _, name in pstats.Stats(output).stats}  # type: ignore because stats is untyped
+        assert "dummy_func" in functions
+
+    def generator_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "generator.pstats")
+
+        @profiled(output)
+        def decorated_func() -> Generator[bool]:
+            yield dummy_func(1, 2)
+            yield dummy_func(2, 1)
+
+        assert list(decorated_func()) == [False, True]
+
+        functions = {name for _, _, name in pstats.Stats(output).stats}  # type: ignore because stats is untyped
+        assert "dummy_func" in functions
+
+    def async_generator_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "async_generator.pstats")
+
+        @profiled(output)
+        async def decorated_func() -> AsyncGenerator[bool]:
+            yield dummy_func(1, 2)
+            await asyncio.sleep(0)
+            yield dummy_func(2, 1)
+
+        async def run() -> list[bool]:
+            return [item async for item in decorated_func()]
+
+        assert asyncio.run(run()) == [False, True]
+
+        functions = {name for _, _, name in pstats.Stats(output).stats}  # type: ignore because stats is untyped
+        assert "dummy_func" in functions
+
+    def recursive_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "recursive.pstats")
+
+        @profiled(output)
+        def decorated_func(n: int) -> int:
+            return n if n < 2 else decorated_func(n - 1) + decorated_func(n - 2)
+
+        assert decorated_func(5) == 5
+
+        # The inner calls are part of the profile of the outer call
+        assert call_counts(output)["decorated_func"] == 15
+
+    def aggregate_mode_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "aggregate.pstats")
+        decorated_func = profiled(output, mode="aggregate")(dummy_func)
+
+        for _ in range(3):
+            decorated_func(1, 2)
+
+        # Only dumped on demand, or on exit
+        assert not os.path.exists(output)
+
+        decorated_func.dump_stats()  # type: ignore because dump_stats is set dynamically
+
+        assert call_counts(output)["dummy_func"] == 3
+
+    def aggregate_mode_interval_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "aggregate.pstats")
+        decorated_func = profiled(output, mode="aggregate", interval=0.01)(dummy_func)
+
+        decorated_func(1, 2)
+        time.sleep(0.01)
+        decorated_func(1, 2)
+
+        assert call_counts(output)["dummy_func"] == 2
+
+    def every_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "every.pstats")
+        decorated_func = profiled(output, mode="aggregate", every=3)(dummy_func)
+
+        for _ in range(7):
+            decorated_func(1, 2)
+        decorated_func.dump_stats()  # type: ignore because dump_stats is set dynamically
+
+        # Profiles the 1st, 4th and 7th calls
+        assert call_counts(output)["dummy_func"] == 3
+
+    def sample_rate_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "sample_rate.pstats")
+        decorated_func = profiled(output, mode="aggregate", sample_rate=0)(dummy_func)
+
+        assert decorated_func(1, 2) is False
+        decorated_func.dump_stats()  # type: ignore because dump_stats is set dynamically
+
+        assert not os.path.exists(output)
+
+    def sampling_mode_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "sampling.pstats")
+        decorated_func = profiled(output, mode="sampling", sampling_interval=0.001)(slow_func)
+
+        decorated_func(0.05)
+        decorated_func(0.05)
+        decorated_func.dump_stats()  # type: ignore because dump_stats is set dynamically
+
+        functions = set(call_counts(output))
+        assert "slow_func" in functions
+        # The callers of the decorated callable are not sampled
+        assert "sampling_mode_test" not in functions
+
+    def sampling_mode_coroutine_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "sampling.pstats")
+
+        @profiled(output, mode="sampling", sampling_interval=0.001)
+        async def decorated_func() -> None:
+            await asyncio.sleep(0)
+            slow_func(0.05)
+
+        asyncio.run(decorated_func())
+        decorated_func.dump_stats()  # type: ignore because dump_stats is set dynamically
+
+        assert "slow_func" in call_counts(output)
+
+    def collapsed_output_format_test(self, tmp_path: Path) -> None:
+        output = tmp_path / "sampling.collapsed"
+        decorated_func = profiled(str(output), mode="sampling", output_format="collapsed")(slow_func)
+
+        decorated_func(0.05)
+        decorated_func.dump_stats()  # type: ignore because dump_stats is set dynamically
+
+        stacks = [line.rsplit(" ", 1) for line in output.read_text().splitlines()]
+        assert any(stack.startswith("slow_func (profiled_test.py:") for stack, _ in stacks)
+        assert all(int(weight) > 0 for _, weight in stacks)
+
+    @pytest.mark.parametrize("output_format", ["svg", "html"])
+    def flamegraph_output_format_test(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        output_format: str,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        decorated_func = profiled(output_format=output_format)(slow_func)
+
+        # Long enough to weigh more than a microsecond
+        decorated_func(0.01)
+
+        # Estimated from the stats of cProfile
+        assert "slow_func (profiled_test.py:" in (tmp_path / f"slow_func.{output_format}").read_text()
+
+    def disabled_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "disabled.pstats")
+        decorated_func = profiled(output)(dummy_func)
+
+        disable_debugging()
+        try:
+            with patch.object(_Profiler, "start") as mocked_start:
+                assert decorated_func(1, 2) is False
+        finally:
+            enable_debugging()
+
+        assert not mocked_start.called
+        assert not os.path.exists(output)
+
+    def disabled_generator_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "disabled_generator.pstats")
+
+        @profiled(output)
+        def decorated_func() -> Generator[bool]:
+            yield dummy_func(1, 2)
+
+        disable_debugging()
+        try:
+            with patch.object(_Profiler, "start") as mocked_start:
+                assert list(decorated_func()) == [False]
+        finally:
+            enable_debugging()
+
+        assert not mocked_start.called
+        assert not os.path.exists(output)
+
+    @pytest.mark.parametrize(
+        ("kwargs", "message"),
+        [
+            ({"mode": "unknown"}, "invalid mode"),
+            ({"every": 0}, "invalid every"),
+            ({"sample_rate": 2}, "invalid sample_rate"),
+            ({"interval": 0}, "invalid interval"),
+            ({"sampling_interval": 0}, "invalid sampling_interval"),
+            ({"output_format": "png"}, "invalid output_format"),
+        ],
+    )
+    def invalid_arguments_test(self, kwargs: dict, message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            profiled(**kwargs)
+
     @staticmethod
     def assert_output_valid(output_name) -> None:
         output_filename = os.path.join(os.getcwd(), output_name)
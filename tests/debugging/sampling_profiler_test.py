@@ -0,0 +1,78 @@
+from pathlib import Path
+import pstats
+import threading
+import time
+
+import pytest
+
+from flashback.debugging import SamplingProfiler
+
+
+def slow_func(duration: float) -> None:
+    time.sleep(duration)
+
+
+def outer_func(duration: float) -> None:
+    slow_func(duration)
+
+
+class SamplingProfilerTest:
+    def runcall_test(self) -> None:
+        profiler = SamplingProfiler(interval=0.001)
+
+        profiler.runcall(outer_func, 0.05)
+
+        stacks = {tuple(name for _, _, name in stack) for stack in profiler.samples}
+        assert ("outer_func", "slow_func") in stacks
+
+    def stats_test(self) -> None:
+        profiler = SamplingProfiler(interval=0.001)
+
+        profiler.runcall(outer_func, 0.05)
+
+        stats = pstats.Stats(profiler).stats  # type: ignore because stats is untyped
+        by_name = {key[2]: (key, value) for key, value in stats.items()}
+        outer_key, (_, outer_samples, outer_own, outer_cumulative, outer_callers) = by_name["outer_func"]
+        _, (_, slow_samples, _, slow_cumulative, slow_callers) = by_name["slow_func"]
+
+        assert outer_samples == slow_samples
+        assert outer_own == 0
+        assert outer_cumulative == slow_cumulative
+        assert not outer_callers
+        assert outer_key in slow_callers
+
+    def dump_stats_test(self, tmp_path: Path) -> None:
+        output = str(tmp_path / "sampling.pstats")
+        profiler = SamplingProfiler(interval=0.001)
+
+        profiler.runcall(outer_func, 0.05)
+        profiler.dump_stats(output)
+
+        functions = {name for _, _, name in pstats.Stats(output).stats}  # type: ignore because stats is untyped
+        assert {"outer_func", "slow_func"} <= functions
+
+    def disabled_test(self) -> None:
+        profiler = SamplingProfiler(interval=0.001)
+
+        profiler.runcall(outer_func, 0)
+        samples = sum(profiler.samples.values())
+        slow_func(0.05)
+
+        assert sum(profiler.samples.values()) == samples
+
+    def threads_test(self) -> None:
+        profiler = SamplingProfiler(interval=0.001)
+
+        threads = [threading.Thread(target=profiler.runcall, args=(outer_func, 0.05)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Each thread is sampled on its own
+        stacks = {tuple(name for _, _, name in stack) for stack in profiler.samples}
+        assert ("outer_func", "slow_func") in stacks
+
+    def invalid_interval_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid interval"):
+            SamplingProfiler(interval=0)
@@ -0,0 +1,26 @@
+import pytest
+
+from flashback.debugging import disable_debugging, enable_debugging, is_debugging_enabled
+from flashback.debugging.switch import _Switch
+
+
+class SwitchTest:
+    def execution_test(self) -> None:
+        assert is_debugging_enabled()
+
+        disable_debugging()
+        try:
+            assert not is_debugging_enabled()
+        finally:
+            enable_debugging()
+
+        assert is_debugging_enabled()
+
+    @pytest.mark.parametrize(
+        ("value", "enabled"),
+        [("1", True), ("yes", True), ("0", False), ("false", False), (" Off ", False), ("no", False)],
+    )
+    def environment_variable_test(self, monkeypatch: pytest.MonkeyPatch, value: str, enabled: bool) -> None:
+        monkeypatch.setenv("FLASHBACK_DEBUGGING", value)
+
+        assert _Switch().enabled is enabled
@@ -1,9 +1,11 @@
 from io import StringIO
+from unittest.mock import patch
 
 import pytest
 import re
 
-from flashback.debugging import xp
+from flashback.debugging import disable_debugging, enable_debugging, xp
+from flashback.debugging.xp import _calls_per_site
 
 CRE_ANSI = re.compile(
     r"(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]",
@@ -20,26 +22,26 @@ class XpTest:
     def simple_test(self, output: StringIO) -> None:
         xp(None, o=output)
 
-        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:21\n    None (NoneType)\n")
+        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:23\n    None (NoneType)\n")
 
     def raw_test(self, output: StringIO) -> None:
         xp(None, o=output)
 
         assert output.getvalue() == (
-            "\x1b[2mtests/debugging/xp_test.py:26\x1b[0m\n"
+            "\x1b[2mtests/debugging/xp_test.py:28\x1b[0m\n"
             "\x1b[38;5;7m    \x1b[39m\x1b[38;5;167mNone\x1b[39m \x1b[2m(NoneType)\x1b[0m\n"
         )
 
     def flush_test(self, output: StringIO) -> None:
         xp(None, o=output, f=False)
 
-        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:34\n    None (NoneType)\n")
+        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:36\n    None (NoneType)\n")
 
     def width_test(self, output: StringIO) -> None:
         xp("This string is longer than 40 chars.", o=output, w=40)
 
         assert CRE_ANSI.sub("", output.getvalue()) == (
-            "tests/debugging/xp_test.py:39\n"
+            "tests/debugging/xp_test.py:41\n"
             "    (\n"
             "        'This string is longer than 40'\n"
             "        ' chars.'\n"
@@ -49,30 +51,62 @@ class XpTest:
     def return_test(self, output: StringIO) -> None:
         result = xp(1 + 1, o=output)
 
-        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:50\n  1 + 1:\n    2 (int)\n")
+        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:52\n  1 + 1:\n    2 (int)\n")
         assert result == 2
 
     def return_none_test(self, output: StringIO) -> None:
         result = xp(o=output)
 
-        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:56\n")
+        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:58\n")
         assert result is None
 
     def return_multiple_test(self, output: StringIO) -> None:
         result = xp(1, 2, 3, o=output)
 
         assert CRE_ANSI.sub("", output.getvalue()) == (
-            "tests/debugging/xp_test.py:62\n    1 (int)\n    2 (int)\n    3 (int)\n"
+            "tests/debugging/xp_test.py:64\n    1 (int)\n    2 (int)\n    3 (int)\n"
         )
         assert result == (1, 2, 3)
 
     def no_space_test(self, output: StringIO) -> None:
         xp(None, o=output)
 
-        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:70\n    None (NoneType)\n")
+        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:72\n    None (NoneType)\n")
 
     def starred_kwargs_test(self, output: StringIO) -> None:
         kwargs = {"o": output, "w": 256}
         xp(None, **kwargs)  # type: ignore because the values are typed as StringIO | int instead of StringIO and int
 
-        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:76\n    None (NoneType)\n")
+        assert CRE_ANSI.sub("", output.getvalue()) == ("tests/debugging/xp_test.py:78\n    None (NoneType)\n")
+
+    def rate_limited_test(self, output: StringIO) -> None:
+        results = [xp(i, o=output, n=2) for i in range(5)]
+
+        assert CRE_ANSI.sub("", output.getvalue()).count("tests/debugging/xp_test.py:") == 2
+        assert results == [0, 1, 2, 3, 4]
+
+    def rate_limited_per_call_site_test(self, output: StringIO) -> None:
+        for i in range(3):
+            xp(i, o=output, n=1)
+            xp(i, o=output, n=1)
+
+        assert CRE_ANSI.sub("", output.getvalue()).count("tests/debugging/xp_test.py:") == 2
+
+    def disabled_test(self, output: StringIO) -> None:
+        disable_debugging()
+        try:
+            result = xp(1, 2, o=output)
+        finally:
+            enable_debugging()
+
+        assert output.getvalue() == ""
+        assert result == (1, 2)
+
+    def rate_limited_bounded_test(self, output: StringIO) -> None:
+        with patch("flashback.debugging.get_call_context.CACHE_SIZE", 2):
+            for i in range(5):
+                call_site = compile("xp(i, o=output, n=1)", f"<call site {i}>", "eval")
+                eval(call_site, {"xp": xp, "output": output, "i": i})
+
+        # Only remembers the last call sites, by their location
+        assert len(_calls_per_site) <= 2
@@ -0,0 +1,212 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+import asyncio
+import inspect
+import math
+import time
+
+import pytest
+
+from flashback import deadline, hedged, remaining_time
+from flashback.hedged import _LatencyWindow
+
+
+def slow_then_fast(latencies: list[float]) -> Mock:
+    # Each call sleeps for the next latency, then returns it
+    remaining = iter(latencies)
+
+    def _call() -> float:
+        latency = next(remaining)
+        time.sleep(latency)
+
+        return latency
+
+    return Mock(side_effect=_call)
+
+
+class HedgedTest:
+    def without_hedge_test(self) -> None:
+        mock_fast = Mock(return_value=1)
+
+        decorated_function = hedged(delay=1)(mock_fast)
+
+        assert decorated_function() == 1
+        assert mock_fast.call_count == 1
+
+    def with_hedge_test(self) -> None:
+        mock_slow_then_fast = slow_then_fast([1.0, 0.01])
+
+        before = time.time()
+
+        decorated_function = hedged(delay=0.05, max_extra_load=1)(mock_slow_then_fast)
+        result = decorated_function()
+
+        after = time.time() - before
+
+        # The hedge completed first
+        assert result == 0.01  # noqa: PLR2004
+        assert mock_slow_then_fast.call_count == 2
+        assert math.isclose(after, 0.06, abs_tol=0.1)
+
+    def with_max_hedges_test(self) -> None:
+        mock_slow_then_fast = slow_then_fast([0.5, 0.5, 0.5, 0.01])
+
+        decorated_function = hedged(delay=0.05, max_hedges=3, max_extra_load=3)(mock_slow_then_fast)
+
+        assert decorated_function() == 0.01  # noqa: PLR2004
+        assert mock_slow_then_fast.call_count == 4
+
+    def with_max_extra_load_test(self) -> None:
+        mock_slow_then_fast = slow_then_fast([0.2, 0.2, 0.01])
+
+        decorated_function = hedged(delay=0.05, max_extra_load=0.5, min_hedges=0)(mock_slow_then_fast)
+
+        # The first call can not hedge, as it would double the load
+        assert decorated_function() == 0.2  # noqa: PLR2004
+        # The second call can, as it makes 1 hedge out of 2 calls
+        assert decorated_function() == 0.01  # noqa: PLR2004
+
+    def with_min_hedges_test(self) -> None:
+        mock_slow_then_fast = slow_then_fast([0.2, 0.01, 0.2])
+
+        decorated_function = hedged(delay=0.05, max_extra_load=0.1)(mock_slow_then_fast)
+
+        # The first call can hedge, though it would double the load
+        assert decorated_function() == 0.01  # noqa: PLR2004
+        # The second call can not, as the single hedge allowed is spent
+        assert decorated_function() == 0.2  # noqa: PLR2004
+        assert mock_slow_then_fast.call_count == 3
+
+    def with_adaptive_delay_test(self) -> None:
+        mock_slow_then_fast = slow_then_fast([0.01] * 10 + [1.0, 0.01])
+
+        decorated_function = hedged(percentile=95, max_extra_load=1, initial_delay=10, window=100)(mock_slow_then_fast)
+        for _ in range(10):
+            decorated_function()
+
+        before = time.time()
+        result = decorated_function()
+        after = time.time() - before
+
+        # Hedged after the p95 of the latencies observed (~0.01s) instead of the initial delay
+        assert result == 0.01  # noqa: PLR2004
+        assert after < 0.5  # noqa: PLR2004
+
+    def with_hedge_latency_test(self) -> None:
+        mock_slow_then_fast = slow_then_fast([1.0, 0.01])
+
+        with patch.object(_LatencyWindow, "record", autospec=True) as mock_record:
+            decorated_function = hedged(delay=0.05, max_extra_load=1)(mock_slow_then_fast)
+            decorated_function()
+
+        # Measured from the first attempt, not from the hedge that won
+        latency = mock_record.call_args.args[1]
+        assert 0.06 <= latency < 0.5  # noqa: PLR2004
+
+    def with_deadline_test(self) -> None:
+        remaining_times = []
+
+        def _call() -> None:
+            remaining_times.append(remaining_time())
+            time.sleep(0.2 if len(remaining_times) == 1 else 0.01)
+
+        decorated_function = hedged(delay=0.05)(_call)
+
+        with deadline(5):
+            decorated_function()
+
+        # Both the call and its hedge ran in the caller's context
+        assert len(remaining_times) == 2
+        assert all(remaining is not None and remaining <= 5 for remaining in remaining_times)
+
+    def with_exception_test(self) -> None:
+        mock_with_exception = Mock(side_effect=KeyError)
+
+        decorated_function = hedged(delay=1)(mock_with_exception)
+
+        with pytest.raises(KeyError):
+            decorated_function()
+
+    def with_failing_hedge_test(self) -> None:
+        def _call() -> int:
+            if mock_call.call_count == 1:
+                time.sleep(0.2)
+
+                return 1
+
+            raise KeyError
+
+        mock_call = Mock(side_effect=_call)
+
+        decorated_function = hedged(delay=0.05, max_extra_load=1)(mock_call)
+
+        # The hedge failed, so the first call is awaited
+        assert decorated_function() == 1
+
+    def with_executor_test(self) -> None:
+        mock_fast = Mock(return_value=1)
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        decorated_function = hedged(executor=executor)(mock_fast)
+
+        assert decorated_function() == 1
+
+        executor.shutdown()
+
+    @pytest.mark.parametrize(
+        ("kwargs", "name"),
+        [
+            ({"percentile": 0}, "percentile"),
+            ({"percentile": 101}, "percentile"),
+            ({"max_hedges": 0}, "max_hedges"),
+            ({"min_hedges": -1}, "min_hedges"),
+            ({"window": 0}, "window"),
+        ],
+    )
+    def invalid_parameters_test(self, kwargs: dict[str, float], name: str) -> None:
+        with pytest.raises(ValueError, match=f"invalid {name}"):
+            hedged(**kwargs)  # type: ignore because kwargs mixes ints and floats
+
+    def async_without_hedge_test(self) -> None:
+        async def dummy_coroutine() -> int:
+            return 1
+
+        decorated_function = hedged(delay=1)(dummy_coroutine)
+
+        assert inspect.iscoroutinefunction(decorated_function)
+        assert asyncio.run(decorated_function()) == 1
+
+    def async_with_hedge_test(self) -> None:
+        latencies = iter([1.0, 0.01])
+        cancelled = []
+
+        async def dummy_coroutine() -> float:
+            latency = next(latencies)
+            try:
+                await asyncio.sleep(latency)
+            except asyncio.CancelledError:
+                cancelled.append(latency)
+
+                raise
+
+            return latency
+
+        decorated_function = hedged(delay=0.05, max_extra_load=1)(dummy_coroutine)
+
+        before = time.time()
+        result = asyncio.run(decorated_function())
+        after = time.time() - before
+
+        assert result == 0.01  # noqa: PLR2004
+        assert after < 0.5  # noqa: PLR2004
+        # The losing call was cancelled
+        assert cancelled == [1.0]
+
+    def async_with_exception_test(self) -> None:
+        async def dummy_coroutine() -> None:
+            raise KeyError
+
+        decorated_function = hedged(delay=1)(dummy_coroutine)
+
+        with pytest.raises(KeyError):
+            asyncio.run(decorated_function())
@@ -1,10 +1,13 @@
 from unittest.mock import Mock
+import asyncio
+import inspect
 import math
 import time
 
 import pytest
 
-from flashback import retryable
+from flashback import deadline, retryable, timeoutable
+from flashback.retrying import FixedBackoff, FullJitterBackoff, RejectedResult, RetryBudget, RetryEvent
 
 
 class RetryableTest:
@@ -45,6 +48,23 @@ class RetryableTest:
         # 0.15 (first retry) + 0.15 (second retry)
         assert math.isclose(after, 0.30, rel_tol=0.5)
 
+    def with_plateau_after_jitter_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[Exception] * 10 + [None])
+        delays = []
+
+        make_retryable = retryable(
+            plateau_after=1,
+            exceptions=(Exception,),
+            backoff=FullJitterBackoff(base=0.001, cap=0.001),
+            hooks=(lambda event: delays.append(event.delay) if event.kind == "retry" else None,),
+        )
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+
+        # The delays past the plateau are still drawn at random
+        assert len(delays) == 10
+        assert len(set(delays[1:])) > 1
+
     def with_reset_after_test(self) -> None:
         mock_with_exception = Mock(side_effect=[Exception] * 4 + [None])
 
@@ -68,3 +88,377 @@ class RetryableTest:
 
         with pytest.raises(AttributeError):
             decorated_function()
+
+    def with_backoff_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[Exception, Exception, None])
+
+        before = time.time()
+
+        make_retryable = retryable(exceptions=(Exception,), backoff="fixed")
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+
+        after = time.time() - before
+
+        # We catch 2 exceptions, and wait 1s each time
+        assert math.isclose(after, 2.0, rel_tol=0.1)
+
+    def with_backoff_instance_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[Exception, Exception, None])
+
+        before = time.time()
+
+        make_retryable = retryable(exceptions=(Exception,), backoff=FixedBackoff(0.1))
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+
+        after = time.time() - before
+
+        assert math.isclose(after, 0.2, rel_tol=0.5)
+
+    @pytest.mark.parametrize("backoff", ["exponential", "fixed", "fibonacci", "full_jitter", "decorrelated_jitter"])
+    def with_backoff_names_test(self, backoff: str) -> None:
+        assert callable(retryable(backoff=backoff))
+
+    def with_invalid_backoff_test(self) -> None:
+        with pytest.raises(NotImplementedError, match="backoff 'dummy' is not yet supported"):
+            retryable(backoff="dummy")
+
+    def with_deadline_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[AttributeError] * 10 + [None])
+
+        before = time.time()
+
+        deadline = 0.35
+        make_retryable = retryable(exceptions=(AttributeError,), backoff=FixedBackoff(0.1), deadline=deadline)
+        decorated_function = make_retryable(mock_with_exception)
+
+        with pytest.raises(AttributeError) as exc_info:
+            decorated_function()
+
+        after = time.time() - before
+
+        # The 4th retry would have started after the deadline
+        assert after < deadline
+        assert mock_with_exception.call_count == 4
+        assert exc_info.value.retry_count == 4  # type: ignore because retry_count is set dynamically
+
+    def with_context_deadline_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[AttributeError] * 10 + [None])
+
+        make_retryable = retryable(exceptions=(AttributeError,), backoff=FixedBackoff(0.1), max_retries=-1)
+        decorated_function = make_retryable(mock_with_exception)
+
+        before = time.time()
+        with deadline(0.35), pytest.raises(AttributeError) as exc_info:
+            decorated_function()
+
+        after = time.time() - before
+
+        # The 4th retry would have started after the deadline of the execution context
+        assert after < 0.35  # noqa: PLR2004
+        assert exc_info.value.retry_count == 4  # type: ignore because retry_count is set dynamically
+
+    def with_timeoutable_deadline_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, None])
+
+        @timeoutable(0.5)
+        @retryable(exceptions=(KeyError,), backoff=FixedBackoff(1))
+        def decorated_function() -> None:
+            mock_with_exception()
+
+        # Gives up right away instead of waiting past the timeout
+        with pytest.raises(KeyError):
+            decorated_function()
+
+    def with_budget_test(self) -> None:
+        mock_with_exception = Mock(side_effect=AttributeError)
+
+        budget = RetryBudget(ratio=0, min_retries=2)
+        make_retryable = retryable(exceptions=(AttributeError,), backoff=FixedBackoff(0), budget=budget)
+        decorated_function = make_retryable(mock_with_exception)
+
+        with pytest.raises(AttributeError) as exc_info:
+            decorated_function()
+
+        # The budget allowed 2 retries, the third was refused
+        call_count = 3
+        assert mock_with_exception.call_count == call_count
+        assert exc_info.value.retry_count == call_count  # type: ignore because retry_count is set dynamically
+        assert budget.metrics["requests"] == 1
+        assert budget.metrics["rejected"] == 1
+
+    def with_shared_budget_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[AttributeError, None, AttributeError, AttributeError])
+
+        budget = RetryBudget(ratio=0, min_retries=1)
+        make_retryable = retryable(exceptions=(AttributeError,), backoff=FixedBackoff(0), budget=budget)
+        first_function = make_retryable(mock_with_exception)
+        second_function = make_retryable(mock_with_exception)
+
+        first_function()
+        # The only retry of the budget was used by the first function
+        with pytest.raises(AttributeError):
+            second_function()
+
+    def with_stats_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, None, KeyError, AttributeError])
+
+        make_retryable = retryable(max_retries=1, exceptions=(KeyError, AttributeError), backoff=FixedBackoff(0.01))
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+        with pytest.raises(AttributeError):
+            decorated_function()
+
+        stats = decorated_function.retry_stats.as_dict()  # type: ignore because retry_stats is set dynamically
+
+        assert stats["calls"] == 2
+        assert stats["attempts"] == 4
+        assert stats["successes"] == 1
+        assert stats["successes_after_retry"] == 1
+        assert stats["give_ups"] == 1
+        assert math.isclose(stats["time_slept"], 0.02)  # type: ignore because time_slept is a float
+        assert stats["exceptions"] == {"KeyError": 2, "AttributeError": 1}
+
+    def with_stats_not_retryable_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, AttributeError, KeyError("raise")])
+        events: list[RetryEvent] = []
+
+        make_retryable = retryable(
+            exceptions=(KeyError,),
+            retry_if=lambda e: e.args != ("raise",),
+            backoff=FixedBackoff(0),
+            hooks=(events.append,),
+        )
+        decorated_function = make_retryable(mock_with_exception)
+        with pytest.raises(AttributeError):
+            decorated_function()
+        with pytest.raises(KeyError):
+            decorated_function()
+
+        stats = decorated_function.retry_stats.as_dict()  # type: ignore because retry_stats is set dynamically
+
+        assert stats["calls"] == 2
+        assert stats["attempts"] == 3
+        assert stats["give_ups"] == 2
+        assert stats["exceptions"] == {"KeyError": 2, "AttributeError": 1}
+        assert [(event.kind, event.attempt, event.reason) for event in events] == [
+            ("retry", 1, None),
+            ("give_up", 2, "not_retryable"),
+            ("give_up", 1, "not_retryable"),
+        ]
+
+    def with_hooks_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, None, KeyError, KeyError])
+        events: list[RetryEvent] = []
+
+        make_retryable = retryable(
+            max_retries=1,
+            exceptions=(KeyError,),
+            backoff=FixedBackoff(0),
+            hooks=(events.append,),
+        )
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+        with pytest.raises(KeyError):
+            decorated_function()
+
+        assert [(event.kind, event.attempt) for event in events] == [
+            ("retry", 1),
+            ("success", 2),
+            ("retry", 1),
+            ("give_up", 2),
+        ]
+        assert isinstance(events[0].exception, KeyError)
+        assert events[1].exception is None
+        assert events[3].reason == "max_retries"
+
+    def with_failing_hook_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, None])
+        failing_hook = Mock(side_effect=RuntimeError)
+
+        make_retryable = retryable(exceptions=(KeyError,), backoff=FixedBackoff(0), hooks=(failing_hook,))
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+
+        assert failing_hook.call_count == 2
+        assert mock_with_exception.call_count == 2
+
+    def with_retry_if_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError("retry"), KeyError("raise")])
+
+        make_retryable = retryable(retry_if=lambda e: e.args == ("retry",), backoff=FixedBackoff(0))
+        decorated_function = make_retryable(mock_with_exception)
+
+        with pytest.raises(KeyError, match="raise"):
+            decorated_function()
+
+        assert mock_with_exception.call_count == 2
+
+    def with_retry_if_and_exceptions_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, ValueError])
+
+        make_retryable = retryable(exceptions=(ValueError,), retry_if=lambda _: True, backoff=FixedBackoff(0))
+        decorated_function = make_retryable(mock_with_exception)
+
+        # Only the given exception types are matched against the predicate
+        with pytest.raises(KeyError):
+            decorated_function()
+
+        assert mock_with_exception.call_count == 1
+
+    def with_retry_on_result_test(self) -> None:
+        mock_with_result = Mock(side_effect=[503, 503, 200])
+
+        make_retryable = retryable(retry_on_result=lambda status: status == 503, backoff=FixedBackoff(0))
+        decorated_function = make_retryable(mock_with_result)
+
+        assert decorated_function() == 200
+        assert mock_with_result.call_count == 3
+        assert decorated_function.retry_stats.exceptions == {"RejectedResult": 2}  # type: ignore because retry_stats is set dynamically
+
+    def with_retry_on_result_max_retries_test(self) -> None:
+        mock_with_result = Mock(side_effect=[[], [], []])
+        events: list[RetryEvent] = []
+
+        make_retryable = retryable(
+            max_retries=1,
+            retry_on_result=lambda page: not page,
+            backoff=FixedBackoff(0),
+            hooks=(events.append,),
+        )
+        decorated_function = make_retryable(mock_with_result)
+
+        # The last result is returned once giving up
+        assert decorated_function() == []
+        assert mock_with_result.call_count == 2
+        assert events[-1].kind == "give_up"
+        assert isinstance(events[-1].exception, RejectedResult)
+
+    def with_retry_after_test(self) -> None:
+        error = KeyError()
+        error.retry_after = 0.2  # type: ignore because retry_after is set dynamically
+        mock_with_exception = Mock(side_effect=[error, 0.1, None])
+
+        before = time.time()
+
+        make_retryable = retryable(
+            exceptions=(KeyError,),
+            retry_on_result=lambda result: result is not None,
+            retry_after=lambda subject: getattr(subject, "retry_after", subject),
+            backoff=FixedBackoff(10),
+        )
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+
+        after = time.time() - before
+
+        # 0.2s for the exception, and 0.1s for the result, instead of 10s each
+        assert math.isclose(after, 0.3, rel_tol=0.5)
+
+    def with_retry_after_none_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, None])
+
+        before = time.time()
+
+        make_retryable = retryable(exceptions=(KeyError,), retry_after=lambda _: None, backoff=FixedBackoff(0.1))
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+
+        after = time.time() - before
+
+        # Falls back on the computed delay
+        assert math.isclose(after, 0.1, rel_tol=0.5)
+
+    def with_retry_after_deadline_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, None])
+
+        make_retryable = retryable(
+            exceptions=(KeyError,),
+            retry_after=lambda _: 60,
+            deadline=1,
+            backoff=FixedBackoff(0),
+        )
+        decorated_function = make_retryable(mock_with_exception)
+
+        # Gives up right away instead of retrying after the deadline
+        with pytest.raises(KeyError):
+            decorated_function()
+
+    def with_retry_after_plateau_test(self) -> None:
+        error = KeyError()
+        error.retry_after = 0.05  # type: ignore because retry_after is set dynamically
+        mock_with_exception = Mock(side_effect=[error, KeyError, KeyError, None])
+        delays = []
+
+        make_retryable = retryable(
+            plateau_after=1,
+            exceptions=(KeyError,),
+            retry_after=lambda subject: getattr(subject, "retry_after", None),
+            backoff=FixedBackoff(0.01),
+            hooks=(lambda event: delays.append(event.delay) if event.kind == "retry" else None,),
+        )
+        decorated_function = make_retryable(mock_with_exception)
+        decorated_function()
+
+        # The delay provided only overrides the retry it was provided for
+        assert delays == [0.05, 0.01, 0.01]
+
+    def async_without_exception_test(self) -> None:
+        async def dummy_coroutine() -> int:
+            return 1
+
+        decorated_function = retryable()(dummy_coroutine)
+
+        assert inspect.iscoroutinefunction(decorated_function)
+        assert asyncio.run(decorated_function()) == 1
+
+    def async_with_exception_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[Exception, Exception, None])
+
+        async def dummy_coroutine() -> None:
+            mock_with_exception()
+
+        before = time.time()
+
+        make_retryable = retryable(exceptions=(Exception,), backoff=FixedBackoff(0.1))
+        decorated_function = make_retryable(dummy_coroutine)
+        asyncio.run(decorated_function())
+
+        after = time.time() - before
+
+        assert mock_with_exception.call_count == 3
+        assert math.isclose(after, 0.2, rel_tol=0.5)
+
+    def async_with_max_retries_test(self) -> None:
+        async def dummy_coroutine() -> None:
+            raise AttributeError
+
+        make_retryable = retryable(max_retries=1, exceptions=(AttributeError,), backoff=FixedBackoff(0))
+        decorated_function = make_retryable(dummy_coroutine)
+
+        with pytest.raises(AttributeError):
+            asyncio.run(decorated_function())
+
+    def async_with_stats_test(self) -> None:
+        mock_with_exception = Mock(side_effect=[KeyError, None])
+
+        async def dummy_coroutine() -> None:
+            mock_with_exception()
+
+        decorated_function = retryable(exceptions=(KeyError,), backoff=FixedBackoff(0))(dummy_coroutine)
+        asyncio.run(decorated_function())
+
+        assert decorated_function.retry_stats.successes_after_retry == 1  # type: ignore because retry_stats is set dynamically
+
+    def async_with_retry_on_result_test(self) -> None:
+        mock_with_result = Mock(side_effect=[None, 1])
+
+        async def dummy_coroutine() -> int | None:
+            return mock_with_result()
+
+        decorated_function = retryable(retry_on_result=lambda result: result is None, backoff=FixedBackoff(0))(
+            dummy_coroutine,
+        )
+
+        assert asyncio.run(decorated_function()) == 1
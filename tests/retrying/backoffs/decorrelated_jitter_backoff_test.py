@@ -0,0 +1,21 @@
+from flashback.retrying import DecorrelatedJitterBackoff
+
+
+class DecorrelatedJitterBackoffTest:
+    def delay_test(self) -> None:
+        backoff = DecorrelatedJitterBackoff(base=1, cap=60)
+
+        delays = [backoff.delay(1, 0.0) for _ in range(100)]
+
+        assert all(1 <= delay <= 3 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def previous_delay_test(self) -> None:
+        backoff = DecorrelatedJitterBackoff(base=1, cap=60)
+
+        assert all(1 <= backoff.delay(2, 10.0) <= 30 for _ in range(100))
+
+    def cap_test(self) -> None:
+        backoff = DecorrelatedJitterBackoff(base=1, cap=10)
+
+        assert all(backoff.delay(2, 100.0) <= 10 for _ in range(100))
@@ -0,0 +1,10 @@
+from flashback.retrying import ExponentialBackoff
+
+
+class ExponentialBackoffTest:
+    def delay_test(self) -> None:
+        backoff = ExponentialBackoff()
+
+        delays = [backoff.delay(attempt, 0.0) for attempt in range(1, 10)]
+
+        assert delays == [0.15, 0.70, 1.65, 3.30, 6.15, 11.09, 19.63, 34.41, 60.0]
@@ -0,0 +1,20 @@
+import math
+
+from flashback.retrying import FibonacciBackoff
+
+
+class FibonacciBackoffTest:
+    def delay_test(self) -> None:
+        backoff = FibonacciBackoff()
+
+        delays = [backoff.delay(attempt, 0.0) for attempt in range(1, 11)]
+
+        expected = [0.1, 0.1, 0.2, 0.3, 0.5, 0.8, 1.3, 2.1, 3.4, 5.5]
+        assert all(math.isclose(delay, value) for delay, value in zip(delays, expected))
+
+    def cap_test(self) -> None:
+        backoff = FibonacciBackoff(base=1, cap=10)
+
+        assert backoff.delay(6, 0.0) == 8
+        assert backoff.delay(7, 0.0) == 10
+        assert backoff.delay(10_000, 0.0) == 10
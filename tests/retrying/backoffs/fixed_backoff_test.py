@@ -0,0 +1,15 @@
+from flashback.retrying import FixedBackoff
+
+
+class FixedBackoffTest:
+    def delay_test(self) -> None:
+        backoff = FixedBackoff()
+
+        assert {backoff.delay(attempt, 0.0) for attempt in range(1, 10)} == {1.0}
+
+    def custom_delay_test(self) -> None:
+        delay = 0.5
+        backoff = FixedBackoff(delay)
+
+        assert backoff.delay(1, 0.0) == delay
+        assert backoff.delay(10, delay) == delay
@@ -0,0 +1,18 @@
+from flashback.retrying import FullJitterBackoff
+
+
+class FullJitterBackoffTest:
+    def delay_test(self) -> None:
+        backoff = FullJitterBackoff(base=1, cap=60)
+
+        for attempt in range(1, 8):
+            delays = [backoff.delay(attempt, 0.0) for _ in range(100)]
+
+            assert all(0 <= delay <= 2 ** (attempt - 1) for delay in delays)
+            # Jittered, so not all the same
+            assert len(set(delays)) > 1
+
+    def cap_test(self) -> None:
+        backoff = FullJitterBackoff(base=1, cap=10)
+
+        assert all(backoff.delay(10_000, 0.0) <= 10 for _ in range(100))
@@ -0,0 +1,95 @@
+from threading import Thread
+from unittest.mock import patch
+
+import pytest
+
+from flashback.retrying import RetryBudget
+
+
+class RetryBudgetTest:
+    def min_retries_test(self) -> None:
+        min_retries = 3
+        budget = RetryBudget(ratio=0.1, min_retries=min_retries)
+
+        assert [budget.acquire() for _ in range(min_retries + 1)] == [True] * min_retries + [False]
+
+    def ratio_test(self) -> None:
+        allowed_retries = 5
+        budget = RetryBudget(ratio=0.1, min_retries=0)
+
+        for _ in range(50):
+            budget.record_request()
+
+        assert budget.available == allowed_retries
+        assert [budget.acquire() for _ in range(allowed_retries + 1)] == [True] * allowed_retries + [False]
+
+    def window_test(self) -> None:
+        budget = RetryBudget(ratio=0.1, window=10, min_retries=0)
+
+        with patch("flashback.retrying.retry_budget.time.monotonic", return_value=100.0):
+            for _ in range(10):
+                budget.record_request()
+
+            assert budget.acquire()
+            assert not budget.acquire()
+
+        # Half a window later, the requests still count
+        with patch("flashback.retrying.retry_budget.time.monotonic", return_value=105.0):
+            assert not budget.acquire()
+
+        # A full window later, the requests and retries are forgotten
+        with patch("flashback.retrying.retry_budget.time.monotonic", return_value=110.0):
+            assert budget.available == 0
+
+            for _ in range(10):
+                budget.record_request()
+
+            assert budget.acquire()
+
+    def metrics_test(self) -> None:
+        budget = RetryBudget(ratio=0.5, min_retries=0)
+
+        for _ in range(4):
+            budget.record_request()
+        for _ in range(3):
+            budget.acquire()
+
+        assert budget.metrics == {
+            "requests": 4,
+            "retries": 2,
+            "rejected": 1,
+            "window_requests": 4,
+            "window_retries": 2,
+            "available": 0,
+        }
+
+    @pytest.mark.parametrize(
+        ("kwargs", "name"),
+        [
+            ({"ratio": -1}, "ratio"),
+            ({"window": 0}, "window"),
+            ({"min_retries": -1}, "min_retries"),
+            ({"slots": 0}, "slots"),
+        ],
+    )
+    def invalid_parameters_test(self, kwargs: dict[str, float], name: str) -> None:
+        with pytest.raises(ValueError, match=f"invalid {name}"):
+            RetryBudget(**kwargs)  # type: ignore because kwargs mixes ints and floats
+
+    def concurrent_access_test(self) -> None:
+        thread_count = 8
+        min_retries = 100
+        budget = RetryBudget(ratio=0, min_retries=min_retries)
+        acquired = []
+
+        def acquire() -> None:
+            acquired.extend(budget.acquire() for _ in range(50))
+
+        threads = [Thread(target=acquire) for _ in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert acquired.count(True) == min_retries
+        assert budget.metrics["rejected"] == thread_count * 50 - min_retries
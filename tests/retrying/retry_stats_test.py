@@ -0,0 +1,40 @@
+from flashback.retrying import RetryStats
+
+
+class RetryStatsTest:
+    def record_test(self) -> None:
+        stats = RetryStats()
+
+        stats.record_success(1)
+        stats.record_retry(KeyError(), 0.5)
+        stats.record_success(2)
+        stats.record_retry(KeyError(), 0.5)
+        stats.record_retry(ValueError(), 1.0)
+        stats.record_give_up(ValueError(), 3)
+
+        assert stats.as_dict() == {
+            "calls": 3,
+            "attempts": 6,
+            "successes": 2,
+            "successes_after_retry": 1,
+            "give_ups": 1,
+            "time_slept": 2.0,
+            "exceptions": {"KeyError": 2, "ValueError": 2},
+        }
+
+    def reset_test(self) -> None:
+        stats = RetryStats()
+
+        stats.record_retry(KeyError(), 0.5)
+        stats.record_success(2)
+        stats.reset()
+
+        assert stats.as_dict() == {
+            "calls": 0,
+            "attempts": 0,
+            "successes": 0,
+            "successes_after_retry": 0,
+            "give_ups": 0,
+            "time_slept": 0.0,
+            "exceptions": {},
+        }
@@ -1,9 +1,12 @@
+import asyncio
+from threading import Thread
+from unittest.mock import Mock, patch
 import time
-from unittest.mock import Mock
 
 import pytest
 
-from flashback import sampled
+from flashback import deadline, sampled
+from flashback.caching import Cache
 
 
 def dummy_func(spy) -> None:
@@ -93,3 +96,434 @@ class SampledTest:
     def ratelimiting_strategy_invalid_rate_test(self) -> None:
         with pytest.raises(ValueError, match="invalid rate"):
             sampled(strategy="ratelimiting", rate=-1)
+
+    @pytest.mark.parametrize("strategy", ["tokenbucket", "leakybucket", "slidingwindow"])
+    def rate_strategies_invalid_rate_test(self, strategy: str) -> None:
+        with pytest.raises(ValueError, match="invalid rate"):
+            sampled(strategy=strategy, rate=0)
+
+    def tokenbucket_strategy_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="tokenbucket", rate=5)
+            decorated_func = make_sampled(dummy_func)
+
+            # Bursts up to a second of requests
+            for _ in range(10):
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 5
+
+            # Refills a token every 0.2s
+            mock_monotonic.return_value = 100.5
+            for _ in range(10):
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 7
+
+    def tokenbucket_strategy_fractional_rate_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="tokenbucket", rate=0.5)
+            decorated_func = make_sampled(dummy_func)
+
+            decorated_func(spy_func)
+            mock_monotonic.return_value = 101.5
+            decorated_func(spy_func)
+
+            assert spy_func.call_count == 1
+
+            mock_monotonic.return_value = 102.0
+            decorated_func(spy_func)
+
+            assert spy_func.call_count == 2
+
+    def leakybucket_strategy_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="leakybucket", rate=5)
+            decorated_func = make_sampled(dummy_func)
+
+            # Does not burst
+            for _ in range(10):
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 1
+
+            # Accepts a request every 0.2s
+            for timestamp in (100.1, 100.2, 100.3, 100.4):
+                mock_monotonic.return_value = timestamp
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 3
+
+    def slidingwindow_strategy_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.5) as mock_monotonic:
+            make_sampled = sampled(strategy="slidingwindow", rate=10)
+            decorated_func = make_sampled(dummy_func)
+
+            for _ in range(20):
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 10
+
+            # Does not burst at the second boundary
+            mock_monotonic.return_value = 101.25
+            for _ in range(20):
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 10
+
+            # Accepts requests again once they leave the window
+            mock_monotonic.return_value = 101.5
+            for _ in range(20):
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 20
+
+    def slidingwindow_strategy_fractional_rate_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="slidingwindow", rate=0.5)
+            decorated_func = make_sampled(dummy_func)
+
+            for timestamp in (100.0, 100.5, 101.0, 101.5, 102.0, 103.0, 104.0):
+                mock_monotonic.return_value = timestamp
+                decorated_func(spy_func)
+
+            # A request every two seconds: at 100s, 102s and 104s
+            assert spy_func.call_count == 3
+
+    @pytest.mark.parametrize("strategy", ["tokenbucket", "leakybucket", "slidingwindow"])
+    def rate_strategies_concurrent_access_test(self, strategy: str) -> None:
+        rate = 100
+        make_sampled = sampled(strategy=strategy, rate=rate)
+        accepted = []
+
+        def sample() -> None:
+            accepted.extend(make_sampled.should_sample() for _ in range(1000))
+
+        threads = [Thread(target=sample) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Allows for a few refills while the threads run
+        assert 1 <= accepted.count(True) <= rate * 2
+
+    def distributed_strategy_test(self, spy_func: Mock) -> None:
+        cache = Cache()
+
+        make_sampled = sampled(strategy="distributed", rate=5, cache=cache, key="a")
+        decorated_func = make_sampled(dummy_func)
+
+        for _ in range(10):
+            decorated_func(spy_func)
+
+        assert spy_func.call_count == 5
+
+    def distributed_strategy_shared_test(self, spy_func: Mock) -> None:
+        cache = Cache()
+
+        # Stands for the same callable decorated in two processes
+        first_func = sampled(strategy="distributed", rate=5, cache=cache, key="a")(dummy_func)
+        second_func = sampled(strategy="distributed", rate=5, cache=cache, key="a")(dummy_func)
+
+        for _ in range(5):
+            first_func(spy_func)
+            second_func(spy_func)
+
+        assert spy_func.call_count == 5
+
+    def distributed_strategy_default_key_test(self) -> None:
+        cache = Mock(acquire=Mock(return_value=1))
+
+        sampled(strategy="distributed", cache=cache)(dummy_func)(Mock())
+
+        assert cache.acquire.call_args.args[0] == "flashback:sampled:tests.sampled_test.dummy_func"
+
+    def distributed_strategy_prefetch_test(self, spy_func: Mock) -> None:
+        cache = Cache()
+        cache.acquire = Mock(wraps=cache.acquire)
+
+        make_sampled = sampled(strategy="distributed", rate=10, cache=cache, key="a", prefetch=5)
+        decorated_func = make_sampled(dummy_func)
+
+        for _ in range(20):
+            decorated_func(spy_func)
+
+        assert spy_func.call_count == 10
+        # 2 round trips taking 5 tokens each, and 1 refused, refusing the next calls locally
+        assert cache.acquire.call_count == 3
+
+    def distributed_strategy_default_prefetch_test(self) -> None:
+        cache = Mock(acquire=Mock(return_value=1))
+
+        sampled(strategy="distributed", rate=5, cache=cache)(dummy_func)(Mock())
+        sampled(strategy="distributed", rate=50, cache=cache)(dummy_func)(Mock())
+        sampled(strategy="distributed", rate=5000, cache=cache)(dummy_func)(Mock())
+
+        assert [call.args[1] for call in cache.acquire.call_args_list] == [5, 10, 50]
+
+    def distributed_strategy_empty_test(self, spy_func: Mock) -> None:
+        cache = Mock(acquire=Mock(return_value=0))
+
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="distributed", rate=10, cache=cache)
+            decorated_func = make_sampled(dummy_func)
+
+            decorated_func(spy_func)
+            decorated_func(spy_func)
+
+            assert cache.acquire.call_count == 1
+
+            # The bucket is refilled with a token after 1 / rate seconds
+            mock_monotonic.return_value = 100.1
+            decorated_func(spy_func)
+
+            assert cache.acquire.call_count == 2
+            assert spy_func.call_count == 0
+
+    def distributed_strategy_prefetch_expired_test(self, spy_func: Mock) -> None:
+        cache = Mock(acquire=Mock(return_value=5))
+
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="distributed", rate=10, cache=cache, prefetch=5)
+            decorated_func = make_sampled(dummy_func)
+
+            decorated_func(spy_func)
+            decorated_func(spy_func)
+
+            assert cache.acquire.call_count == 1
+
+            # The prefetched tokens are dropped after a second
+            mock_monotonic.return_value = 101.0
+            decorated_func(spy_func)
+
+            assert cache.acquire.call_count == 2
+
+    def distributed_strategy_unreachable_test(self, spy_func: Mock) -> None:
+        cache = Mock(acquire=Mock(return_value=None))
+
+        make_sampled = sampled(strategy="distributed", rate=5, cache=cache)
+        decorated_func = make_sampled(dummy_func)
+
+        for _ in range(10):
+            decorated_func(spy_func)
+
+        # Falls back on a limit per process
+        assert spy_func.call_count == 5
+
+    def distributed_strategy_invalid_cache_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid cache"):
+            sampled(strategy="distributed")
+
+    def distributed_strategy_invalid_prefetch_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid prefetch"):
+            sampled(strategy="distributed", cache=Cache(), prefetch=0)
+
+    def adaptive_strategy_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="adaptive", rate=10)
+            decorated_func = make_sampled(dummy_func)
+
+            # Accepts everything until the request rate is observed
+            for _ in range(100):
+                decorated_func(spy_func)
+
+            assert spy_func.call_count == 100
+
+            mock_monotonic.return_value = 101.0
+            decorated_func(spy_func)
+
+            assert make_sampled.probabilities == {None: pytest.approx(10 / 101)}
+
+    def adaptive_strategy_sampling_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="adaptive", rate=10)
+            decorated_func = make_sampled(dummy_func)
+
+            for second in range(1, 6):
+                for _ in range(1000):
+                    decorated_func(spy_func)
+
+                mock_monotonic.return_value = 100.0 + second
+
+            spy_func.reset_mock()
+            for _ in range(1000):
+                decorated_func(spy_func)
+
+        assert 0 < spy_func.call_count < 30
+
+    def adaptive_strategy_low_traffic_test(self, spy_func: Mock) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="adaptive", rate=10)
+            decorated_func = make_sampled(dummy_func)
+
+            for second in range(1, 4):
+                for _ in range(5):
+                    decorated_func(spy_func)
+
+                mock_monotonic.return_value = 100.0 + second
+
+        assert spy_func.call_count == 15
+        assert make_sampled.probabilities == {None: 1.0}
+
+    def adaptive_strategy_smoothing_test(self) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="adaptive", rate=10)
+
+            for _ in range(99):
+                make_sampled.should_sample()
+            mock_monotonic.return_value = 101.0
+            make_sampled.should_sample()
+
+            for _ in range(299):
+                make_sampled.should_sample()
+            mock_monotonic.return_value = 102.0
+            make_sampled.should_sample()
+
+        # Half the last second (300), half the previous rate (100)
+        assert make_sampled.probabilities == {None: pytest.approx(10 / 200)}
+
+    def adaptive_strategy_key_func_test(self) -> None:
+        with patch("flashback.sampled.time.monotonic", return_value=100.0) as mock_monotonic:
+            make_sampled = sampled(strategy="adaptive", rate=10, key_func=lambda path: path)
+            decorated_func = make_sampled(lambda path: path)
+
+            for _ in range(100):
+                decorated_func("/users")
+            for _ in range(5):
+                decorated_func("/health")
+
+            mock_monotonic.return_value = 101.0
+            decorated_func("/users")
+            decorated_func("/health")
+
+        assert make_sampled.probabilities == {"/users": pytest.approx(10 / 101), "/health": 1.0}
+
+    def adaptive_strategy_max_keys_test(self) -> None:
+        make_sampled = sampled(strategy="adaptive", key_func=lambda key: key)
+        make_sampled.ADAPTIVE_MAX_KEYS = 2
+        decorated_func = make_sampled(lambda key: key)
+
+        for key in ("a", "b", "c", "d"):
+            decorated_func(key)
+
+        # The keys over the limit share a probability
+        assert set(make_sampled.probabilities) == {"a", "b", None}
+
+    def adaptive_strategy_invalid_rate_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid rate"):
+            sampled(strategy="adaptive", rate=0)
+
+    def invalid_key_func_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid key_func"):
+            sampled(strategy="tokenbucket", key_func=lambda key: key)
+
+    def wait_mode_test(self, spy_func: Mock) -> None:
+        make_sampled = sampled(strategy="leakybucket", rate=20, mode="wait")
+        decorated_func = make_sampled(dummy_func)
+
+        started_at = time.monotonic()
+        for _ in range(3):
+            decorated_func(spy_func)
+
+        assert spy_func.call_count == 3
+        assert time.monotonic() - started_at >= 0.09  # noqa: PLR2004
+
+    @pytest.mark.parametrize("strategy", ["ratelimiting", "tokenbucket", "leakybucket", "slidingwindow"])
+    def wait_mode_strategies_test(self, strategy: str) -> None:
+        with patch("flashback.sampled.time.sleep") as mock_sleep:
+            decorated_func = sampled(strategy=strategy, rate=1, mode="wait", max_wait=0.5)(dummy_func)
+
+            decorated_func(Mock())
+            decorated_func(Mock())
+
+        # Waits for the estimated time before the next call is accepted, within max_wait
+        assert 0 < mock_sleep.call_args_list[0].args[0] <= 0.5  # noqa: PLR2004
+
+    def wait_mode_max_wait_test(self, spy_func: Mock) -> None:
+        make_sampled = sampled(strategy="leakybucket", rate=1, mode="wait", max_wait=0.05)
+        decorated_func = make_sampled(dummy_func)
+
+        decorated_func(spy_func)
+        started_at = time.monotonic()
+        result = decorated_func(spy_func)
+
+        assert result is None
+        assert spy_func.call_count == 1
+        assert 0.04 <= time.monotonic() - started_at < 0.5  # noqa: PLR2004
+
+    def wait_mode_distributed_test(self, spy_func: Mock) -> None:
+        cache = Mock(acquire=Mock(side_effect=[10, 0, 0, 1]))
+        now = [100.0]
+
+        def _sleep(delay: float) -> None:
+            now[0] += delay
+
+        with (
+            patch("flashback.sampled.time.monotonic", side_effect=lambda: now[0]),
+            patch("flashback.sampled.time.sleep", side_effect=_sleep) as mock_sleep,
+        ):
+            decorated_func = sampled(strategy="distributed", rate=10, cache=cache, mode="wait")(dummy_func)
+
+            decorated_func(spy_func)
+            # The prefetched tokens are dropped after a second
+            now[0] += 1
+            decorated_func(spy_func)
+
+        assert spy_func.call_count == 2
+        # Waits for the bucket to be refilled between the round trips
+        assert mock_sleep.call_count == 2
+        assert cache.acquire.call_count == 4
+
+    def wait_mode_invalid_strategy_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid mode"):
+            sampled(strategy="probabilistic", mode="wait")
+
+    def invalid_mode_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid mode"):
+            sampled(strategy="tokenbucket", mode="queue")
+
+    def invalid_max_wait_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid max_wait"):
+            sampled(strategy="tokenbucket", mode="wait", max_wait=-1)
+
+    def async_test(self, spy_func: Mock) -> None:
+        @sampled(strategy="tokenbucket", rate=2)
+        async def decorated_func() -> str:
+            spy_func()
+
+            return "result"
+
+        async def run() -> list[str | None]:
+            return [await decorated_func() for _ in range(3)]
+
+        assert asyncio.run(run()) == ["result", "result", None]
+        assert spy_func.call_count == 2
+
+    def async_wait_mode_test(self, spy_func: Mock) -> None:
+        @sampled(strategy="leakybucket", rate=20, mode="wait")
+        async def decorated_func() -> None:
+            spy_func()
+
+        async def run() -> None:
+            await asyncio.gather(*(decorated_func() for _ in range(3)))
+
+        started_at = time.monotonic()
+        asyncio.run(run())
+
+        assert spy_func.call_count == 3
+        assert time.monotonic() - started_at >= 0.09  # noqa: PLR2004
+
+    def wait_mode_deadline_test(self, spy_func: Mock) -> None:
+        make_sampled = sampled(strategy="leakybucket", rate=1, mode="wait")
+        decorated_func = make_sampled(dummy_func)
+
+        decorated_func(spy_func)
+        started_at = time.monotonic()
+        with deadline(0.05):
+            result = decorated_func(spy_func)
+
+        # Stops waiting at the deadline
+        assert result is None
+        assert spy_func.call_count == 1
+        assert time.monotonic() - started_at < 0.5  # noqa: PLR2004
@@ -1,7 +1,13 @@
+from collections.abc import AsyncGenerator, Generator, Sequence
+from unittest.mock import Mock, patch
+import asyncio
+import logging
 import time
-from unittest.mock import Mock
+
+import pytest
 
 from flashback import timed
+from flashback.timing import BaseSpanExporter, Span, current_span
 
 
 def dummy_func(spy) -> None:
@@ -9,6 +15,23 @@ def dummy_func(spy) -> None:
     time.sleep(1)
 
 
+def fast_func(spy) -> None:
+    spy()
+
+
+class DummyExporter(BaseSpanExporter):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.spans: list[Span] = []
+
+    def emit(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        pass
+
+
 class TimedTest:
     def execution_test(self) -> None:
         spy_func = Mock()
@@ -17,3 +40,233 @@ class TimedTest:
         decorated_func(spy_func)
 
         assert spy_func.called
+
+    def log_mode_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        decorated_func = timed()(fast_func)
+
+        with caplog.at_level(logging.INFO):
+            decorated_func(Mock())
+
+        assert caplog.messages[0] == "Started execution of fast_func"
+        assert caplog.messages[1].startswith("Completed execution of fast_func after ")
+
+    def sample_rate_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        spy_func = Mock()
+        decorated_func = timed(sample_rate=0)(fast_func)
+
+        with caplog.at_level(logging.INFO):
+            decorated_func(spy_func)
+
+        assert spy_func.called
+        assert not caplog.messages
+
+    def histogram_mode_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        decorated_func = timed(mode="histogram")(fast_func)
+
+        with caplog.at_level(logging.INFO):
+            for _ in range(10):
+                decorated_func(Mock())
+
+        assert decorated_func.histogram.count == 10  # type: ignore because histogram is set dynamically
+        assert not caplog.messages
+
+    def histogram_mode_sample_rate_test(self) -> None:
+        decorated_func = timed(mode="histogram", sample_rate=0.5)(fast_func)
+
+        with patch("flashback.timed.random.random", side_effect=[0.1, 0.9, 0.2, 0.8]):
+            for _ in range(4):
+                decorated_func(Mock())
+
+        assert decorated_func.histogram.count == 2  # type: ignore because histogram is set dynamically
+
+    def histogram_mode_exception_test(self) -> None:
+        decorated_func = timed(mode="histogram")(fast_func)
+
+        with pytest.raises(KeyError):
+            decorated_func(Mock(side_effect=KeyError))
+
+        assert decorated_func.histogram.count == 1  # type: ignore because histogram is set dynamically
+
+    def histogram_mode_summary_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        decorated_func = timed(mode="histogram", interval=0.05)(fast_func)
+
+        with caplog.at_level(logging.INFO):
+            for _ in range(3):
+                decorated_func(Mock())
+
+            time.sleep(0.06)
+            decorated_func(Mock())
+
+        assert len(caplog.messages) == 1
+        assert caplog.messages[0].startswith("Timed 4 executions of fast_func in the last 0.05s: mean=")
+        # The histogram is reset after each summary
+        assert decorated_func.histogram.count == 0  # type: ignore because histogram is set dynamically
+
+    def invalid_mode_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid mode"):
+            timed(mode="invalid")
+
+    def invalid_sample_rate_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid sample_rate"):
+            timed(sample_rate=2)
+
+    def invalid_interval_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid interval"):
+            timed(interval=0)
+
+    def coroutine_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        @timed
+        async def decorated_func() -> str:
+            await asyncio.sleep(0.1)
+
+            return "result"
+
+        with caplog.at_level(logging.INFO):
+            assert asyncio.run(decorated_func()) == "result"
+
+        assert caplog.messages[0] == "Started execution of decorated_func"
+        assert caplog.messages[1].startswith("Completed execution of decorated_func after 0.1")
+
+    def coroutine_cpu_time_test(self) -> None:
+        @timed(mode="histogram")
+        async def decorated_func() -> None:
+            await asyncio.sleep(0.1)
+
+        asyncio.run(decorated_func())
+
+        # The await is measured in the wall time, but not in the time on CPU
+        assert decorated_func.histogram.max >= 100_000_000  # type: ignore because histogram is set dynamically
+        assert decorated_func.cpu_histogram.max < 50_000_000  # type: ignore because cpu_histogram is set dynamically
+
+    def generator_test(self) -> None:
+        @timed(mode="histogram")
+        def decorated_func() -> Generator[int]:
+            yield 1
+            yield 2
+
+        items = []
+        for item in decorated_func():
+            items.append(item)
+            time.sleep(0.05)
+
+        assert items == [1, 2]
+        assert decorated_func.histogram.count == 1  # type: ignore because histogram is set dynamically
+        # The time spent by the consumer is not measured on CPU
+        assert decorated_func.histogram.max >= 100_000_000  # type: ignore because histogram is set dynamically
+        assert decorated_func.cpu_histogram.max < 50_000_000  # type: ignore because cpu_histogram is set dynamically
+
+    def async_generator_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        @timed
+        async def decorated_func() -> AsyncGenerator[int]:
+            yield 1
+            await asyncio.sleep(0.01)
+            yield 2
+
+        async def run() -> list[int]:
+            return [item async for item in decorated_func()]
+
+        with caplog.at_level(logging.INFO):
+            assert asyncio.run(run()) == [1, 2]
+
+        assert len(caplog.messages) == 2
+        assert caplog.messages[1].startswith("Completed execution of decorated_func")
+
+    def coroutine_sample_rate_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        @timed(sample_rate=0)
+        async def decorated_func() -> str:
+            return "result"
+
+        with caplog.at_level(logging.INFO):
+            assert asyncio.run(decorated_func()) == "result"
+
+        assert not caplog.messages
+
+    def span_mode_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        exporter = DummyExporter()
+        decorated_func = timed(mode="span", exporter=exporter)(fast_func)
+
+        with caplog.at_level(logging.INFO):
+            decorated_func(Mock())
+
+        (span,) = exporter.spans
+        assert span.name == "fast_func"
+        assert span.duration > 0
+        assert span.error is None
+        assert span.attributes["code.namespace"] == "tests.timed_test"
+        assert not caplog.messages
+
+    def span_mode_parent_test(self) -> None:
+        exporter = DummyExporter()
+
+        @timed(mode="span", exporter=exporter)
+        def child_func() -> Span | None:
+            return current_span()
+
+        @timed(mode="span", exporter=exporter)
+        def parent_func() -> Span | None:
+            child_func()
+
+            return current_span()
+
+        parent = parent_func()
+
+        child, parent_span = exporter.spans
+        assert parent is parent_span
+        assert child.parent_id == parent_span.span_id
+        assert child.trace_id == parent_span.trace_id
+        assert current_span() is None
+
+    def span_mode_coroutine_parent_test(self) -> None:
+        exporter = DummyExporter()
+
+        @timed(mode="span", exporter=exporter)
+        async def child_func() -> None:
+            await asyncio.sleep(0)
+
+        @timed(mode="span", exporter=exporter)
+        async def parent_func() -> None:
+            await asyncio.gather(child_func(), child_func())
+
+        asyncio.run(parent_func())
+
+        first_child, second_child, parent = exporter.spans
+        assert first_child.parent_id == parent.span_id
+        assert second_child.parent_id == parent.span_id
+
+    def span_mode_error_test(self) -> None:
+        exporter = DummyExporter()
+        decorated_func = timed(mode="span", exporter=exporter)(fast_func)
+
+        with pytest.raises(KeyError):
+            decorated_func(Mock(side_effect=KeyError))
+
+        assert isinstance(exporter.spans[0].error, KeyError)
+
+    def span_mode_generator_closed_test(self) -> None:
+        exporter = DummyExporter()
+
+        @timed(mode="span", exporter=exporter)
+        def decorated_func() -> Generator[int]:
+            yield 1
+            yield 2
+
+        generator = decorated_func()
+        next(generator)
+        generator.close()
+
+        # Closing a generator early is not an error
+        assert exporter.spans[0].error is None
+
+    def failed_log_test(self, caplog: pytest.LogCaptureFixture) -> None:
+        decorated_func = timed(fast_func)
+
+        with caplog.at_level(logging.INFO), pytest.raises(KeyError):
+            decorated_func(Mock(side_effect=KeyError))
+
+        assert caplog.messages[1].startswith("Failed execution of fast_func after ")
+
+    def invalid_exporter_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid exporter"):
+            timed(mode="span")
+        with pytest.raises(ValueError, match="invalid exporter"):
+            timed(mode="histogram", exporter=DummyExporter())
@@ -1,9 +1,13 @@
-import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
+import asyncio
+import os
+import signal
+import time
 
 import pytest
 
-from flashback import timeoutable
+from flashback import deadline, remaining_time, timeoutable
 
 
 def dummy_func(spy) -> None:
@@ -11,6 +15,23 @@ def dummy_func(spy) -> None:
     spy()
 
 
+def sleeping_func(seconds: float) -> float:
+    time.sleep(seconds)
+
+    return seconds
+
+
+def raising_func() -> None:
+    raise KeyError("key")
+
+
+@timeoutable(5, backend="process")
+def decorated_sleeping_func(seconds: float) -> float:
+    time.sleep(seconds)
+
+    return seconds
+
+
 class TimeoutableTest:
     def execution_test(self) -> None:
         make_timeoutable = timeoutable(1)
@@ -33,3 +54,198 @@ class TimeoutableTest:
         decorated_func = make_timeoutable(dummy_func)
         with pytest.raises(TimeoutError, match="dummy_func timed out"):
             decorated_func(None)
+
+    def without_seconds_test(self) -> None:
+        decorated_func = timeoutable(0)(sleeping_func)
+
+        assert decorated_func(0.01) == 0.01  # noqa: PLR2004
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+    def without_seconds_deadline_test(self) -> None:
+        decorated_func = timeoutable(0)(sleeping_func)
+
+        # Still times out at the deadline of the execution context
+        with deadline(0.1), pytest.raises(TimeoutError):
+            decorated_func(1)
+
+    def invalid_seconds_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid seconds"):
+            timeoutable(-1)
+
+    def invalid_backend_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid backend"):
+            timeoutable(1, backend="invalid")
+
+    def signal_backend_subsecond_test(self) -> None:
+        decorated_func = timeoutable(0.1, backend="signal")(sleeping_func)
+
+        started_at = time.monotonic()
+        with pytest.raises(TimeoutError):
+            decorated_func(1)
+
+        assert time.monotonic() - started_at < 0.5  # noqa: PLR2004
+
+    def signal_backend_restores_handler_test(self) -> None:
+        handler = Mock()
+        previous_handler = signal.signal(signal.SIGALRM, handler)
+
+        try:
+            timeoutable(1, backend="signal")(sleeping_func)(0.01)
+
+            assert signal.getsignal(signal.SIGALRM) is handler
+        finally:
+            signal.signal(signal.SIGALRM, previous_handler)
+
+    def signal_backend_nested_test(self) -> None:
+        inner_func = timeoutable(1, backend="signal")(sleeping_func)
+
+        @timeoutable(0.2, backend="signal", message="outer timed out")
+        def outer_func() -> None:
+            inner_func(0.1)
+            time.sleep(1)
+
+        with pytest.raises(TimeoutError, match="outer timed out"):
+            outer_func()
+
+    def signal_backend_thread_test(self) -> None:
+        decorated_func = timeoutable(1, backend="signal")(sleeping_func)
+
+        with ThreadPoolExecutor(max_workers=1) as executor, pytest.raises(ValueError, match="main thread"):
+            executor.submit(decorated_func, 0.01).result()
+
+    def thread_backend_test(self) -> None:
+        decorated_func = timeoutable(0.1, backend="thread")(sleeping_func)
+
+        assert decorated_func(0.01) == 0.01  # noqa: PLR2004
+        with pytest.raises(TimeoutError, match="execution timed out"):
+            decorated_func(1)
+
+    def thread_backend_exception_test(self) -> None:
+        decorated_func = timeoutable(1, backend="thread")(raising_func)
+
+        with pytest.raises(KeyError):
+            decorated_func()
+
+    def default_backend_thread_test(self) -> None:
+        decorated_func = timeoutable(0.1)(sleeping_func)
+
+        # Falls back on the thread backend outside of the main thread, with a warning
+        with (
+            ThreadPoolExecutor(max_workers=1) as executor,
+            pytest.warns(RuntimeWarning, match="keeps running in the background"),
+            pytest.raises(TimeoutError),
+        ):
+            executor.submit(decorated_func, 1).result()
+
+    def process_backend_test(self) -> None:
+        decorated_func = timeoutable(5, backend="process")(sleeping_func)
+
+        assert decorated_func(0.01) == 0.01  # noqa: PLR2004
+
+    def process_backend_timeout_test(self) -> None:
+        decorated_func = timeoutable(0.2, backend="process")(sleeping_func)
+
+        started_at = time.monotonic()
+        with pytest.raises(TimeoutError, match="execution timed out"):
+            decorated_func(5)
+
+        assert time.monotonic() - started_at < 2
+
+    def process_backend_decorated_test(self) -> None:
+        # Finds the function from its wrapper, bound to its name
+        assert decorated_sleeping_func(0.01) == 0.01  # noqa: PLR2004
+
+    def process_backend_exception_test(self) -> None:
+        decorated_func = timeoutable(5, backend="process")(raising_func)
+
+        with pytest.raises(KeyError):
+            decorated_func()
+
+    def process_backend_exit_test(self) -> None:
+        decorated_func = timeoutable(5, backend="process")(os._exit)
+
+        with pytest.raises(ChildProcessError, match="exited with code 3"):
+            decorated_func(3)
+
+    def asyncio_backend_test(self) -> None:
+        @timeoutable(0.1)
+        async def decorated_func(seconds: float) -> float:
+            await asyncio.sleep(seconds)
+
+            return seconds
+
+        assert asyncio.run(decorated_func(0.01)) == 0.01  # noqa: PLR2004
+        with pytest.raises(TimeoutError, match="execution timed out"):
+            asyncio.run(decorated_func(1))
+
+    def asyncio_backend_inner_timeout_test(self) -> None:
+        @timeoutable(1)
+        async def decorated_func() -> None:
+            raise TimeoutError("inner")
+
+        with pytest.raises(TimeoutError, match="inner"):
+            asyncio.run(decorated_func())
+
+    def asyncio_backend_invalid_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid backend"):
+            timeoutable(1, backend="asyncio")(sleeping_func)
+
+    def coroutine_invalid_backend_test(self) -> None:
+        async def coroutine_func() -> None:
+            pass
+
+        with pytest.raises(ValueError, match="invalid backend"):
+            timeoutable(1, backend="thread")(coroutine_func)
+
+    def deadline_test(self) -> None:
+        @timeoutable(1, backend="thread")
+        def get_remaining_time() -> float | None:
+            return remaining_time()
+
+        remaining = get_remaining_time()
+
+        # The deadline is propagated to the thread running the callable
+        assert remaining is not None
+        assert 0 < remaining <= 1
+
+    def nested_deadline_test(self) -> None:
+        @timeoutable(5)
+        def inner_func() -> float | None:
+            return remaining_time()
+
+        @timeoutable(0.2)
+        def outer_func() -> float | None:
+            return inner_func()
+
+        remaining = outer_func()
+
+        # The inner timeout is shrunk to the time left to the outer one
+        assert remaining is not None
+        assert remaining <= 0.2  # noqa: PLR2004
+
+    def elapsed_deadline_test(self) -> None:
+        spy_func = Mock()
+        decorated_func = timeoutable(1)(spy_func)
+
+        with deadline(0.01):
+            time.sleep(0.02)
+
+            with pytest.raises(TimeoutError):
+                decorated_func()
+
+        assert not spy_func.called
+
+    def asyncio_deadline_test(self) -> None:
+        @timeoutable(5)
+        async def decorated_func() -> None:
+            await asyncio.sleep(1)
+
+        async def run() -> None:
+            with deadline(0.1):
+                await decorated_func()
+
+        started_at = time.monotonic()
+        with pytest.raises(TimeoutError):
+            asyncio.run(run())
+
+        assert time.monotonic() - started_at < 0.5  # noqa: PLR2004
@@ -0,0 +1,84 @@
+from collections.abc import Sequence
+from unittest.mock import Mock
+import threading
+import time
+
+import pytest
+
+from flashback.timing import BaseSpanExporter, Span
+
+
+class DummyExporter(BaseSpanExporter):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.batches: list[list[Span]] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.batches.append(list(spans))
+
+
+def make_span(name: str = "dummy") -> Span:
+    span = Span(name, start_time=time.time_ns())
+    span.end(1000)
+
+    return span
+
+
+class BaseSpanExporterTest:
+    def flush_test(self) -> None:
+        exporter = DummyExporter(batch_size=2, interval=60)
+        for _ in range(3):
+            exporter.emit(make_span())
+
+        exporter.flush()
+
+        assert [len(batch) for batch in exporter.batches] == [2, 1]
+
+    def background_export_test(self) -> None:
+        exporter = DummyExporter(interval=0.01)
+        exporter.emit(make_span())
+
+        time.sleep(0.1)
+
+        assert len(exporter.batches) == 1
+
+    def batch_size_test(self) -> None:
+        exporter = DummyExporter(batch_size=2, interval=60)
+        exporter.emit(make_span())
+        exporter.emit(make_span())
+
+        # Wakes up the background thread without waiting for the interval
+        time.sleep(0.1)
+
+        assert len(exporter.batches) == 1
+
+    def shutdown_test(self) -> None:
+        threads = set(threading.enumerate())
+        exporter = DummyExporter(interval=60)
+        exporter.emit(make_span())
+
+        exporter.shutdown()
+
+        assert len(exporter.batches) == 1
+        # The background thread is stopped
+        assert set(threading.enumerate()) <= threads
+
+    def failing_export_test(self) -> None:
+        exporter = DummyExporter(batch_size=1, interval=60)
+        exporter.export = Mock(side_effect=[OSError, None])
+        exporter.buffer.push(make_span())
+        exporter.buffer.push(make_span())
+
+        exporter.flush()
+
+        # The next batches are still exported
+        assert exporter.export.call_count == 2
+
+    def invalid_batch_size_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid batch_size"):
+            DummyExporter(batch_size=0)
+
+    def invalid_interval_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid interval"):
+            DummyExporter(interval=0)
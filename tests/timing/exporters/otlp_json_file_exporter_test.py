@@ -0,0 +1,54 @@
+from pathlib import Path
+import json
+import time
+
+from flashback.timing import OTLPJSONFileExporter, Span
+
+
+class OTLPJSONFileExporterTest:
+    def execution_test(self, tmp_path: Path) -> None:
+        path = tmp_path / "spans.jsonl"
+        exporter = OTLPJSONFileExporter(path, service_name="dummy_service")
+
+        parent = Span("parent", start_time=1000, attributes={"count": 1, "ratio": 0.5, "flag": True})
+        parent.end(500)
+        child = Span("child", start_time=1100, parent=parent)
+        child.end(100, KeyError("key"))
+
+        exporter.export([parent, child])
+
+        (line,) = path.read_text().splitlines()
+        request = json.loads(line)
+
+        resource_spans = request["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "dummy_service"}},
+        ]
+
+        encoded_parent, encoded_child = resource_spans["scopeSpans"][0]["spans"]
+        assert encoded_parent["name"] == "parent"
+        assert encoded_parent["traceId"] == parent.trace_id
+        assert encoded_parent["startTimeUnixNano"] == "1000"
+        assert encoded_parent["endTimeUnixNano"] == "1500"
+        assert encoded_parent["status"] == {"code": 1}
+        assert "parentSpanId" not in encoded_parent
+        assert {"key": "count", "value": {"intValue": "1"}} in encoded_parent["attributes"]
+        assert {"key": "ratio", "value": {"doubleValue": 0.5}} in encoded_parent["attributes"]
+        assert {"key": "flag", "value": {"boolValue": True}} in encoded_parent["attributes"]
+
+        assert encoded_child["parentSpanId"] == parent.span_id
+        assert encoded_child["status"] == {"code": 2, "message": "'key'"}
+        assert encoded_child["events"][0]["name"] == "exception"
+
+    def append_test(self, tmp_path: Path) -> None:
+        path = tmp_path / "spans.jsonl"
+        exporter = OTLPJSONFileExporter(path, batch_size=1)
+
+        for name in ("first", "second"):
+            span = Span(name, start_time=time.time_ns())
+            span.end(1000)
+            exporter.emit(span)
+        exporter.shutdown()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
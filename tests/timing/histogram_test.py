@@ -0,0 +1,96 @@
+from threading import Thread
+
+import pytest
+
+from flashback.timing import Histogram
+
+
+class HistogramTest:
+    def execution_test(self) -> None:
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.record(value)
+
+        assert histogram.count == 1000
+        assert histogram.min == 1
+        assert histogram.max == 1000
+
+    def percentile_test(self) -> None:
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.record(value)
+
+        # Within the relative error of the buckets
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.01)
+        assert histogram.percentile(90) == pytest.approx(900, rel=0.01)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.01)
+        assert histogram.percentile(100) == 1000
+
+    def exact_values_test(self) -> None:
+        histogram = Histogram(precision=8)
+        for value in range(256):
+            histogram.record(value)
+
+        assert histogram.percentile(50) == 127
+
+    def large_values_test(self) -> None:
+        histogram = Histogram()
+        for value in (1_000_000, 10_000_000, 1_000_000_000):
+            histogram.record(value)
+
+        assert histogram.percentile(50) == pytest.approx(10_000_000, rel=0.01)
+        assert histogram.percentile(100) == 1_000_000_000
+
+    def precision_test(self) -> None:
+        histogram = Histogram(precision=4)
+        for value in range(1000, 2000):
+            histogram.record(value)
+
+        assert histogram.percentile(50) == pytest.approx(1500, rel=2 ** (1 - 4))
+
+    def negative_value_test(self) -> None:
+        histogram = Histogram()
+        histogram.record(-5)
+
+        assert histogram.min == 0
+
+    def empty_test(self) -> None:
+        histogram = Histogram()
+
+        assert histogram.percentile(99) == 0
+        assert histogram.summary() == {"count": 0, "mean": 0.0, "min": 0, "p50": 0, "p90": 0, "p99": 0, "max": 0}
+
+    def summary_test(self) -> None:
+        histogram = Histogram()
+        for value in (10, 20, 30):
+            histogram.record(value)
+
+        assert histogram.summary() == {"count": 3, "mean": 20.0, "min": 10, "p50": 20, "p90": 30, "p99": 30, "max": 30}
+
+    def reset_test(self) -> None:
+        histogram = Histogram()
+        histogram.record(10)
+
+        histogram.reset()
+
+        assert histogram.count == 0
+        assert histogram.percentile(50) == 0
+
+    def thread_safety_test(self) -> None:
+        histogram = Histogram()
+
+        def _record() -> None:
+            for value in range(1000):
+                histogram.record(value)
+
+        threads = [Thread(target=_record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert histogram.count == 8000
+
+    def invalid_precision_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid precision"):
+            Histogram(precision=1)
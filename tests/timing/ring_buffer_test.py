@@ -0,0 +1,54 @@
+from threading import Thread
+
+import pytest
+
+from flashback.timing import RingBuffer
+
+
+class RingBufferTest:
+    def execution_test(self) -> None:
+        buffer = RingBuffer(capacity=3)
+        buffer.push(1)
+        buffer.push(2)
+
+        assert len(buffer) == 2
+        assert buffer.drain() == [1, 2]
+        assert len(buffer) == 0
+
+    def overflow_test(self) -> None:
+        buffer = RingBuffer(capacity=2)
+        for item in range(5):
+            buffer.push(item)
+
+        # Drops the oldest items
+        assert buffer.drain() == [3, 4]
+        assert buffer.dropped == 3
+
+    def drain_max_items_test(self) -> None:
+        buffer = RingBuffer()
+        for item in range(5):
+            buffer.push(item)
+
+        assert buffer.drain(2) == [0, 1]
+        assert buffer.drain(2) == [2, 3]
+        assert buffer.drain(2) == [4]
+        assert buffer.drain(2) == []
+
+    def thread_safety_test(self) -> None:
+        buffer = RingBuffer(capacity=10000)
+
+        def _push() -> None:
+            for item in range(1000):
+                buffer.push(item)
+
+        threads = [Thread(target=_push) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(buffer.drain()) == 8000
+
+    def invalid_capacity_test(self) -> None:
+        with pytest.raises(ValueError, match="invalid capacity"):
+            RingBuffer(capacity=0)
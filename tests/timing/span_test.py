@@ -0,0 +1,36 @@
+import threading
+
+from flashback.timing import Span, current_span
+
+
+class SpanTest:
+    def execution_test(self) -> None:
+        span = Span("dummy", start_time=1000)
+        span.end(500)
+
+        assert span.name == "dummy"
+        assert span.duration == 500
+        assert span.end_time == 1500
+        assert span.error is None
+        assert span.parent_id is None
+        assert len(span.trace_id) == 32
+        assert len(span.span_id) == 16
+        assert span.thread_name == threading.current_thread().name
+
+    def parent_test(self) -> None:
+        parent = Span("parent", start_time=1000)
+        child = Span("child", start_time=1100, parent=parent)
+
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert child.span_id != parent.span_id
+
+    def error_test(self) -> None:
+        span = Span("dummy", start_time=1000)
+        error = KeyError("key")
+        span.end(500, error)
+
+        assert span.error is error
+
+    def current_span_test(self) -> None:
+        assert current_span() is None
@@ -0,0 +1,152 @@
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import Mock
+import asyncio
+
+import pytest
+
+from flashback.timing import SteppedAwaitable, step_async_generator, step_generator
+
+
+def numbers() -> Generator[int, int | None, str]:
+    received = yield 1
+    yield 2 if received is None else received
+
+    return "done"
+
+
+async def async_numbers() -> AsyncGenerator[int, int | None]:
+    received = yield 1
+    await asyncio.sleep(0)
+    yield 2 if received is None else received
+
+
+class SteppingTest:
+    def step_generator_test(self) -> None:
+        on_enter, on_exit = Mock(), Mock()
+
+        assert list(step_generator(numbers(), on_enter, on_exit)) == [1, 2]
+        assert on_enter.call_count == 3
+        assert on_exit.call_count == 3
+
+    def step_generator_return_test(self) -> None:
+        def delegate() -> Generator[int, None, str]:
+            return (yield from step_generator(numbers(), Mock(), Mock()))
+
+        generator = delegate()
+        next(generator)
+        next(generator)
+        with pytest.raises(StopIteration) as exc_info:
+            next(generator)
+
+        assert exc_info.value.value == "done"
+
+    def step_generator_send_test(self) -> None:
+        generator = step_generator(numbers(), Mock(), Mock())
+
+        assert next(generator) == 1
+        assert generator.send(3) == 3
+
+    def step_generator_throw_test(self) -> None:
+        def catching() -> Generator[str]:
+            try:
+                yield "waiting"
+            except KeyError:
+                yield "caught"
+
+        generator = step_generator(catching(), Mock(), Mock())
+
+        assert next(generator) == "waiting"
+        assert generator.throw(KeyError()) == "caught"
+
+    def step_generator_close_test(self) -> None:
+        spy = Mock()
+
+        def closing() -> Generator[int]:
+            try:
+                yield 1
+            finally:
+                spy()
+
+        on_exit = Mock()
+        generator = step_generator(closing(), Mock(), on_exit)
+        next(generator)
+        generator.close()
+
+        assert spy.called
+        assert on_exit.call_count == 2
+
+    def stepped_awaitable_test(self) -> None:
+        on_enter, on_exit = Mock(), Mock()
+
+        async def coroutine() -> str:
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+            return "done"
+
+        async def run() -> str:
+            return await SteppedAwaitable(coroutine(), on_enter, on_exit)
+
+        assert asyncio.run(run()) == "done"
+        # One step before each suspension, and one after the last
+        assert on_enter.call_count == 3
+        assert on_exit.call_count == 3
+
+    def stepped_awaitable_cancel_test(self) -> None:
+        spy = Mock()
+
+        async def coroutine() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                spy()
+
+                raise
+
+        async def run() -> None:
+            task = asyncio.ensure_future(SteppedAwaitable(coroutine(), Mock(), Mock()))
+            await asyncio.sleep(0)
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+
+        assert spy.called
+
+    def step_async_generator_test(self) -> None:
+        on_enter, on_exit = Mock(), Mock()
+
+        async def run() -> list[int]:
+            return [item async for item in step_async_generator(async_numbers(), on_enter, on_exit)]
+
+        assert asyncio.run(run()) == [1, 2]
+        assert on_enter.call_count == on_exit.call_count
+        assert on_enter.call_count >= 3
+
+    def step_async_generator_send_test(self) -> None:
+        async def run() -> list[int]:
+            async_generator = step_async_generator(async_numbers(), Mock(), Mock())
+
+            return [await anext(async_generator), await async_generator.asend(3)]
+
+        assert asyncio.run(run()) == [1, 3]
+
+    def step_async_generator_close_test(self) -> None:
+        spy = Mock()
+
+        async def closing() -> AsyncGenerator[int]:
+            try:
+                yield 1
+            finally:
+                spy()
+
+        async def run() -> None:
+            async_generator = step_async_generator(closing(), Mock(), Mock())
+            await anext(async_generator)
+            await async_generator.aclose()
+
+        asyncio.run(run())
+
+        assert spy.called